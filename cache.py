@@ -0,0 +1,201 @@
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set
+
+from events import (
+    FilesAdded, FilesMeasured, FilesRemoved, FileUpdated, FolderAdded, FolderMoved,
+    FolderRemoved, FolderRenamed,
+)
+
+
+class QueryCache:
+    """
+    Cache LRU des lectures de l'arborescence (voir Database(cache_size=...))
+    
+    Entrées, par clé (type, id de dossier):
+        ('folder', id)      -> dossier
+        ('subfolders', id)  -> sous-dossiers directs (id None = racine)
+        ('files', id)       -> fichiers du dossier
+        ('path', id)        -> chemin depuis la racine (fil d'Ariane)
+        ('stats', id)       -> agrégats de folder_stats
+    
+    La taille est bornée en nombre de lignes (une liste de 500 fichiers
+    compte pour 500): les entrées les moins récemment lues sont évincées.
+    Les valeurs sont copiées à la lecture, l'appelant peut les modifier.
+    
+    Chaque modification invalide seulement les entrées concernées
+    (invalidate, appelé avec les événements de events.py). Pour les
+    agrégats des ancêtres, le cache s'appuie sur les chemins qu'il connaît;
+    à défaut, tous les agrégats sont invalidés.
+    """
+    
+    DEFAULT_MAX_ROWS = 50_000
+    
+    def __init__(self, max_rows: int = DEFAULT_MAX_ROWS):
+        self.max_rows = max(1, max_rows)
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._weights: Dict[Hashable, int] = {}
+        self.rows = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    # ==================== LECTURE ====================
+    
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Valeur de `key`, chargée par `loader` en cas d'absence"""
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._copy(self._entries[key])
+        self.misses += 1
+        value = loader()
+        self._store(key, value)
+        return self._copy(value)
+    
+    def get_many(self, kind: str, ids: Iterable[Hashable],
+                 loader: Callable[[list], Dict[Hashable, Any]]) -> Dict[Hashable, Any]:
+        """Valeurs de plusieurs clés (kind, id); les absentes sont chargées en un appel"""
+        result = {}
+        missing = []
+        for item_id in ids:
+            key = (kind, item_id)
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                result[item_id] = self._copy(self._entries[key])
+            else:
+                missing.append(item_id)
+        if missing:
+            self.misses += len(missing)
+            for item_id, value in loader(missing).items():
+                self._store((kind, item_id), value)
+                result[item_id] = self._copy(value)
+        return result
+    
+    def stats(self) -> Dict[str, float]:
+        """Compteurs: hits, misses, taux de succès, entrées, lignes, évictions"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self._entries),
+            'rows': self.rows,
+            'evictions': self.evictions,
+        }
+    
+    def _store(self, key: Hashable, value: Any):
+        weight = len(value) if isinstance(value, list) else 1
+        if weight > self.max_rows:
+            return
+        self._discard(key)
+        self._entries[key] = value
+        self._weights[key] = weight
+        self.rows += weight
+        while self.rows > self.max_rows:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+    
+    def _discard(self, key: Hashable):
+        if key in self._entries:
+            del self._entries[key]
+            self.rows -= self._weights.pop(key)
+    
+    @staticmethod
+    def _copy(value: Any) -> Any:
+        if isinstance(value, list):
+            return [dict(row) for row in value]
+        if isinstance(value, dict):
+            return dict(value)
+        return value
+    
+    # ==================== INVALIDATION ====================
+    
+    def clear(self):
+        """Tout oublier (ex: transaction annulée)"""
+        self._entries.clear()
+        self._weights.clear()
+        self.rows = 0
+    
+    def invalidate(self, event):
+        """Retirer les entrées rendues fausses par un événement de modification"""
+        if isinstance(event, FolderAdded):
+            self._discard(('subfolders', event.parent_id))
+            self._discard(('stats', event.parent_id))
+        elif isinstance(event, FolderRenamed):
+            # Le nom apparaît dans la liste du parent et dans les chemins du sous-arbre
+            self._discard(('folder', event.folder_id))
+            self._discard(('subfolders', self._parent_of(event.folder_id)))
+            for folder_id in self._ids_under(event.folder_id):
+                self._discard(('path', folder_id))
+        elif isinstance(event, (FolderMoved, FolderRemoved)):
+            old_parent = event.old_parent_id if isinstance(event, FolderMoved) else event.parent_id
+            self._discard(('subfolders', old_parent))
+            if isinstance(event, FolderMoved):
+                self._discard(('subfolders', event.new_parent_id))
+            for folder_id in self._ids_under(event.folder_id):
+                self._discard(('folder', folder_id))
+                self._discard(('path', folder_id))
+                if isinstance(event, FolderRemoved):
+                    for kind in ('subfolders', 'files', 'stats'):
+                        self._discard((kind, folder_id))
+            # Les totaux changent sur deux lignées d'ancêtres
+            self._discard_kind('stats')
+        elif isinstance(event, (FilesAdded, FilesRemoved, FilesMeasured, FileUpdated)):
+            folder_ids = (event.folder_id,) if isinstance(event, FileUpdated) else event.folder_ids
+            for folder_id in folder_ids:
+                self._discard(('files', folder_id))
+                self._discard_ancestor_stats(folder_id)
+    
+    def _parent_of(self, folder_id: int) -> Optional[int]:
+        folder = self._entries.get(('folder', folder_id))
+        if folder is not None:
+            return folder['parent_id']
+        for key, value in self._entries.items():
+            if key[0] == 'subfolders' and any(row['id'] == folder_id for row in value):
+                return key[1]
+        return None
+    
+    def _ids_under(self, folder_id: int) -> Set[int]:
+        """Dossiers connus du cache situés dans le sous-arbre de folder_id (lui compris)"""
+        ids = {folder_id}
+        for key, value in self._entries.items():
+            if key[0] == 'path' and any(row['id'] == folder_id for row in value):
+                ids.add(key[1])
+        pending = list(ids)
+        while pending:
+            for row in self._entries.get(('subfolders', pending.pop()), ()):
+                if row['id'] not in ids:
+                    ids.add(row['id'])
+                    pending.append(row['id'])
+        return ids
+    
+    def _discard_ancestor_stats(self, folder_id: int):
+        path = self._entries.get(('path', folder_id))
+        if path is None:
+            self._discard_kind('stats')
+        else:
+            for row in path:
+                self._discard(('stats', row['id']))
+    
+    def _discard_kind(self, kind: str):
+        for key in [key for key in self._entries if key[0] == kind]:
+            self._discard(key)
+
+
+def cached(kind: str):
+    """
+    Servir une lecture Database(folder_id) depuis db.cache quand il existe
+    
+    La méthode décorée ne prend qu'un ID de dossier (None = racine).
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, folder_id: Optional[int] = None):
+            if self.cache is None:
+                return method(self, folder_id)
+            return self.cache.get((kind, folder_id), lambda: method(self, folder_id))
+        return wrapper
+    return decorator
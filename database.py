@@ -1,291 +1,1751 @@
-import sqlite3
-import os
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-
-class Database:
-    """Gestion de la base de données SQLite"""
-    
-    def __init__(self, db_path: str = "portal.db"):
-        self.db_path = db_path
-        self.conn = None
-        self.cursor = None
-        self.connect()
-        self.create_tables()
-        self.create_default_admin()
-    
-    def connect(self):
-        """Établir la connexion à la base de données"""
-        try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-            self.cursor = self.conn.cursor()
-            print(f"✅ Connexion à la base de données réussie: {self.db_path}")
-        except sqlite3.Error as e:
-            print(f"❌ Erreur de connexion à la base de données: {e}")
-            raise
-    
-    def create_tables(self):
-        """Créer les tables nécessaires"""
-        try:
-            # Table admins
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS admins (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT NOT NULL UNIQUE,
-                    password TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Table folders
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS folders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    parent_id INTEGER DEFAULT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (parent_id) REFERENCES folders(id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Table files
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS files (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    folder_id INTEGER NOT NULL,
-                    filename TEXT NOT NULL,
-                    filepath TEXT NOT NULL,
-                    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (folder_id) REFERENCES folders(id) ON DELETE CASCADE
-                )
-            """)
-            
-            self.conn.commit()
-            print("✅ Tables créées avec succès")
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la création des tables: {e}")
-            raise
-    
-    def create_default_admin(self):
-        """Créer un compte admin par défaut"""
-        try:
-            self.cursor.execute(
-                "SELECT COUNT(*) FROM admins WHERE email = ?", 
-                ('admin',)
-            )
-            if self.cursor.fetchone()[0] == 0:
-                self.cursor.execute(
-                    "INSERT INTO admins (email, password) VALUES (?, ?)",
-                    ('admin', 'admin')  # En production, hasher le mot de passe
-                )
-                self.conn.commit()
-                print("✅ Admin par défaut créé (admin/admin)")
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la création de l'admin: {e}")
-    
-    def authenticate_admin(self, email: str, password: str) -> bool:
-        """Authentifier un administrateur"""
-        try:
-            self.cursor.execute(
-                "SELECT * FROM admins WHERE email = ? AND password = ?",
-                (email, password)
-            )
-            result = self.cursor.fetchone()
-            return result is not None
-        except sqlite3.Error as e:
-            print(f"❌ Erreur d'authentification: {e}")
-            return False
-    
-    # ==================== GESTION DES DOSSIERS ====================
-    
-    def create_folder(self, name: str, parent_id: Optional[int] = None) -> int:
-        """Créer un nouveau dossier"""
-        try:
-            self.cursor.execute(
-                "INSERT INTO folders (name, parent_id) VALUES (?, ?)",
-                (name, parent_id)
-            )
-            self.conn.commit()
-            return self.cursor.lastrowid
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la création du dossier: {e}")
-            raise
-    
-    def get_folder(self, folder_id: int) -> Optional[Dict[str, Any]]:
-        """Récupérer un dossier par son ID"""
-        try:
-            self.cursor.execute(
-                "SELECT * FROM folders WHERE id = ?",
-                (folder_id,)
-            )
-            row = self.cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la récupération du dossier: {e}")
-            return None
-    
-    def get_all_folders(self) -> List[Dict[str, Any]]:
-        """Récupérer tous les dossiers"""
-        try:
-            self.cursor.execute("SELECT * FROM folders ORDER BY name ASC")
-            return [dict(row) for row in self.cursor.fetchall()]
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la récupération des dossiers: {e}")
-            return []
-    
-    def get_subfolders(self, parent_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Récupérer les sous-dossiers d'un dossier parent"""
-        try:
-            if parent_id is None:
-                self.cursor.execute(
-                    "SELECT * FROM folders WHERE parent_id IS NULL ORDER BY name ASC"
-                )
-            else:
-                self.cursor.execute(
-                    "SELECT * FROM folders WHERE parent_id = ? ORDER BY name ASC",
-                    (parent_id,)
-                )
-            return [dict(row) for row in self.cursor.fetchall()]
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la récupération des sous-dossiers: {e}")
-            return []
-    
-    def update_folder(self, folder_id: int, name: str) -> bool:
-        """Renommer un dossier"""
-        try:
-            self.cursor.execute(
-                "UPDATE folders SET name = ? WHERE id = ?",
-                (name, folder_id)
-            )
-            self.conn.commit()
-            return True
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la mise à jour du dossier: {e}")
-            return False
-    
-    def delete_folder(self, folder_id: int) -> bool:
-        """Supprimer un dossier et ses fichiers"""
-        try:
-            # Supprimer les fichiers du dossier
-            self.cursor.execute(
-                "SELECT filepath FROM files WHERE folder_id = ?",
-                (folder_id,)
-            )
-            files = self.cursor.fetchall()
-            
-            # Supprimer les fichiers physiques
-            for file in files:
-                try:
-                    if os.path.exists(file['filepath']):
-                        os.remove(file['filepath'])
-                except Exception as e:
-                    print(f"⚠️ Impossible de supprimer le fichier {file['filepath']}: {e}")
-            
-            # Supprimer le dossier de la base
-            self.cursor.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
-            self.conn.commit()
-            return True
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la suppression du dossier: {e}")
-            return False
-    
-    def get_folder_path(self, folder_id: int) -> List[Dict[str, Any]]:
-        """Récupérer le chemin complet d'un dossier (breadcrumb)"""
-        path = []
-        current_id = folder_id
-        
-        while current_id is not None:
-            folder = self.get_folder(current_id)
-            if folder:
-                path.insert(0, folder)
-                current_id = folder['parent_id']
-            else:
-                break
-        
-        return path
-    
-    # ==================== GESTION DES FICHIERS ====================
-    
-    def add_file(self, folder_id: int, filename: str, filepath: str) -> int:
-        """Ajouter un fichier à la base de données"""
-        try:
-            self.cursor.execute(
-                "INSERT INTO files (folder_id, filename, filepath) VALUES (?, ?, ?)",
-                (folder_id, filename, filepath)
-            )
-            self.conn.commit()
-            return self.cursor.lastrowid
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de l'ajout du fichier: {e}")
-            raise
-    
-    def get_files_in_folder(self, folder_id: int) -> List[Dict[str, Any]]:
-        """Récupérer tous les fichiers d'un dossier"""
-        try:
-            self.cursor.execute(
-                "SELECT * FROM files WHERE folder_id = ? ORDER BY uploaded_at DESC",
-                (folder_id,)
-            )
-            return [dict(row) for row in self.cursor.fetchall()]
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la récupération des fichiers: {e}")
-            return []
-    
-    def get_file(self, file_id: int) -> Optional[Dict[str, Any]]:
-        """Récupérer un fichier par son ID"""
-        try:
-            self.cursor.execute("SELECT * FROM files WHERE id = ?", (file_id,))
-            row = self.cursor.fetchone()
-            return dict(row) if row else None
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la récupération du fichier: {e}")
-            return None
-    
-    def delete_file(self, file_id: int) -> bool:
-        """Supprimer un fichier"""
-        try:
-            # Récupérer le chemin du fichier
-            file = self.get_file(file_id)
-            if file:
-                # Supprimer le fichier physique
-                try:
-                    if os.path.exists(file['filepath']):
-                        os.remove(file['filepath'])
-                except Exception as e:
-                    print(f"⚠️ Impossible de supprimer le fichier physique: {e}")
-                
-                # Supprimer de la base
-                self.cursor.execute("DELETE FROM files WHERE id = ?", (file_id,))
-                self.conn.commit()
-                return True
-            return False
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors de la suppression du fichier: {e}")
-            return False
-    
-    def count_files_in_folder(self, folder_id: int, recursive: bool = False) -> int:
-        """Compter les fichiers dans un dossier"""
-        try:
-            if not recursive:
-                self.cursor.execute(
-                    "SELECT COUNT(*) as count FROM files WHERE folder_id = ?",
-                    (folder_id,)
-                )
-                return self.cursor.fetchone()[0]
-            else:
-                # Compter récursivement
-                count = self.count_files_in_folder(folder_id, recursive=False)
-                subfolders = self.get_subfolders(folder_id)
-                for subfolder in subfolders:
-                    count += self.count_files_in_folder(subfolder['id'], recursive=True)
-                return count
-        except sqlite3.Error as e:
-            print(f"❌ Erreur lors du comptage des fichiers: {e}")
-            return 0
-    
-    def close(self):
-        """Fermer la connexion à la base de données"""
-        if self.conn:
-            self.conn.close()
-            print("✅ Connexion à la base de données fermée")
\ No newline at end of file
+import sqlite3
+import mimetypes
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Union, Tuple, Callable, Set
+from cache import QueryCache, cached
+from events import (
+    EventBus, FilesAdded, FilesMeasured, FilesRemoved, FileUpdated, FolderAdded,
+    FolderMoved, FolderRemoved, FolderRenamed,
+)
+from migrations import MIGRATIONS
+
+@dataclass(frozen=True)
+class ConnectionProfile:
+    """Réglages (PRAGMA) appliqués à chaque connexion SQLite"""
+    name: str
+    journal_mode: str = 'DELETE'
+    synchronous: str = 'FULL'
+    cache_size: int = -2000          # Négatif: taille en Kio
+    mmap_size: int = 0               # Octets, 0 = désactivé
+    temp_store: str = 'DEFAULT'
+    foreign_keys: bool = False
+    busy_timeout: int = 5000         # Millisecondes
+    
+    def pragmas(self) -> List[str]:
+        """Instructions PRAGMA correspondant au profil"""
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA temp_store = {self.temp_store}",
+            f"PRAGMA foreign_keys = {'ON' if self.foreign_keys else 'OFF'}",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout)}",
+        ]
+
+
+CONNECTION_PROFILES = {
+    # Comportement historique: journal "rollback", fsync complet à chaque commit
+    'compat': ConnectionProfile(name='compat'),
+    # WAL: les lectures ne sont plus bloquées par les écritures, un seul fsync
+    # par checkpoint au lieu d'un par commit
+    'performance': ConnectionProfile(
+        name='performance',
+        journal_mode='WAL',
+        synchronous='NORMAL',
+        cache_size=-64000,
+        mmap_size=256 * 1024 * 1024,
+        temp_store='MEMORY',
+        foreign_keys=True,
+    ),
+}
+
+DEFAULT_PROFILE = 'performance'
+
+
+# Clés de tri des fichiers: expression SQL (servie par un index folder_id, clé)
+# et colonne du dernier fichier d'une page (pagination par clé)
+FILE_SORT_KEYS = {
+    'date': ('uploaded_at', 'uploaded_at'),
+    'name': ('filename COLLATE NOCASE', 'filename'),
+    'size': ('size', 'size'),
+    'type': ('extension', 'extension'),
+}
+
+
+@dataclass(frozen=True)
+class FileListing:
+    """Tri et filtres d'un listing de fichiers (voir Database.get_files_page)"""
+    sort: str = 'date'                     # Clé de FILE_SORT_KEYS
+    descending: bool = True
+    extensions: Tuple[str, ...] = ()       # Minuscules, sans le point; vide = toutes
+    uploaded_from: Optional[str] = None    # 'AAAA-MM-JJ', inclus
+    uploaded_to: Optional[str] = None      # 'AAAA-MM-JJ', exclu
+    min_size: Optional[int] = None         # Octets, inclus
+    max_size: Optional[int] = None         # Octets, exclu
+    
+    @property
+    def filtered(self) -> bool:
+        """Au moins un filtre actif (le nombre de fichiers n'est plus celui du dossier)"""
+        return bool(self.extensions) or any(
+            value is not None
+            for value in (self.uploaded_from, self.uploaded_to, self.min_size, self.max_size)
+        )
+    
+    def conditions(self) -> Tuple[List[str], List[Any]]:
+        """Conditions SQL (sur la table files) et leurs paramètres"""
+        where, params = [], []
+        if self.extensions:
+            where.append(f"extension IN ({', '.join('?' * len(self.extensions))})")
+            params += list(self.extensions)
+        for clause, value in (
+            ("uploaded_at >= ?", self.uploaded_from),
+            ("uploaded_at < ?", self.uploaded_to),
+            ("size >= ?", self.min_size),
+            ("size < ?", self.max_size),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        return where, params
+
+
+DEFAULT_FILE_LISTING = FileListing()
+
+
+def guess_file_type(filename: str) -> Tuple[str, Optional[str]]:
+    """
+    Extension (minuscules, sans le point) et type MIME déduits du nom de fichier
+    
+    Returns:
+        Tuple[str, Optional[str]]: (extension, type_mime ou None si inconnu)
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return extension, mimetypes.guess_type(filename, strict=False)[0]
+
+
+class FileReservations:
+    """
+    Fichiers de uploads/ réservés par un enregistrement pas encore validé
+    
+    Le stockage par contenu réutilise l'objet existant d'un contenu déjà
+    connu. Un import, sur sa propre connexion, n'insère la ligne qui le
+    référence qu'au checkpoint suivant: jusque-là unreferenced_filepaths ne
+    voit pas cette référence, et une suppression faite sur une autre
+    connexion effacerait l'objet.
+    
+    Le stockage réserve donc le chemin avant de le réutiliser (hold), et
+    l'appelant libère la réservation une fois ses lignes validées ou
+    annulées (release). Les suppressions physiques vérifient, sous le même
+    verrou, que le chemin n'est ni réservé ni référencé. Le registre est
+    commun à toutes les connexions du processus (FILE_RESERVATIONS).
+    """
+    
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._counts = Counter()
+    
+    def hold(self, filepath: str):
+        """Réserver un chemin (une réservation par enregistrement)"""
+        with self.lock:
+            self._counts[filepath] += 1
+    
+    def release(self, filepaths: Iterable[str]):
+        """Libérer les réservations de ces chemins (sans effet s'ils n'en ont pas)"""
+        with self.lock:
+            for filepath in filepaths:
+                if self._counts[filepath] > 1:
+                    self._counts[filepath] -= 1
+                else:
+                    self._counts.pop(filepath, None)
+    
+    def unreserved(self, filepaths: Iterable[str]) -> List[str]:
+        """Chemins sans réservation (garder self.lock jusqu'à leur suppression)"""
+        with self.lock:
+            return [filepath for filepath in filepaths if not self._counts[filepath]]
+
+
+FILE_RESERVATIONS = FileReservations()
+
+
+class Database:
+    """Gestion de la base de données SQLite"""
+    
+    # Nombre maximal de paramètres "?" par requête (limite SQLite historique: 999)
+    SQL_VARIABLES_CHUNK = 500
+    
+    # Ancêtres d'un dossier (lui compris), en remontant les parent_id.
+    # Utilisé par les triggers de dossiers, indépendamment de folder_closure.
+    ANCESTORS_SQL = """
+        WITH RECURSIVE ancestors(id) AS (
+            SELECT {start}
+            UNION ALL
+            SELECT folders.parent_id FROM folders JOIN ancestors ON folders.id = ancestors.id
+            WHERE folders.parent_id IS NOT NULL
+        )
+        SELECT id FROM ancestors
+    """
+    
+    # Agrégats calculés à partir des tables (référence pour rebuild/verify)
+    COMPUTED_STATS_SQL = """
+        WITH RECURSIVE subtree(root_id, folder_id) AS (
+            SELECT id, id FROM folders {where}
+            UNION ALL
+            SELECT subtree.root_id, folders.id
+            FROM folders JOIN subtree ON folders.parent_id = subtree.folder_id
+        ),
+        direct(folder_id, file_count, total_bytes) AS (
+            SELECT folder_id, COUNT(*), COALESCE(SUM(size), 0) FROM files
+            WHERE folder_id IN (SELECT folder_id FROM subtree)
+            GROUP BY folder_id
+        ),
+        totals(folder_id, total_file_count, total_bytes) AS (
+            SELECT subtree.root_id, COALESCE(SUM(direct.file_count), 0),
+                   COALESCE(SUM(direct.total_bytes), 0)
+            FROM subtree LEFT JOIN direct ON direct.folder_id = subtree.folder_id
+            GROUP BY subtree.root_id
+        )
+        SELECT totals.folder_id,
+               COALESCE(direct.file_count, 0) AS file_count,
+               totals.total_file_count,
+               totals.total_bytes,
+               (SELECT COUNT(*) FROM folders AS child
+                WHERE child.parent_id = totals.folder_id) AS subfolder_count
+        FROM totals LEFT JOIN direct ON direct.folder_id = totals.folder_id
+    """
+    
+    STATS_COLUMNS = ('file_count', 'total_file_count', 'total_bytes', 'subfolder_count')
+    
+    # Ancêtres d'un dossier (lui compris) via la table de fermeture
+    CLOSURE_ANCESTORS_SQL = """
+        SELECT ancestor_id FROM folder_closure WHERE descendant_id = {start}
+    """
+    
+    # Triggers maintenant folder_closure à jour (création, suppression, déplacement)
+    FOLDER_CLOSURE_TRIGGERS = {
+        'trg_folders_insert_closure': """
+            AFTER INSERT ON folders
+            BEGIN
+                INSERT INTO folder_closure (ancestor_id, descendant_id, depth)
+                SELECT ancestor_id, NEW.id, depth + 1 FROM folder_closure
+                WHERE descendant_id = NEW.parent_id;
+                INSERT INTO folder_closure (ancestor_id, descendant_id, depth)
+                VALUES (NEW.id, NEW.id, 0);
+            END
+        """,
+        'trg_folders_delete_closure': """
+            AFTER DELETE ON folders
+            BEGIN
+                DELETE FROM folder_closure WHERE descendant_id = OLD.id;
+                DELETE FROM folder_closure WHERE ancestor_id = OLD.id;
+            END
+        """,
+        'trg_folders_reparent_closure': """
+            AFTER UPDATE OF parent_id ON folders
+            WHEN OLD.parent_id IS NOT NEW.parent_id
+            BEGIN
+                DELETE FROM folder_closure
+                WHERE descendant_id IN (
+                    SELECT descendant_id FROM folder_closure WHERE ancestor_id = NEW.id
+                )
+                AND ancestor_id NOT IN (
+                    SELECT descendant_id FROM folder_closure WHERE ancestor_id = NEW.id
+                );
+                INSERT INTO folder_closure (ancestor_id, descendant_id, depth)
+                SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1
+                FROM folder_closure AS above, folder_closure AS below
+                WHERE above.descendant_id = NEW.parent_id AND below.ancestor_id = NEW.id;
+            END
+        """,
+    }
+    
+    # Triggers maintenant folder_stats à jour à chaque écriture
+    FOLDER_STATS_TRIGGERS = {
+        'trg_folders_insert_stats': """
+            AFTER INSERT ON folders
+            BEGIN
+                INSERT OR IGNORE INTO folder_stats (folder_id) VALUES (NEW.id);
+                UPDATE folder_stats SET subfolder_count = subfolder_count + 1
+                WHERE folder_id = NEW.parent_id;
+            END
+        """,
+        'trg_folders_delete_stats': """
+            AFTER DELETE ON folders
+            BEGIN
+                UPDATE folder_stats SET
+                    total_file_count = total_file_count - COALESCE(
+                        (SELECT total_file_count FROM folder_stats WHERE folder_id = OLD.id), 0),
+                    total_bytes = total_bytes - COALESCE(
+                        (SELECT total_bytes FROM folder_stats WHERE folder_id = OLD.id), 0)
+                WHERE folder_id IN ({old_ancestors});
+                UPDATE folder_stats SET subfolder_count = subfolder_count - 1
+                WHERE folder_id = OLD.parent_id;
+                DELETE FROM folder_stats WHERE folder_id = OLD.id;
+            END
+        """,
+        'trg_folders_reparent_stats': """
+            AFTER UPDATE OF parent_id ON folders
+            WHEN OLD.parent_id IS NOT NEW.parent_id
+            BEGIN
+                UPDATE folder_stats SET
+                    total_file_count = total_file_count - COALESCE(
+                        (SELECT total_file_count FROM folder_stats WHERE folder_id = NEW.id), 0),
+                    total_bytes = total_bytes - COALESCE(
+                        (SELECT total_bytes FROM folder_stats WHERE folder_id = NEW.id), 0)
+                WHERE folder_id IN ({old_ancestors});
+                UPDATE folder_stats SET
+                    total_file_count = total_file_count + COALESCE(
+                        (SELECT total_file_count FROM folder_stats WHERE folder_id = NEW.id), 0),
+                    total_bytes = total_bytes + COALESCE(
+                        (SELECT total_bytes FROM folder_stats WHERE folder_id = NEW.id), 0)
+                WHERE folder_id IN ({new_ancestors});
+                UPDATE folder_stats SET subfolder_count = subfolder_count - 1
+                WHERE folder_id = OLD.parent_id;
+                UPDATE folder_stats SET subfolder_count = subfolder_count + 1
+                WHERE folder_id = NEW.parent_id;
+            END
+        """,
+        'trg_files_insert_stats': """
+            AFTER INSERT ON files
+            BEGIN
+                UPDATE folder_stats SET file_count = file_count + 1
+                WHERE folder_id = NEW.folder_id;
+                UPDATE folder_stats SET
+                    total_file_count = total_file_count + 1,
+                    total_bytes = total_bytes + NEW.size
+                WHERE folder_id IN ({new_file_ancestors});
+            END
+        """,
+        'trg_files_delete_stats': """
+            AFTER DELETE ON files
+            BEGIN
+                UPDATE folder_stats SET file_count = file_count - 1
+                WHERE folder_id = OLD.folder_id;
+                UPDATE folder_stats SET
+                    total_file_count = total_file_count - 1,
+                    total_bytes = total_bytes - OLD.size
+                WHERE folder_id IN ({old_file_ancestors});
+            END
+        """,
+        'trg_files_update_stats': """
+            AFTER UPDATE OF folder_id, size ON files
+            BEGIN
+                UPDATE folder_stats SET file_count = file_count - 1
+                WHERE folder_id = OLD.folder_id;
+                UPDATE folder_stats SET
+                    total_file_count = total_file_count - 1,
+                    total_bytes = total_bytes - OLD.size
+                WHERE folder_id IN ({old_file_ancestors});
+                UPDATE folder_stats SET file_count = file_count + 1
+                WHERE folder_id = NEW.folder_id;
+                UPDATE folder_stats SET
+                    total_file_count = total_file_count + 1,
+                    total_bytes = total_bytes + NEW.size
+                WHERE folder_id IN ({new_file_ancestors});
+            END
+        """,
+    }
+    
+    # Chemin d'un dossier ("A / B / C"), en remontant les parent_id ('' à la racine)
+    PATH_SQL = """
+        COALESCE((
+            SELECT group_concat(name, ' / ') FROM (
+                WITH RECURSIVE chain(name, parent_id, depth) AS (
+                    SELECT name, parent_id, 0 FROM folders WHERE id = {start}
+                    UNION ALL
+                    SELECT folders.name, folders.parent_id, chain.depth + 1
+                    FROM folders JOIN chain ON folders.id = chain.parent_id
+                )
+                SELECT name FROM chain ORDER BY depth DESC
+            )
+        ), '')
+    """
+    
+    # Chemin complet d'un dossier lu dans sa ligne de search_index (un seul accès)
+    INDEXED_PATH_SQL = """
+        (SELECT CASE WHEN path = '' THEN name ELSE path || ' / ' || name END
+         FROM search_index WHERE rowid = -({start}))
+    """
+    
+    # Sous-arbre d'un dossier (lui compris), en descendant les parent_id
+    SUBTREE_SQL = """
+        WITH RECURSIVE subtree(id) AS (
+            SELECT {start}
+            UNION ALL
+            SELECT folders.id FROM folders JOIN subtree ON folders.parent_id = subtree.id
+        )
+        SELECT id FROM subtree
+    """
+    
+    # Triggers maintenant search_index à jour. rowid = ID du fichier, ou
+    # -ID du dossier; path = chemin du dossier contenant l'élément. Le chemin
+    # d'un fichier est repris de la ligne de son dossier (déjà indexé).
+    # Renommer ou déplacer un dossier réécrit le chemin de tout son sous-arbre.
+    SEARCH_INDEX_TRIGGERS = {
+        'trg_folders_insert_search': """
+            AFTER INSERT ON folders
+            BEGIN
+                INSERT INTO search_index (rowid, name, path)
+                VALUES (-NEW.id, NEW.name, {new_parent_path});
+            END
+        """,
+        'trg_folders_delete_search': """
+            AFTER DELETE ON folders
+            BEGIN
+                DELETE FROM search_index WHERE rowid = -OLD.id;
+            END
+        """,
+        'trg_folders_update_search': """
+            AFTER UPDATE OF name, parent_id ON folders
+            WHEN OLD.name IS NOT NEW.name OR OLD.parent_id IS NOT NEW.parent_id
+            BEGIN
+                UPDATE search_index SET name = NEW.name, path = {new_parent_path}
+                WHERE rowid = -NEW.id;
+                UPDATE search_index SET path = {indexed_folder_parent_path}
+                WHERE rowid IN (SELECT -id FROM ({new_subtree}) WHERE id != NEW.id);
+                UPDATE search_index SET path = {indexed_file_path}
+                WHERE rowid IN (SELECT id FROM files WHERE folder_id IN ({new_subtree}));
+            END
+        """,
+        'trg_files_insert_search': """
+            AFTER INSERT ON files
+            BEGIN
+                INSERT INTO search_index (rowid, name, path)
+                VALUES (NEW.id, NEW.filename, {new_file_path});
+            END
+        """,
+        'trg_files_delete_search': """
+            AFTER DELETE ON files
+            BEGIN
+                DELETE FROM search_index WHERE rowid = OLD.id;
+            END
+        """,
+        'trg_files_update_search': """
+            AFTER UPDATE OF filename, folder_id ON files
+            WHEN OLD.filename IS NOT NEW.filename OR OLD.folder_id IS NOT NEW.folder_id
+            BEGIN
+                UPDATE search_index SET name = NEW.filename, path = {new_file_path}
+                WHERE rowid = NEW.id;
+            END
+        """,
+    }
+    
+    # Triggers mettant en file d'attente l'extraction du contenu des fichiers
+    # ajoutés ou remplacés (un simple déplacement dans uploads/ ne compte pas)
+    CONTENT_INDEX_TRIGGERS = {
+        'trg_files_insert_content': """
+            AFTER INSERT ON files
+            BEGIN
+                INSERT OR REPLACE INTO content_queue (file_id, attempts) VALUES (NEW.id, 0);
+            END
+        """,
+        'trg_files_update_content': """
+            AFTER UPDATE OF filepath ON files
+            WHEN OLD.filepath IS NOT NEW.filepath
+                 AND (OLD.content_hash IS NOT NEW.content_hash OR OLD.size IS NOT NEW.size
+                      OR OLD.mtime IS NOT NEW.mtime)
+            BEGIN
+                INSERT OR REPLACE INTO content_queue (file_id, attempts) VALUES (NEW.id, 0);
+            END
+        """,
+        'trg_files_delete_content': """
+            AFTER DELETE ON files
+            BEGIN
+                DELETE FROM content_queue WHERE file_id = OLD.id;
+                DELETE FROM content_index WHERE rowid = OLD.id;
+            END
+        """,
+    }
+    
+    # Poids de bm25 par colonne de search_index (name, path): le nom compte davantage
+    SEARCH_WEIGHTS = (10.0, 1.0)
+    
+    def __init__(self, db_path: str = "portal.db",
+                 profile: Union[str, ConnectionProfile] = DEFAULT_PROFILE,
+                 cache_size: int = 0):
+        """
+        Args:
+            cache_size: Nombre maximal de lignes gardées en mémoire par le
+                cache des lectures de l'arborescence (0 = pas de cache,
+                voir cache.QueryCache)
+        """
+        self.db_path = db_path
+        self.profile = CONNECTION_PROFILES[profile] if isinstance(profile, str) else profile
+        self.conn = None
+        self.cursor = None
+        self._batch_depth = 0
+        self._after_commit = []
+        self.events = EventBus()
+        self.cache = QueryCache(cache_size) if cache_size else None
+        if self.cache is not None:
+            # Modifications faites par d'autres connexions (événements republiés)
+            self.events.subscribe(self.cache.invalidate)
+        self.connect()
+        self.create_tables()
+        self.create_default_admin()
+    
+    def connect(self):
+        """Établir la connexion à la base de données"""
+        try:
+            self.conn = sqlite3.connect(self.db_path)
+            self.conn.row_factory = sqlite3.Row
+            self.cursor = self.conn.cursor()
+            for pragma in self.profile.pragmas():
+                self.cursor.execute(pragma)
+            print(f"✅ Connexion à la base de données réussie: {self.db_path} "
+                  f"(profil {self.profile.name})")
+        except sqlite3.Error as e:
+            print(f"❌ Erreur de connexion à la base de données: {e}")
+            raise
+    
+    # ==================== TRANSACTIONS ====================
+    
+    @contextmanager
+    def batch(self):
+        """
+        Regrouper plusieurs écritures dans une seule transaction
+        
+        À l'intérieur du bloc, les méthodes d'écriture ne valident plus
+        individuellement: tout est validé à la sortie du bloc le plus externe,
+        ou annulé si une exception le traverse.
+        
+        Exemple:
+            with db.batch():
+                folder_id = db.create_folder("Audit 2024")
+                db.add_files_bulk(rows)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.rollback()
+            raise
+        self._batch_depth -= 1
+        self.commit()
+    
+    @property
+    def in_batch(self) -> bool:
+        """Indique si une transaction batch() est en cours"""
+        return self._batch_depth > 0
+    
+    def commit(self):
+        """Valider la transaction courante (différé à l'intérieur d'un batch())"""
+        if self._batch_depth:
+            return
+        self.conn.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+    
+    def checkpoint(self):
+        """
+        Valider le travail en cours, même à l'intérieur d'un batch()
+        
+        Pour les traitements longs (imports): après un arrêt brutal, tout ce
+        qui précède le dernier point de validation est conservé.
+        """
+        depth, self._batch_depth = self._batch_depth, 0
+        try:
+            self.commit()
+        finally:
+            self._batch_depth = depth
+    
+    def rollback(self):
+        """Annuler la transaction courante et les actions différées"""
+        self.conn.rollback()
+        self._after_commit = []
+        if self.cache is not None:
+            # Le cache a pu lire des données qui viennent d'être annulées
+            self.cache.clear()
+    
+    def after_commit(self, callback: Callable[[], None]):
+        """Différer une action (ex: suppression physique) jusqu'au prochain commit"""
+        self._after_commit.append(callback)
+    
+    def emit(self, event):
+        """Publier un événement (voir events.py) une fois la modification validée"""
+        if self.cache is not None:
+            # Immédiatement: les lectures suivantes de cette connexion voient la modification
+            self.cache.invalidate(event)
+        self.after_commit(lambda: self.events.publish(event))
+    
+    def create_tables(self):
+        """Créer les tables nécessaires (migrations du schéma)"""
+        try:
+            applied = self.migrate()
+            if applied:
+                print(f"✅ Schéma mis à jour en version {self.schema_version()}")
+            print("✅ Tables créées avec succès")
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la création des tables: {e}")
+            raise
+    
+    def schema_version(self) -> int:
+        """Version du schéma de la base (PRAGMA user_version)"""
+        self.cursor.execute("PRAGMA user_version")
+        return self.cursor.fetchone()[0]
+    
+    def migrate(self) -> int:
+        """
+        Appliquer les migrations en attente, chacune dans sa transaction
+        
+        Returns:
+            int: Nombre de migrations appliquées
+        """
+        current = self.schema_version()
+        pending = [migration for migration in MIGRATIONS if migration.version > current]
+        
+        for migration in pending:
+            print(f"🔧 Migration {migration.version}: {migration.description}")
+            try:
+                self.cursor.execute("BEGIN")
+                migration.apply(self)
+                self.cursor.execute(f"PRAGMA user_version = {migration.version}")
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
+        
+        # Les triggers suivent toujours les définitions courantes
+        if pending:
+            self.cursor.execute("BEGIN")
+            self.create_triggers()
+            self.conn.commit()
+        
+        return len(pending)
+    
+    def add_column_if_missing(self, table: str, column: str, definition: str):
+        """Ajouter une colonne à une table existante si elle n'existe pas encore"""
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row['name'] for row in self.cursor.fetchall()]:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    
+    def create_triggers(self):
+        """
+        (Re)créer les triggers qui maintiennent folder_closure, folder_stats,
+        search_index et content_queue
+        
+        Appelé après chaque passe de migrations : une modification du corps
+        d'un trigger doit donc s'accompagner d'une nouvelle migration.
+        """
+        ancestors = {
+            'old_ancestors': self.ANCESTORS_SQL.format(start='OLD.parent_id'),
+            'new_ancestors': self.ANCESTORS_SQL.format(start='NEW.parent_id'),
+            'old_file_ancestors': self.CLOSURE_ANCESTORS_SQL.format(start='OLD.folder_id'),
+            'new_file_ancestors': self.CLOSURE_ANCESTORS_SQL.format(start='NEW.folder_id'),
+            'new_parent_path': self.PATH_SQL.format(start='NEW.parent_id'),
+            'new_file_path': self.INDEXED_PATH_SQL.format(start='NEW.folder_id'),
+            'new_subtree': self.SUBTREE_SQL.format(start='NEW.id'),
+            'indexed_folder_parent_path': self.PATH_SQL.format(
+                start='(SELECT parent_id FROM folders WHERE id = -search_index.rowid)'),
+            'indexed_file_path': self.INDEXED_PATH_SQL.format(
+                start='SELECT folder_id FROM files WHERE id = search_index.rowid'),
+        }
+        triggers = {**self.FOLDER_CLOSURE_TRIGGERS, **self.FOLDER_STATS_TRIGGERS,
+                    **self.SEARCH_INDEX_TRIGGERS, **self.CONTENT_INDEX_TRIGGERS}
+        for name, body in triggers.items():
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            self.cursor.execute(f"CREATE TRIGGER {name} {body.format(**ancestors)}")
+    
+    def create_default_admin(self):
+        """Créer un compte admin par défaut"""
+        try:
+            self.cursor.execute(
+                "SELECT COUNT(*) FROM admins WHERE email = ?", 
+                ('admin',)
+            )
+            if self.cursor.fetchone()[0] == 0:
+                self.cursor.execute(
+                    "INSERT INTO admins (email, password) VALUES (?, ?)",
+                    ('admin', 'admin')  # En production, hasher le mot de passe
+                )
+                self.conn.commit()
+                print("✅ Admin par défaut créé (admin/admin)")
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la création de l'admin: {e}")
+    
+    def authenticate_admin(self, email: str, password: str) -> bool:
+        """Authentifier un administrateur"""
+        try:
+            self.cursor.execute(
+                "SELECT * FROM admins WHERE email = ? AND password = ?",
+                (email, password)
+            )
+            result = self.cursor.fetchone()
+            return result is not None
+        except sqlite3.Error as e:
+            print(f"❌ Erreur d'authentification: {e}")
+            return False
+    
+    # ==================== GESTION DES DOSSIERS ====================
+    
+    def create_folder(self, name: str, parent_id: Optional[int] = None) -> int:
+        """Créer un nouveau dossier"""
+        try:
+            self.cursor.execute(
+                "INSERT INTO folders (name, parent_id) VALUES (?, ?)",
+                (name, parent_id)
+            )
+            folder_id = self.cursor.lastrowid
+            self.emit(FolderAdded(folder_id, parent_id, name))
+            self.commit()
+            return folder_id
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la création du dossier: {e}")
+            raise
+    
+    def create_folders_bulk(self, folders: Iterable[Tuple[str, Optional[int]]]) -> List[int]:
+        """
+        Créer plusieurs dossiers dans une seule transaction
+        
+        Args:
+            folders: Couples (nom, parent_id)
+        
+        Returns:
+            List[int]: IDs des dossiers créés, dans l'ordre reçu
+        """
+        folder_ids = []
+        try:
+            with self.batch():
+                for name, parent_id in folders:
+                    self.cursor.execute(
+                        "INSERT INTO folders (name, parent_id) VALUES (?, ?)",
+                        (name, parent_id)
+                    )
+                    folder_ids.append(self.cursor.lastrowid)
+                    self.emit(FolderAdded(self.cursor.lastrowid, parent_id, name))
+            return folder_ids
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la création des dossiers: {e}")
+            raise
+    
+    @cached('folder')
+    def get_folder(self, folder_id: int) -> Optional[Dict[str, Any]]:
+        """Récupérer un dossier par son ID"""
+        try:
+            self.cursor.execute(
+                "SELECT * FROM folders WHERE id = ?",
+                (folder_id,)
+            )
+            row = self.cursor.fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération du dossier: {e}")
+            return None
+    
+    def get_all_folders(self) -> List[Dict[str, Any]]:
+        """Récupérer tous les dossiers"""
+        try:
+            self.cursor.execute("SELECT * FROM folders ORDER BY name ASC")
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des dossiers: {e}")
+            return []
+    
+    @cached('subfolders')
+    def get_subfolders(self, parent_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Récupérer les sous-dossiers d'un dossier parent"""
+        try:
+            if parent_id is None:
+                self.cursor.execute(
+                    "SELECT * FROM folders WHERE parent_id IS NULL ORDER BY name ASC"
+                )
+            else:
+                self.cursor.execute(
+                    "SELECT * FROM folders WHERE parent_id = ? ORDER BY name ASC",
+                    (parent_id,)
+                )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des sous-dossiers: {e}")
+            return []
+    
+    def get_subfolders_page(self, parent_id: Optional[int] = None,
+                            after: Optional[Dict[str, Any]] = None,
+                            limit: int = 200) -> List[Dict[str, Any]]:
+        """
+        Une page des sous-dossiers d'un dossier, triés par (nom, id)
+        
+        Pagination par clé (index idx_folders_parent_name): chaque page coûte
+        le même temps, quelle que soit sa position dans le dossier.
+        
+        Args:
+            after: Dernier sous-dossier de la page précédente (None: première page)
+            limit: Taille de la page
+        """
+        where = "parent_id IS NULL" if parent_id is None else "parent_id = ?"
+        params: List[Any] = [] if parent_id is None else [parent_id]
+        if after is not None:
+            where += " AND (name, id) > (?, ?)"
+            params += [after['name'], after['id']]
+        try:
+            self.cursor.execute(
+                f"SELECT * FROM folders WHERE {where} ORDER BY name, id LIMIT ?",
+                (*params, limit)
+            )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des sous-dossiers: {e}")
+            return []
+    
+    def count_subfolders(self, parent_id: Optional[int] = None) -> int:
+        """Nombre de sous-dossiers directs (agrégats, sauf à la racine)"""
+        if parent_id is not None:
+            return self.get_folder_stats(parent_id)['subfolder_count']
+        self.cursor.execute("SELECT COUNT(*) FROM folders WHERE parent_id IS NULL")
+        return self.cursor.fetchone()[0]
+    
+    def update_folder(self, folder_id: int, name: str) -> bool:
+        """Renommer un dossier"""
+        try:
+            self.cursor.execute(
+                "UPDATE folders SET name = ? WHERE id = ?",
+                (name, folder_id)
+            )
+            self.emit(FolderRenamed(folder_id, name))
+            self.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la mise à jour du dossier: {e}")
+            return False
+    
+    def move_folder(self, folder_id: int, new_parent_id: Optional[int]) -> bool:
+        """Déplacer un dossier (et son sous-arbre) sous un nouveau parent"""
+        try:
+            if new_parent_id is not None and self.is_descendant(new_parent_id, folder_id):
+                print("❌ Impossible de déplacer un dossier dans son propre sous-arbre")
+                return False
+            
+            folder = self.get_folder(folder_id)
+            self.cursor.execute(
+                "UPDATE folders SET parent_id = ? WHERE id = ?",
+                (new_parent_id, folder_id)
+            )
+            if folder:
+                self.emit(FolderMoved(folder_id, folder['parent_id'], new_parent_id))
+            self.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors du déplacement du dossier: {e}")
+            return False
+    
+    def is_descendant(self, folder_id: int, ancestor_id: int) -> bool:
+        """Vérifier si un dossier appartient au sous-arbre d'un autre (lui compris)"""
+        self.cursor.execute(
+            "SELECT 1 FROM folder_closure WHERE ancestor_id = ? AND descendant_id = ?",
+            (ancestor_id, folder_id)
+        )
+        return self.cursor.fetchone() is not None
+    
+    def get_ancestor_ids(self, folder_ids: Iterable[int]) -> Set[int]:
+        """Récupérer les IDs de ces dossiers et de tous leurs ancêtres (table de fermeture)"""
+        ids = list(dict.fromkeys(folder_ids))
+        ancestors = set()
+        try:
+            for i in range(0, len(ids), self.SQL_VARIABLES_CHUNK):
+                chunk = ids[i:i + self.SQL_VARIABLES_CHUNK]
+                self.cursor.execute(
+                    "SELECT DISTINCT ancestor_id FROM folder_closure "
+                    f"WHERE descendant_id IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                ancestors.update(row[0] for row in self.cursor.fetchall())
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des ancêtres: {e}")
+        return ancestors
+    
+    def find_folder(self, name: str, parent_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Trouver un dossier par son nom dans un parent (None = racine)"""
+        try:
+            self.cursor.execute(
+                "SELECT * FROM folders WHERE parent_id IS ? AND name = ? ORDER BY id LIMIT 1",
+                (parent_id, name)
+            )
+            row = self.cursor.fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la recherche du dossier: {e}")
+            return None
+    
+    def get_subtree(self, folder_id: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Dossiers et fichiers du sous-arbre d'un dossier (lui compris)
+        
+        Returns:
+            Tuple[List[Dict], List[Dict]]: (dossiers du plus haut au plus
+            profond, avec leur profondeur; fichiers)
+        """
+        subtree = "SELECT descendant_id FROM folder_closure WHERE ancestor_id = ?"
+        self.cursor.execute(
+            """
+            SELECT folders.*, folder_closure.depth FROM folder_closure
+            JOIN folders ON folders.id = folder_closure.descendant_id
+            WHERE folder_closure.ancestor_id = ?
+            ORDER BY folder_closure.depth, folders.id
+            """,
+            (folder_id,)
+        )
+        folders = [dict(row) for row in self.cursor.fetchall()]
+        self.cursor.execute(
+            f"SELECT * FROM files WHERE folder_id IN ({subtree}) ORDER BY id",
+            (folder_id,)
+        )
+        return folders, [dict(row) for row in self.cursor.fetchall()]
+    
+    def delete_folder(self, folder_id: int) -> bool:
+        """Supprimer un dossier, ses sous-dossiers et leurs fichiers"""
+        subtree = "SELECT descendant_id FROM folder_closure WHERE ancestor_id = ?"
+        try:
+            # Récupérer les fichiers de tout le sous-arbre
+            self.cursor.execute(
+                f"SELECT filepath FROM files WHERE folder_id IN ({subtree})",
+                (folder_id,)
+            )
+            filepaths = [file['filepath'] for file in self.cursor.fetchall()]
+            folder = self.get_folder(folder_id)
+            
+            # Supprimer les fichiers puis les dossiers de la base
+            # (dans cet ordre pour que les triggers de folder_stats restent exacts)
+            self.cursor.execute(
+                f"DELETE FROM files WHERE folder_id IN ({subtree})",
+                (folder_id,)
+            )
+            self.cursor.execute(
+                f"DELETE FROM folders WHERE id IN ({subtree})",
+                (folder_id,)
+            )
+            
+            # Supprimer les fichiers physiques qui ne sont plus référencés
+            # (stockage par contenu: un objet peut être partagé), une fois
+            # la suppression validée
+            orphans = self.unreferenced_filepaths(filepaths)
+            self.after_commit(lambda: self.remove_physical_files(orphans))
+            if folder:
+                self.emit(FolderRemoved(folder_id, folder['parent_id']))
+            self.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la suppression du dossier: {e}")
+            return False
+    
+    @cached('path')
+    def get_folder_path(self, folder_id: int) -> List[Dict[str, Any]]:
+        """Récupérer le chemin complet d'un dossier (breadcrumb)"""
+        try:
+            self.cursor.execute(
+                """
+                SELECT folders.* FROM folder_closure
+                JOIN folders ON folders.id = folder_closure.ancestor_id
+                WHERE folder_closure.descendant_id = ?
+                ORDER BY folder_closure.depth DESC
+                """,
+                (folder_id,)
+            )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération du chemin: {e}")
+            return []
+    
+    def fill_folder_closure(self) -> int:
+        """
+        Recalculer la table folder_closure depuis les parent_id (sans commit)
+        
+        Returns:
+            int: Nombre de liens (ancêtre, descendant) créés
+        """
+        self.cursor.execute("DELETE FROM folder_closure")
+        self.cursor.execute("""
+            WITH RECURSIVE paths(ancestor_id, descendant_id, depth) AS (
+                SELECT id, id, 0 FROM folders
+                UNION ALL
+                SELECT paths.ancestor_id, folders.id, paths.depth + 1
+                FROM folders JOIN paths ON folders.parent_id = paths.descendant_id
+            )
+            INSERT INTO folder_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, descendant_id, depth FROM paths
+        """)
+        self.cursor.execute("SELECT COUNT(*) FROM folder_closure")
+        return self.cursor.fetchone()[0]
+    
+    def rebuild_folder_closure(self) -> int:
+        """
+        Recalculer entièrement la table folder_closure
+        
+        Returns:
+            int: Nombre de liens (ancêtre, descendant) créés
+        """
+        try:
+            count = self.fill_folder_closure()
+            self.conn.commit()
+            print(f"✅ Fermeture de l'arborescence recalculée ({count} lien(s))")
+            return count
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"❌ Erreur lors du recalcul de la fermeture: {e}")
+            raise
+    
+    # ==================== GESTION DES FICHIERS ====================
+    
+    def add_file(self, folder_id: int, filename: str, filepath: str,
+                 size: Optional[int] = None, mtime: Optional[float] = None,
+                 content_hash: Optional[str] = None) -> int:
+        """
+        Ajouter un fichier à la base de données
+        
+        size et mtime sont lus sur le disque s'ils ne sont pas fournis;
+        l'extension et le type MIME sont déduits du nom.
+        """
+        try:
+            if size is None or mtime is None:
+                try:
+                    stat = os.stat(filepath)
+                    size = stat.st_size if size is None else size
+                    mtime = stat.st_mtime if mtime is None else mtime
+                except OSError:
+                    size = size or 0
+            extension, mime_type = guess_file_type(filename)
+            self.cursor.execute(
+                "INSERT INTO files (folder_id, filename, filepath, size, mtime, mime_type, "
+                "extension, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (folder_id, filename, filepath, size, mtime, mime_type, extension, content_hash)
+            )
+            file_id = self.cursor.lastrowid
+            self.emit(FilesAdded((folder_id,), 1))
+            self.commit()
+            return file_id
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de l'ajout du fichier: {e}")
+            raise
+    
+    def add_files_bulk(self, files: Iterable[Dict[str, Any]]) -> int:
+        """
+        Ajouter plusieurs fichiers en une seule requête (executemany)
+        
+        Args:
+            files: Dictionnaires {folder_id, filename, filepath, size, mtime,
+                   mime_type, extension, content_hash}. Seuls les trois premiers
+                   sont requis: l'extension et le type MIME sont alors déduits du nom.
+        
+        Returns:
+            int: Nombre de fichiers ajoutés
+        """
+        rows = []
+        for file in files:
+            row = {'size': 0, 'mtime': None, 'content_hash': None, **file}
+            if 'extension' not in row or 'mime_type' not in row:
+                row['extension'], row['mime_type'] = guess_file_type(row['filename'])
+            rows.append(row)
+        try:
+            self.cursor.executemany(
+                "INSERT INTO files (folder_id, filename, filepath, size, mtime, mime_type, "
+                "extension, content_hash) VALUES (:folder_id, :filename, :filepath, :size, "
+                ":mtime, :mime_type, :extension, :content_hash)",
+                rows
+            )
+            if rows:
+                folder_ids = tuple(dict.fromkeys(row['folder_id'] for row in rows))
+                self.emit(FilesAdded(folder_ids, len(rows)))
+            self.commit()
+            return len(rows)
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de l'ajout des fichiers: {e}")
+            raise
+    
+    @cached('files')
+    def get_files_in_folder(self, folder_id: int) -> List[Dict[str, Any]]:
+        """Récupérer tous les fichiers d'un dossier"""
+        try:
+            self.cursor.execute(
+                "SELECT * FROM files WHERE folder_id = ? ORDER BY uploaded_at DESC",
+                (folder_id,)
+            )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des fichiers: {e}")
+            return []
+    
+    def get_files_page(self, folder_id: int, after: Optional[Dict[str, Any]] = None,
+                       limit: int = 200,
+                       listing: FileListing = DEFAULT_FILE_LISTING) -> List[Dict[str, Any]]:
+        """
+        Une page des fichiers d'un dossier, triés et filtrés selon `listing`
+        (par défaut: du plus récent au plus ancien, sans filtre)
+        
+        Tri par (clé, id), pagination par clé: chaque clé de tri a son index
+        (folder_id, clé), le millième écran d'un dossier d'un million de
+        fichiers coûte autant que le premier. Les filtres sont appliqués
+        pendant le parcours de l'index.
+        
+        Args:
+            after: Dernier fichier de la page précédente (None: première page)
+            limit: Taille de la page
+            listing: Tri et filtres
+        """
+        expression, column = FILE_SORT_KEYS[listing.sort]
+        direction, comparison = ('DESC', '<') if listing.descending else ('ASC', '>')
+        where, params = listing.conditions()
+        where.insert(0, "folder_id = ?")
+        params.insert(0, folder_id)
+        if after is not None:
+            # Borne simple en plus de la comparaison (clé, id): permet la
+            # recherche par intervalle dans l'index quand la clé a une collation
+            where.append(f"{expression} {comparison}= ?")
+            where.append(f"({expression}, id) {comparison} (?, ?)")
+            params += [after[column], after[column], after['id']]
+        try:
+            self.cursor.execute(
+                f"SELECT * FROM files WHERE {' AND '.join(where)} "
+                f"ORDER BY {expression} {direction}, id {direction} LIMIT ?",
+                (*params, limit)
+            )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération des fichiers: {e}")
+            return []
+    
+    def get_file(self, file_id: int) -> Optional[Dict[str, Any]]:
+        """Récupérer un fichier par son ID"""
+        try:
+            self.cursor.execute("SELECT * FROM files WHERE id = ?", (file_id,))
+            row = self.cursor.fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la récupération du fichier: {e}")
+            return None
+    
+    def update_file_content(self, file_id: int, filepath: str, size: int,
+                            mtime: Optional[float], content_hash: Optional[str] = None):
+        """
+        Remplacer le contenu stocké d'un fichier (nouvelle version importée)
+        
+        L'ancienne copie est supprimée du disque après le commit si plus
+        aucune ligne ne la référence.
+        """
+        try:
+            file = self.get_file(file_id)
+            self.cursor.execute(
+                "UPDATE files SET filepath = ?, size = ?, mtime = ?, content_hash = ? WHERE id = ?",
+                (filepath, size, mtime, content_hash, file_id)
+            )
+            if file and file['filepath'] != filepath:
+                orphans = self.unreferenced_filepaths([file['filepath']])
+                self.after_commit(lambda: self.remove_physical_files(orphans))
+            if file:
+                self.emit(FileUpdated(file_id, file['folder_id']))
+            self.commit()
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la mise à jour du fichier: {e}")
+            raise
+    
+    def delete_file(self, file_id: int) -> bool:
+        """Supprimer un fichier"""
+        try:
+            # Récupérer le chemin du fichier
+            file = self.get_file(file_id)
+            if file:
+                # Supprimer de la base
+                self.cursor.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                
+                # Supprimer le fichier physique s'il n'est plus référencé,
+                # une fois la suppression validée
+                orphans = self.unreferenced_filepaths([file['filepath']])
+                self.after_commit(lambda: self.remove_physical_files(orphans))
+                self.emit(FilesRemoved((file['folder_id'],), 1))
+                self.commit()
+                return True
+            return False
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la suppression du fichier: {e}")
+            return False
+    
+    def unreferenced_filepaths(self, filepaths: Iterable[str]) -> List[str]:
+        """
+        Chemins qu'aucune ligne de la table files ne référence plus
+        
+        Un objet du stockage par contenu est partagé par toutes les lignes
+        dont le contenu est identique: il ne peut être supprimé du disque
+        qu'avec sa dernière référence.
+        """
+        filepaths = list(dict.fromkeys(filepaths))
+        referenced = set()
+        for start in range(0, len(filepaths), self.SQL_VARIABLES_CHUNK):
+            chunk = filepaths[start:start + self.SQL_VARIABLES_CHUNK]
+            placeholders = ', '.join('?' * len(chunk))
+            self.cursor.execute(
+                f"SELECT DISTINCT filepath FROM files WHERE filepath IN ({placeholders})",
+                chunk
+            )
+            referenced.update(row['filepath'] for row in self.cursor.fetchall())
+        return [filepath for filepath in filepaths if filepath not in referenced]
+    
+    def remove_physical_files(self, filepaths: Iterable[str]):
+        """
+        Supprimer des fichiers du disque (les erreurs sont signalées, pas levées)
+        
+        Sous le verrou de FILE_RESERVATIONS, les références sont relues: un
+        fichier référencé par une ligne validée depuis (autre connexion) ou
+        réservé par un enregistrement en cours est conservé.
+        """
+        with FILE_RESERVATIONS.lock:
+            try:
+                filepaths = FILE_RESERVATIONS.unreserved(self.unreferenced_filepaths(filepaths))
+            except sqlite3.Error as e:
+                print(f"⚠️ Fichiers conservés (références illisibles): {e}")
+                return
+            for filepath in filepaths:
+                try:
+                    if os.path.exists(filepath):
+                        os.remove(filepath)
+                except Exception as e:
+                    print(f"⚠️ Impossible de supprimer le fichier {filepath}: {e}")
+    
+    def count_files_in_folder(self, folder_id: int, recursive: bool = False) -> int:
+        """Compter les fichiers dans un dossier"""
+        stats = self.get_folder_stats(folder_id)
+        return stats['total_file_count' if recursive else 'file_count']
+    
+    # ==================== AGRÉGATS PAR DOSSIER ====================
+    
+    def get_folder_stats(self, folder_id: int) -> Dict[str, int]:
+        """Récupérer les agrégats précalculés d'un dossier"""
+        return self.get_folder_stats_bulk([folder_id])[folder_id]
+    
+    def get_folder_stats_bulk(self, folder_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+        """
+        Récupérer les agrégats précalculés de plusieurs dossiers
+        
+        Returns:
+            Dict[int, Dict[str, int]]: {folder_id: {file_count, total_file_count,
+            total_bytes, subfolder_count}}, à zéro pour un dossier inconnu
+        """
+        if self.cache is not None:
+            return self.cache.get_many('stats', folder_ids, self._read_folder_stats)
+        return self._read_folder_stats(folder_ids)
+    
+    def _read_folder_stats(self, folder_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+        ids = list(dict.fromkeys(folder_ids))
+        stats = {folder_id: dict.fromkeys(self.STATS_COLUMNS, 0) for folder_id in ids}
+        try:
+            for start in range(0, len(ids), self.SQL_VARIABLES_CHUNK):
+                chunk = ids[start:start + self.SQL_VARIABLES_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                self.cursor.execute(
+                    f"SELECT * FROM folder_stats WHERE folder_id IN ({placeholders})",
+                    chunk
+                )
+                for row in self.cursor.fetchall():
+                    stats[row['folder_id']] = {column: row[column] for column in self.STATS_COLUMNS}
+            return stats
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la lecture des agrégats: {e}")
+            return stats
+    
+    def compute_folder_stats(self, folder_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, int]]:
+        """
+        Calculer les agrégats directement depuis les tables (CTE récursive)
+        
+        Args:
+            folder_ids: Dossiers à calculer (None pour tous les dossiers)
+        
+        Returns:
+            Dict[int, Dict[str, int]]: agrégats par dossier, au format de get_folder_stats_bulk
+        """
+        stats = {}
+        if folder_ids is None:
+            chunks = [None]
+        else:
+            ids = list(dict.fromkeys(folder_ids))
+            chunks = [ids[i:i + self.SQL_VARIABLES_CHUNK]
+                      for i in range(0, len(ids), self.SQL_VARIABLES_CHUNK)]
+        for chunk in chunks:
+            if chunk is None:
+                self.cursor.execute(self.COMPUTED_STATS_SQL.format(where=""))
+            else:
+                placeholders = ", ".join("?" * len(chunk))
+                self.cursor.execute(
+                    self.COMPUTED_STATS_SQL.format(where=f"WHERE id IN ({placeholders})"),
+                    chunk
+                )
+            for row in self.cursor.fetchall():
+                stats[row['folder_id']] = {column: row[column] for column in self.STATS_COLUMNS}
+        return stats
+    
+    def fill_folder_stats(self) -> int:
+        """
+        Recalculer la table folder_stats depuis les tables (sans commit)
+        
+        Returns:
+            int: Nombre de dossiers recalculés
+        """
+        computed = self.compute_folder_stats()
+        self.cursor.execute("DELETE FROM folder_stats")
+        self.cursor.executemany(
+            "INSERT INTO folder_stats (folder_id, file_count, total_file_count, "
+            "total_bytes, subfolder_count) VALUES (?, ?, ?, ?, ?)",
+            [(folder_id, *(row[column] for column in self.STATS_COLUMNS))
+             for folder_id, row in computed.items()]
+        )
+        return len(computed)
+    
+    def rebuild_folder_stats(self) -> int:
+        """
+        Recalculer entièrement la table folder_stats
+        
+        Returns:
+            int: Nombre de dossiers recalculés
+        """
+        try:
+            count = self.fill_folder_stats()
+            self.conn.commit()
+            if self.cache is not None:
+                self.cache.clear()
+            print(f"✅ Agrégats recalculés pour {count} dossier(s)")
+            return count
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"❌ Erreur lors du recalcul des agrégats: {e}")
+            raise
+    
+    def verify_folder_stats(self) -> List[Dict[str, Any]]:
+        """
+        Comparer folder_stats aux valeurs recalculées
+        
+        Returns:
+            List[Dict]: Écarts trouvés ({folder_id, expected, actual}), vide si cohérent
+        """
+        computed = self.compute_folder_stats()
+        self.cursor.execute("SELECT * FROM folder_stats")
+        stored = {
+            row['folder_id']: {column: row[column] for column in self.STATS_COLUMNS}
+            for row in self.cursor.fetchall()
+        }
+        
+        mismatches = []
+        for folder_id in sorted(set(computed) | set(stored)):
+            expected = computed.get(folder_id)
+            actual = stored.get(folder_id)
+            if expected != actual:
+                mismatches.append({'folder_id': folder_id, 'expected': expected, 'actual': actual})
+        return mismatches
+    
+    def backfill_file_metadata(self, after_id: int = 0,
+                               limit: int = 500) -> Tuple[int, Optional[int]]:
+        """
+        Renseigner taille et date de modification des fichiers importés avant
+        l'ajout de ces colonnes (mtime NULL), par lots en suivant l'ordre des ID
+        
+        Les fichiers introuvables sur le disque sont laissés tels quels (mtime
+        NULL) et seront réessayés au prochain passage complet. Chaque lot
+        publie FilesMeasured pour les dossiers concernés.
+        
+        Args:
+            after_id: Reprendre après cet ID (valeur renvoyée par l'appel précédent)
+            limit: Nombre maximal de fichiers examinés
+        
+        Returns:
+            Tuple[int, Optional[int]]: (fichiers mis à jour, dernier ID examiné
+            ou None s'il n'en reste plus)
+        """
+        self.cursor.execute(
+            "SELECT id, folder_id, filepath FROM files WHERE mtime IS NULL AND id > ? "
+            "ORDER BY id LIMIT ?",
+            (after_id, limit)
+        )
+        rows = self.cursor.fetchall()
+        if not rows:
+            return 0, None
+        
+        updates = []
+        folder_ids = set()
+        for row in rows:
+            try:
+                stat = os.stat(row['filepath'])
+            except OSError:
+                continue
+            updates.append((stat.st_size, stat.st_mtime, row['id']))
+            folder_ids.add(row['folder_id'])
+        
+        try:
+            # Les triggers de folder_stats répercutent les corrections de taille
+            self.cursor.executemany("UPDATE files SET size = ?, mtime = ? WHERE id = ?", updates)
+            if updates:
+                # Tailles corrigées: listes de fichiers et agrégats périmés
+                self.emit(FilesMeasured(tuple(sorted(folder_ids)), len(updates)))
+            self.commit()
+        except sqlite3.Error as e:
+            self.rollback()
+            print(f"❌ Erreur lors de la mise à jour des métadonnées: {e}")
+            raise
+        return len(updates), rows[-1]['id']
+    
+    def backfill_all_file_metadata(self) -> int:
+        """
+        Renseigner les métadonnées de tous les fichiers qui n'en ont pas
+        
+        Returns:
+            int: Nombre de fichiers mis à jour
+        """
+        total = 0
+        updated, last_id = self.backfill_file_metadata()
+        while last_id is not None:
+            total += updated
+            updated, last_id = self.backfill_file_metadata(last_id)
+        return total
+    
+    # ==================== RECHERCHE ====================
+    
+    def fill_search_index(self) -> int:
+        """
+        Recalculer la table search_index depuis les tables (sans commit)
+        
+        Returns:
+            int: Nombre d'éléments (dossiers et fichiers) indexés
+        """
+        self.cursor.execute("SELECT id, name, parent_id FROM folders")
+        folders = {row['id']: row for row in self.cursor.fetchall()}
+        paths = {}
+        
+        def folder_path(folder_id):
+            # Chemin complet du dossier, mémorisé (chaque dossier n'est remonté qu'une fois)
+            chain = []
+            while folder_id is not None and folder_id not in paths:
+                chain.append(folder_id)
+                folder_id = folders[folder_id]['parent_id'] if folder_id in folders else None
+            prefix = paths.get(folder_id, '')
+            for current in reversed(chain):
+                name = folders[current]['name'] if current in folders else ''
+                prefix = f"{prefix} / {name}" if prefix else name
+                paths[current] = prefix
+            return paths.get(chain[0], prefix) if chain else prefix
+        
+        self.cursor.execute("DELETE FROM search_index")
+        self.cursor.executemany(
+            "INSERT INTO search_index (rowid, name, path) VALUES (?, ?, ?)",
+            [(-folder_id, row['name'], folder_path(row['parent_id']))
+             for folder_id, row in folders.items()]
+        )
+        self.cursor.executemany(
+            "INSERT INTO search_index (rowid, name, path) "
+            "SELECT id, filename, ? FROM files WHERE folder_id = ?",
+            [(folder_path(folder_id), folder_id) for folder_id in folders]
+        )
+        self.cursor.execute("SELECT COUNT(*) FROM search_index")
+        return self.cursor.fetchone()[0]
+    
+    def rebuild_search_index(self) -> int:
+        """
+        Recalculer entièrement l'index de recherche
+        
+        Returns:
+            int: Nombre d'éléments indexés
+        """
+        try:
+            count = self.fill_search_index()
+            self.cursor.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+            self.conn.commit()
+            print(f"✅ Index de recherche recalculé ({count} élément(s))")
+            return count
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"❌ Erreur lors du recalcul de l'index de recherche: {e}")
+            raise
+    
+    @staticmethod
+    def search_query(text: str) -> str:
+        """
+        Requête FTS5 pour une saisie libre: tous les mots, chacun en préfixe
+        
+        "rapport 2023" -> "rapport"* "2023"* (les guillemets neutralisent la
+        syntaxe FTS5: AND, OR, NEAR, *, ^ ... tapés par l'utilisateur)
+        """
+        words = re.findall(r'\w+', text)
+        return ' '.join(f'"{word}"*' for word in words)
+    
+    def search(self, text: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Rechercher dossiers et fichiers par nom et par chemin
+        
+        Chaque mot saisi doit apparaître (en début de mot, sans tenir compte
+        des accents ni de la casse) dans le nom ou dans le chemin. Les
+        résultats sont classés par pertinence (bm25, le nom comptant plus
+        que le chemin).
+        
+        Args:
+            text: Saisie de l'utilisateur
+            limit: Nombre maximal de résultats (une page)
+            offset: Nombre de résultats à sauter (pages précédentes)
+        
+        Returns:
+            List[Dict]: {kind ('folder' ou 'file'), id, name, path, folder_id
+            (dossier parent ou contenant), size, filepath} par résultat
+        """
+        query = self.search_query(text)
+        if not query:
+            return []
+        weights = ', '.join(str(weight) for weight in self.SEARCH_WEIGHTS)
+        self.cursor.execute(f"""
+            SELECT hit.rowid, hit.name, hit.path, hit.rank,
+                   files.folder_id, files.size, files.filepath, folders.parent_id
+            FROM (
+                SELECT rowid, name, path, bm25(search_index, {weights}) AS rank
+                FROM search_index WHERE search_index MATCH ?
+                ORDER BY rank LIMIT ? OFFSET ?
+            ) AS hit
+            LEFT JOIN files ON hit.rowid > 0 AND files.id = hit.rowid
+            LEFT JOIN folders ON hit.rowid < 0 AND folders.id = -hit.rowid
+            ORDER BY hit.rank
+        """, (query, limit, offset))
+        results = []
+        for row in self.cursor.fetchall():
+            is_file = row['rowid'] > 0
+            results.append({
+                'kind': 'file' if is_file else 'folder',
+                'id': abs(row['rowid']),
+                'name': row['name'],
+                'path': row['path'],
+                'folder_id': row['folder_id'] if is_file else row['parent_id'],
+                'size': row['size'] if is_file else None,
+                'filepath': row['filepath'] if is_file else None,
+            })
+        return results
+    
+    def search_content(self, text: str, limit: int = 50,
+                       offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Rechercher les fichiers par leur contenu (content_index)
+        
+        Même saisie et même classement que search(); seuls les fichiers dont
+        le texte a déjà été extrait (voir utils.content_indexer) sont trouvés.
+        
+        Returns:
+            List[Dict]: Comme search(), avec en plus snippet (extrait du texte
+            autour des mots trouvés, entre [ ])
+        """
+        query = self.search_query(text)
+        if not query:
+            return []
+        self.cursor.execute("""
+            SELECT hit.rowid, hit.snippet, files.filename, files.folder_id, files.size,
+                   files.filepath, search_index.path
+            FROM (
+                SELECT rowid, snippet(content_index, 0, '[', ']', '…', 12) AS snippet,
+                       rank
+                FROM content_index WHERE content_index MATCH ?
+                ORDER BY rank LIMIT ? OFFSET ?
+            ) AS hit
+            JOIN files ON files.id = hit.rowid
+            LEFT JOIN search_index ON search_index.rowid = hit.rowid
+            ORDER BY hit.rank
+        """, (query, limit, offset))
+        return [
+            {
+                'kind': 'file',
+                'id': row['rowid'],
+                'name': row['filename'],
+                'path': row['path'] or '',
+                'folder_id': row['folder_id'],
+                'size': row['size'],
+                'filepath': row['filepath'],
+                'snippet': row['snippet'],
+            }
+            for row in self.cursor.fetchall()
+        ]
+    
+    # ==================== INDEXATION DU CONTENU ====================
+    
+    def claim_content_batch(self, limit: int, max_attempts: int) -> List[Dict[str, Any]]:
+        """
+        Prendre dans la file d'attente les prochains fichiers à indexer
+        
+        Chaque fichier pris compte une tentative: celui dont l'extraction
+        n'aboutit jamais (processus tombé, délai dépassé) est abandonné après
+        max_attempts essais, jusqu'à son prochain remplacement.
+        
+        Returns:
+            List[Dict]: {file_id, filepath, extension, twin_id}, twin_id étant
+            un fichier de même chemin (contenu identique dans le stockage par
+            contenu) déjà indexé, dont le texte peut être repris
+        """
+        try:
+            self.cursor.execute("""
+                SELECT content_queue.file_id, files.filepath, files.extension,
+                       (SELECT twin.id FROM files AS twin
+                        JOIN content_index ON content_index.rowid = twin.id
+                        WHERE twin.filepath = files.filepath AND twin.id != files.id
+                        LIMIT 1) AS twin_id
+                FROM content_queue JOIN files ON files.id = content_queue.file_id
+                WHERE content_queue.attempts < ?
+                ORDER BY content_queue.file_id
+                LIMIT ?
+            """, (max_attempts, limit))
+            batch = [dict(row) for row in self.cursor.fetchall()]
+            self.cursor.executemany(
+                "UPDATE content_queue SET attempts = attempts + 1 WHERE file_id = ?",
+                [(item['file_id'],) for item in batch]
+            )
+            self.commit()
+            return batch
+        except sqlite3.Error as e:
+            self.rollback()
+            print(f"❌ Erreur lors de la lecture de la file d'indexation: {e}")
+            raise
+    
+    def store_content(self, results: Iterable[Tuple[Dict[str, Any], Optional[str]]]) -> int:
+        """
+        Enregistrer le texte extrait et retirer les fichiers de la file d'attente
+        
+        Args:
+            results: (élément de claim_content_batch, texte ou None). None:
+                rien à indexer (format non pris en charge, document sans texte)
+        
+        Un fichier remplacé ou supprimé pendant l'extraction est ignoré: il a
+        été remis en file d'attente (ou en a été retiré) par les triggers.
+        
+        Returns:
+            int: Nombre de fichiers indexés
+        """
+        indexed = 0
+        try:
+            for item, text in results:
+                self.cursor.execute("SELECT filepath FROM files WHERE id = ?", (item['file_id'],))
+                row = self.cursor.fetchone()
+                if row is None or row['filepath'] != item['filepath']:
+                    continue
+                self.cursor.execute("DELETE FROM content_index WHERE rowid = ?", (item['file_id'],))
+                if text:
+                    self.cursor.execute(
+                        "INSERT INTO content_index (rowid, body) VALUES (?, ?)",
+                        (item['file_id'], text)
+                    )
+                    indexed += 1
+                self.cursor.execute("DELETE FROM content_queue WHERE file_id = ?", (item['file_id'],))
+            self.commit()
+            return indexed
+        except sqlite3.Error as e:
+            self.rollback()
+            print(f"❌ Erreur lors de l'enregistrement du contenu indexé: {e}")
+            raise
+    
+    def get_content_text(self, file_id: int) -> Optional[str]:
+        """Texte indexé d'un fichier (None s'il ne l'est pas)"""
+        self.cursor.execute("SELECT body FROM content_index WHERE rowid = ?", (file_id,))
+        row = self.cursor.fetchone()
+        return row['body'] if row else None
+    
+    def count_pending_content(self, max_attempts: int) -> int:
+        """Nombre de fichiers en attente d'indexation du contenu"""
+        self.cursor.execute(
+            "SELECT COUNT(*) FROM content_queue WHERE attempts < ?", (max_attempts,)
+        )
+        return self.cursor.fetchone()[0]
+    
+    # ==================== JOURNAL DES IMPORTS ====================
+    
+    def create_import_job(self, source_path: str, mode: str,
+                          parent_folder_id: Optional[int] = None,
+                          root_folder_id: Optional[int] = None) -> int:
+        """
+        Ouvrir une entrée du journal des imports (statut 'running')
+        
+        Args:
+            mode: 'import' (nouveau dossier) ou 'sync' (dossier existant)
+        """
+        try:
+            now = datetime.now().timestamp()
+            self.cursor.execute(
+                "INSERT INTO import_jobs (source_path, mode, parent_folder_id, root_folder_id, "
+                "status, started_at, updated_at) VALUES (?, ?, ?, ?, 'running', ?, ?)",
+                (source_path, mode, parent_folder_id, root_folder_id, now, now)
+            )
+            self.commit()
+            return self.cursor.lastrowid
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de l'ouverture du journal d'import: {e}")
+            raise
+    
+    def update_import_job(self, job_id: int, **values):
+        """Mettre à jour une entrée du journal (status, root_folder_id, compteurs...)"""
+        values['updated_at'] = datetime.now().timestamp()
+        assignments = ', '.join(f"{column} = :{column}" for column in values)
+        try:
+            self.cursor.execute(
+                f"UPDATE import_jobs SET {assignments} WHERE id = :job_id",
+                {**values, 'job_id': job_id}
+            )
+            self.commit()
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la mise à jour du journal d'import: {e}")
+            raise
+    
+    def get_import_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Récupérer une entrée du journal des imports"""
+        try:
+            self.cursor.execute("SELECT * FROM import_jobs WHERE id = ?", (job_id,))
+            row = self.cursor.fetchone()
+            return dict(row) if row else None
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la lecture du journal d'import: {e}")
+            return None
+    
+    def get_interrupted_import_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Imports à reprendre ou annuler: restés 'running' (arrêt de
+        l'application pendant l'import) ou 'failed' (erreur après des
+        fichiers déjà validés)
+        """
+        try:
+            self.cursor.execute(
+                "SELECT * FROM import_jobs WHERE status IN ('running', 'failed') ORDER BY id"
+            )
+            return [dict(row) for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Erreur lors de la lecture du journal d'import: {e}")
+            return []
+    
+    def close(self):
+        """Fermer la connexion à la base de données"""
+        if self.conn:
+            self.conn.close()
+            print("✅ Connexion à la base de données fermée")
+
+
+def main():
+    """Commandes de maintenance: python database.py [--db portal.db] {rebuild-stats,verify-stats,rebuild-closure}"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Maintenance de la base du Portail Document")
+    parser.add_argument('--db', default="portal.db", help="Chemin de la base SQLite")
+    parser.add_argument('--profile', default=DEFAULT_PROFILE, choices=sorted(CONNECTION_PROFILES),
+                        help="Profil de connexion SQLite")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('rebuild-stats', help="Recalculer la table folder_stats")
+    subparsers.add_parser('verify-stats', help="Vérifier la table folder_stats")
+    subparsers.add_parser('rebuild-closure', help="Recalculer la table folder_closure")
+    args = parser.parse_args()
+    
+    db = Database(args.db, profile=args.profile)
+    try:
+        if args.command == 'rebuild-closure':
+            db.rebuild_folder_closure()
+            return 0
+        
+        if args.command == 'rebuild-stats':
+            updated = db.backfill_all_file_metadata()
+            print(f"✅ Métadonnées renseignées pour {updated} fichier(s)")
+            db.rebuild_folder_stats()
+            return 0
+        
+        mismatches = db.verify_folder_stats()
+        for mismatch in mismatches:
+            print(f"⚠️ Dossier {mismatch['folder_id']}: attendu {mismatch['expected']}, "
+                  f"trouvé {mismatch['actual']}")
+        if mismatches:
+            print(f"❌ {len(mismatches)} écart(s) - lancez 'rebuild-stats'")
+            return 1
+        print("✅ Agrégats cohérents")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
\ No newline at end of file
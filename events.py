@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+
+# ==================== ÉVÉNEMENTS ====================
+# Publiés par Database après la validation de la modification (jamais pour
+# une transaction annulée), dans l'ordre des écritures.
+
+@dataclass(frozen=True)
+class FolderAdded:
+    """Un dossier a été créé"""
+    folder_id: int
+    parent_id: Optional[int]
+    name: str
+
+
+@dataclass(frozen=True)
+class FolderRenamed:
+    """Un dossier a été renommé"""
+    folder_id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class FolderMoved:
+    """Un dossier (et son sous-arbre) a changé de parent"""
+    folder_id: int
+    old_parent_id: Optional[int]
+    new_parent_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class FolderRemoved:
+    """Un dossier a été supprimé avec son sous-arbre et ses fichiers"""
+    folder_id: int
+    parent_id: Optional[int]
+
+
+@dataclass(frozen=True)
+class FilesAdded:
+    """Des fichiers ont été ajoutés à ces dossiers"""
+    folder_ids: Tuple[int, ...]
+    count: int
+
+
+@dataclass(frozen=True)
+class FilesRemoved:
+    """Des fichiers ont été supprimés de ces dossiers"""
+    folder_ids: Tuple[int, ...]
+    count: int
+
+
+@dataclass(frozen=True)
+class FilesMeasured:
+    """Taille et date de modification de fichiers de ces dossiers relevées sur le disque"""
+    folder_ids: Tuple[int, ...]
+    count: int
+
+
+@dataclass(frozen=True)
+class FileUpdated:
+    """Le contenu d'un fichier a été remplacé (nouvelle version)"""
+    file_id: int
+    folder_id: int
+
+
+Listener = Callable[[object], None]
+
+
+class EventBus:
+    """
+    Diffusion des événements de modification aux vues abonnées
+    
+    Les abonnés sont appelés dans le thread qui publie: une Database
+    utilisée par un thread de travail doit faire passer ses événements
+    au thread de l'interface (file d'attente) avant de les republier.
+    """
+    
+    def __init__(self):
+        self._listeners: List[Listener] = []
+    
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """
+        Abonner `listener` à tous les événements
+        
+        Returns:
+            Callable: Fonction de désabonnement
+        """
+        self._listeners.append(listener)
+        return lambda: self.unsubscribe(listener)
+    
+    def unsubscribe(self, listener: Listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def publish(self, event):
+        """Transmettre un événement à tous les abonnés"""
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"⚠️ Erreur dans un abonné aux événements ({type(event).__name__}): {e}")
@@ -1,128 +1,282 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-
-"""
-Application Portail Document - SNTP
-Application desktop de gestion de documents avec Drag & Drop
-
-Auteur: Portail Document Team
-Version: 2.0.0
-"""
-
-import sys
-import os
-
-# Ajouter le répertoire parent au path pour les imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-# IMPORTANT: Importer TkinterDnD AVANT tk
-try:
-    from tkinterdnd2 import TkinterDnD
-    DRAG_DROP_AVAILABLE = True
-    print("✅ Module tkinterdnd2 chargé - Drag & Drop activé")
-except ImportError:
-    import tkinter as tk
-    DRAG_DROP_AVAILABLE = False
-    print("⚠️ Module tkinterdnd2 non trouvé - Drag & Drop désactivé")
-    print("   Pour activer le Drag & Drop, installez: pip install tkinterdnd2")
-
-from tkinter import messagebox
-from database import Database
-from utils.file_handler import FileHandler
-from ui.main_window import MainWindow
-
-
-class PortalApplication:
-    """Application principale du Portail Document"""
-    
-    def __init__(self):
-        # Créer la fenêtre principale avec support Drag & Drop si disponible
-        if DRAG_DROP_AVAILABLE:
-            self.root = TkinterDnD.Tk()
-            print("✅ Fenêtre TkinterDnD créée")
-        else:
-            import tkinter as tk
-            self.root = tk.Tk()
-            print("⚠️ Fenêtre Tk standard créée (pas de Drag & Drop)")
-        
-        self.db = None
-        self.file_handler = None
-        
-        # Initialiser la base de données
-        self.init_database()
-        
-        # Initialiser le gestionnaire de fichiers
-        self.init_file_handler()
-        
-        # Afficher directement la fenêtre principale (PAS DE LOGIN)
-        self.show_main_window()
-    
-    def init_database(self):
-        """Initialiser la connexion à la base de données"""
-        try:
-            self.db = Database("portal.db")
-            print("✅ Base de données initialisée")
-        except Exception as e:
-            messagebox.showerror(
-                "Erreur Critique",
-                f"Impossible d'initialiser la base de données:\n\n{e}"
-            )
-            sys.exit(1)
-    
-    def init_file_handler(self):
-        """Initialiser le gestionnaire de fichiers"""
-        try:
-            self.file_handler = FileHandler("uploads")
-            print("✅ Gestionnaire de fichiers initialisé")
-        except Exception as e:
-            messagebox.showerror(
-                "Erreur Critique",
-                f"Impossible d'initialiser le gestionnaire de fichiers:\n\n{e}"
-            )
-            sys.exit(1)
-    
-    def show_main_window(self):
-        """Afficher la fenêtre principale"""
-        MainWindow(self.root, self.db, self.file_handler)
-        self.root.mainloop()
-    
-    def run(self):
-        """Démarrer l'application"""
-        try:
-            self.root.mainloop()
-        except KeyboardInterrupt:
-            print("\n⚠️ Interruption par l'utilisateur")
-            self.cleanup()
-        except Exception as e:
-            print(f"❌ Erreur fatale: {e}")
-            messagebox.showerror("Erreur Fatale", str(e))
-            self.cleanup()
-    
-    def cleanup(self):
-        """Nettoyer les ressources avant de quitter"""
-        if self.db:
-            self.db.close()
-        print("👋 Application fermée")
-
-
-def main():
-    """Point d'entrée principal de l'application"""
-    print("=" * 60)
-    print("  PORTAIL DOCUMENT - SNTP")
-    print("  Application Desktop de Gestion de Documents")
-    print("  Version 2.0 - Avec Drag & Drop")
-    print("=" * 60)
-    print()
-    
-    try:
-        app = PortalApplication()
-        app.run()
-    except Exception as e:
-        print(f"❌ Erreur lors du démarrage de l'application: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Application Portail Document - SNTP
+Application desktop de gestion de documents avec Drag & Drop
+
+Auteur: Portail Document Team
+Version: 2.0.0
+"""
+
+import sys
+import os
+import queue
+import threading
+from typing import Optional
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# IMPORTANT: Importer TkinterDnD AVANT tk
+try:
+    from tkinterdnd2 import TkinterDnD
+    DRAG_DROP_AVAILABLE = True
+    print("✅ Module tkinterdnd2 chargé - Drag & Drop activé")
+except ImportError:
+    import tkinter as tk
+    DRAG_DROP_AVAILABLE = False
+    print("⚠️ Module tkinterdnd2 non trouvé - Drag & Drop désactivé")
+    print("   Pour activer le Drag & Drop, installez: pip install tkinterdnd2")
+
+from tkinter import messagebox
+from cache import QueryCache
+from database import Database, DEFAULT_PROFILE
+from utils.file_handler import FileHandler
+from events import FilesAdded, FileUpdated
+from utils.content_indexer import ContentIndexer
+from utils.import_journal import ImportJournal
+from utils.metadata_reconciler import MetadataReconciler
+from utils import thumbnails
+from ui.main_window import MainWindow
+
+
+class PortalApplication:
+    """Application principale du Portail Document"""
+    
+    def __init__(self):
+        # Créer la fenêtre principale avec support Drag & Drop si disponible
+        if DRAG_DROP_AVAILABLE:
+            self.root = TkinterDnD.Tk()
+            print("✅ Fenêtre TkinterDnD créée")
+        else:
+            import tkinter as tk
+            self.root = tk.Tk()
+            print("⚠️ Fenêtre Tk standard créée (pas de Drag & Drop)")
+        
+        self.db = None
+        self.file_handler = None
+        self.reconciler = None
+        self.indexer = None
+        self.thumbnails = None
+        
+        # Initialiser le gestionnaire de fichiers (utilisé par la reprise des imports)
+        self.init_file_handler()
+        
+        # Initialiser la base de données
+        self.init_database()
+        
+        # Relever en arrière-plan les métadonnées des anciens fichiers
+        self.start_reconciler()
+        
+        # Indexer en arrière-plan le contenu des documents
+        self.start_indexer()
+        
+        # Miniatures des images et des PDF (si Pillow ou PyMuPDF est installé)
+        self.init_thumbnails()
+        
+        # Afficher directement la fenêtre principale (PAS DE LOGIN)
+        self.show_main_window()
+    
+    def init_database(self, profile: Optional[str] = None):
+        """
+        Initialiser la connexion à la base de données
+        
+        Args:
+            profile: Profil de connexion SQLite ('performance' ou 'compat').
+                Par défaut, la variable d'environnement PORTAL_DB_PROFILE.
+        
+        Le cache des lectures de l'arborescence est borné par la variable
+        d'environnement PORTAL_CACHE_ROWS (nombre de lignes, 0 = désactivé).
+        """
+        if profile is None:
+            profile = os.environ.get("PORTAL_DB_PROFILE", DEFAULT_PROFILE)
+        try:
+            cache_size = int(os.environ.get("PORTAL_CACHE_ROWS", QueryCache.DEFAULT_MAX_ROWS))
+            self.db = Database("portal.db", profile=profile, cache_size=cache_size)
+            print("✅ Base de données initialisée")
+        except Exception as e:
+            messagebox.showerror(
+                "Erreur Critique",
+                f"Impossible d'initialiser la base de données:\n\n{e}"
+            )
+            sys.exit(1)
+        
+        self.recover_imports()
+    
+    def recover_imports(self):
+        """
+        Proposer de reprendre ou d'annuler les imports interrompus
+        (arrêt brutal de l'application pendant un import)
+        """
+        journal = ImportJournal(self.db, self.file_handler)
+        jobs = journal.interrupted_jobs()
+        if not jobs:
+            return
+        
+        print(f"⚠️ {len(jobs)} import(s) interrompu(s) détecté(s)")
+        journal.sweep(jobs)
+        
+        for job in jobs:
+            summary = journal.describe(job)
+            if not journal.can_resume(job):
+                if messagebox.askyesno(
+                    "Import interrompu",
+                    f"{summary}\n\nLa source ou le dossier de destination n'existe plus: "
+                    f"la reprise est impossible.\n\nAnnuler cet import ?"
+                ):
+                    journal.rollback(job)
+                continue
+            
+            choice = messagebox.askyesnocancel(
+                "Import interrompu",
+                f"{summary}\n\n"
+                f"• Oui: reprendre l'import (les fichiers déjà enregistrés ne sont pas recopiés)\n"
+                f"• Non: annuler l'import\n"
+                f"• Annuler: décider au prochain démarrage"
+            )
+            if choice is True:
+                self.resume_import(job)
+            elif choice is False:
+                if journal.rollback(job):
+                    print(f"✅ Import annulé: {job['source_path']}")
+    
+    def resume_import(self, job):
+        """Reprendre un import interrompu en arrière-plan"""
+        events = queue.Queue()
+        done = threading.Event()
+        
+        def worker():
+            # Connexion propre au thread (une connexion SQLite par thread)
+            db = Database(self.db.db_path, profile=self.db.profile)
+            db.events.subscribe(events.put)
+            try:
+                stats = ImportJournal(db, self.file_handler).resume(job)
+                print(f"✅ Import repris: {job['source_path']} "
+                      f"({stats.files} fichier(s) copié(s), {stats.unchanged} déjà présent(s))")
+            except Exception as e:
+                print(f"❌ Échec de la reprise de l'import {job['source_path']}: {e}")
+            finally:
+                db.close()
+                done.set()
+        
+        print(f"🔄 Reprise de l'import: {job['source_path']}")
+        threading.Thread(target=worker, name=f"import-resume-{job['id']}", daemon=True).start()
+        self.forward_events(events, done.is_set)
+    
+    def forward_events(self, events: queue.Queue, finished):
+        """
+        Republier dans le thread de l'interface les événements d'une connexion
+        de travail: le cache de self.db et les vues restent à jour
+        
+        Args:
+            events: File remplie par le thread de travail
+            finished: Fonction indiquant que le thread n'en publiera plus
+        """
+        def forward():
+            done = finished()
+            while not events.empty():
+                self.db.events.publish(events.get_nowait())
+            if not done:
+                self.root.after(200, forward)
+        
+        self.root.after(200, forward)
+    
+    def start_reconciler(self):
+        """Démarrer le rattrapage des métadonnées (taille, mtime) des fichiers"""
+        self.reconciler = MetadataReconciler(self.db.db_path, self.db.profile)
+        self.reconciler.start()
+        self.forward_events(self.reconciler.events, lambda: not self.reconciler.is_running())
+    
+    def start_indexer(self):
+        """Démarrer l'indexation du contenu des documents (file content_queue)"""
+        self.indexer = ContentIndexer(self.db.db_path, self.db.profile)
+        self.indexer.start()
+        # Fichiers ajoutés ou remplacés: réveiller l'indexation sans attendre
+        self.db.events.subscribe(
+            lambda event: self.indexer.notify()
+            if isinstance(event, (FilesAdded, FileUpdated)) else None
+        )
+    
+    def init_thumbnails(self):
+        """Initialiser le cache des miniatures des cartes de fichiers"""
+        if not (thumbnails.PIL_AVAILABLE or thumbnails.PYMUPDF_AVAILABLE):
+            print("⚠️ Pillow et PyMuPDF non trouvés - Miniatures désactivées")
+            print("   Pour afficher les miniatures, installez: pip install pillow pymupdf")
+            return
+        try:
+            self.thumbnails = thumbnails.ThumbnailCache(os.path.join("cache", "thumbnails"))
+            print("✅ Cache des miniatures initialisé")
+        except OSError as e:
+            print(f"⚠️ Miniatures désactivées: {e}")
+    
+    def init_file_handler(self):
+        """Initialiser le gestionnaire de fichiers"""
+        try:
+            self.file_handler = FileHandler("uploads")
+            print("✅ Gestionnaire de fichiers initialisé")
+        except Exception as e:
+            messagebox.showerror(
+                "Erreur Critique",
+                f"Impossible d'initialiser le gestionnaire de fichiers:\n\n{e}"
+            )
+            sys.exit(1)
+    
+    def show_main_window(self):
+        """Afficher la fenêtre principale"""
+        MainWindow(self.root, self.db, self.file_handler, self.thumbnails)
+        self.root.mainloop()
+    
+    def run(self):
+        """Démarrer l'application"""
+        try:
+            self.root.mainloop()
+        except KeyboardInterrupt:
+            print("\n⚠️ Interruption par l'utilisateur")
+            self.cleanup()
+        except Exception as e:
+            print(f"❌ Erreur fatale: {e}")
+            messagebox.showerror("Erreur Fatale", str(e))
+            self.cleanup()
+    
+    def cleanup(self):
+        """Nettoyer les ressources avant de quitter"""
+        if self.reconciler:
+            self.reconciler.stop(timeout=2)
+        if self.indexer:
+            self.indexer.stop(timeout=2)
+        if self.thumbnails:
+            stats = self.thumbnails.stats()
+            print(f"🖼️ Miniatures: {stats['rendered']} rendue(s), {stats['hits']} lue(s) dans le cache, "
+                  f"{stats['evictions']} évincée(s)")
+            self.thumbnails.shutdown()
+        if self.db:
+            if self.db.cache is not None:
+                stats = self.db.cache.stats()
+                print(f"📊 Cache des lectures: {stats['hits']} succès, {stats['misses']} échec(s) "
+                      f"({stats['hit_rate']:.0%}), {stats['evictions']} éviction(s)")
+            self.db.close()
+        print("👋 Application fermée")
+
+
+def main():
+    """Point d'entrée principal de l'application"""
+    print("=" * 60)
+    print("  PORTAIL DOCUMENT - SNTP")
+    print("  Application Desktop de Gestion de Documents")
+    print("  Version 2.0 - Avec Drag & Drop")
+    print("=" * 60)
+    print()
+    
+    try:
+        app = PortalApplication()
+        app.run()
+    except Exception as e:
+        print(f"❌ Erreur lors du démarrage de l'application: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Migrations du schéma de la base portal.db
+
+Chaque migration porte un numéro de version. La version courante d'une base
+est stockée dans PRAGMA user_version : au démarrage, Database.migrate()
+applique dans l'ordre les migrations dont le numéro est supérieur, chacune
+dans sa propre transaction.
+
+Les migrations reçoivent l'instance Database et n'appellent jamais commit().
+Pour faire évoluer le schéma, ajouter une nouvelle migration en fin de liste :
+ne jamais modifier une migration déjà publiée. Une migration n'appelle pas
+les méthodes de Database qui remplissent les tables (fill_*): elles évoluent
+avec le code, le SQL dont la migration a besoin y est donc recopié.
+"""
+
+import mimetypes
+from typing import Callable, List, NamedTuple
+
+
+class Migration(NamedTuple):
+    """Une étape de migration du schéma"""
+    version: int
+    description: str
+    apply: Callable
+
+
+def _v1_base_schema(db):
+    """Tables historiques: admins, folders, files"""
+    db.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS admins (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    db.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS folders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            parent_id INTEGER DEFAULT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (parent_id) REFERENCES folders(id) ON DELETE CASCADE
+        )
+    """)
+
+    db.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            folder_id INTEGER NOT NULL,
+            filename TEXT NOT NULL,
+            filepath TEXT NOT NULL,
+            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (folder_id) REFERENCES folders(id) ON DELETE CASCADE
+        )
+    """)
+
+    db.cursor.execute("CREATE INDEX IF NOT EXISTS idx_folders_parent ON folders(parent_id)")
+    db.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_folder ON files(folder_id)")
+
+
+def _v2_folder_stats(db):
+    """Taille des fichiers et agrégats précalculés par dossier"""
+    db.add_column_if_missing('files', 'size', 'INTEGER NOT NULL DEFAULT 0')
+
+    db.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS folder_stats (
+            folder_id INTEGER PRIMARY KEY,
+            file_count INTEGER NOT NULL DEFAULT 0,
+            total_file_count INTEGER NOT NULL DEFAULT 0,
+            total_bytes INTEGER NOT NULL DEFAULT 0,
+            subfolder_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    db.cursor.execute("DELETE FROM folder_stats")
+    db.cursor.execute("""
+        WITH RECURSIVE subtree(root_id, folder_id) AS (
+            SELECT id, id FROM folders
+            UNION ALL
+            SELECT subtree.root_id, folders.id
+            FROM folders JOIN subtree ON folders.parent_id = subtree.folder_id
+        ),
+        direct(folder_id, file_count, total_bytes) AS (
+            SELECT folder_id, COUNT(*), COALESCE(SUM(size), 0) FROM files
+            GROUP BY folder_id
+        ),
+        totals(folder_id, total_file_count, total_bytes) AS (
+            SELECT subtree.root_id, COALESCE(SUM(direct.file_count), 0),
+                   COALESCE(SUM(direct.total_bytes), 0)
+            FROM subtree LEFT JOIN direct ON direct.folder_id = subtree.folder_id
+            GROUP BY subtree.root_id
+        )
+        INSERT INTO folder_stats (folder_id, file_count, total_file_count,
+                                  total_bytes, subfolder_count)
+        SELECT totals.folder_id, COALESCE(direct.file_count, 0),
+               totals.total_file_count, totals.total_bytes,
+               (SELECT COUNT(*) FROM folders AS child WHERE child.parent_id = totals.folder_id)
+        FROM totals LEFT JOIN direct ON direct.folder_id = totals.folder_id
+    """)
+
+
+def _v3_folder_closure(db):
+    """Table de fermeture de l'arborescence (ancêtre, descendant, profondeur)"""
+    db.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS folder_closure (
+            ancestor_id INTEGER NOT NULL,
+            descendant_id INTEGER NOT NULL,
+            depth INTEGER NOT NULL,
+            PRIMARY KEY (ancestor_id, descendant_id)
+        ) WITHOUT ROWID
+    """)
+    db.cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_folder_closure_descendant "
+        "ON folder_closure(descendant_id, depth)"
+    )
+    db.cursor.execute("DELETE FROM folder_closure")
+    db.cursor.execute("""
+        WITH RECURSIVE paths(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM folders
+            UNION ALL
+            SELECT paths.ancestor_id, folders.id, paths.depth + 1
+            FROM folders JOIN paths ON folders.parent_id = paths.descendant_id
+        )
+        INSERT INTO folder_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, depth FROM paths
+    """)
+
+
+def _v4_listing_indexes(db):
+    """Index des listings: fichiers par date, sous-dossiers et dossiers par nom"""
+    # get_files_in_folder: WHERE folder_id = ? ORDER BY uploaded_at DESC
+    db.cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_files_folder_uploaded "
+        "ON files(folder_id, uploaded_at DESC, id DESC)"
+    )
+    # get_subfolders: WHERE parent_id = ? ORDER BY name
+    db.cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_folders_parent_name ON folders(parent_id, name)"
+    )
+    # get_all_folders: ORDER BY name
+    db.cursor.execute("CREATE INDEX IF NOT EXISTS idx_folders_name ON folders(name)")
+
+    # Remplacés par les index composites ci-dessus (même préfixe)
+    db.cursor.execute("DROP INDEX IF EXISTS idx_files_folder")
+    db.cursor.execute("DROP INDEX IF EXISTS idx_folders_parent")
+
+    db.cursor.execute("ANALYZE")
+
+
+def _v5_file_metadata(db):
+    """Date de modification, type MIME et extension des fichiers"""
+    # mtime NULL = métadonnées à relever sur le disque (MetadataReconciler)
+    db.add_column_if_missing('files', 'mtime', 'REAL')
+    db.add_column_if_missing('files', 'mime_type', 'TEXT')
+    db.add_column_if_missing('files', 'extension', "TEXT NOT NULL DEFAULT ''")
+    
+    # Extension et type MIME se déduisent du nom: aucun accès disque ici
+    def file_type(filename):
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        return extension, mimetypes.guess_type(filename, strict=False)[0]
+    
+    db.cursor.execute("SELECT id, filename FROM files")
+    updates = [(*file_type(row['filename']), row['id']) for row in db.cursor.fetchall()]
+    db.cursor.executemany("UPDATE files SET extension = ?, mime_type = ? WHERE id = ?", updates)
+    
+    db.cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_files_pending_metadata ON files(id) WHERE mtime IS NULL"
+    )
+
+
+def _v6_content_hash(db):
+    """Hachage du contenu (stockage dédupliqué) et comptage des références"""
+    # NULL pour les fichiers stockés avant le stockage par contenu
+    db.add_column_if_missing('files', 'content_hash', 'TEXT')
+    # Database.unreferenced_filepaths: un objet partagé n'est supprimé
+    # qu'avec sa dernière référence
+    db.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_filepath ON files(filepath)")
+
+
+def _v7_import_journal(db):
+    """Journal des imports, pour reprendre ou annuler un import interrompu"""
+    db.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS import_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_path TEXT NOT NULL,
+            mode TEXT NOT NULL DEFAULT 'import',
+            parent_folder_id INTEGER,
+            root_folder_id INTEGER,
+            status TEXT NOT NULL DEFAULT 'running',
+            planned_files INTEGER NOT NULL DEFAULT 0,
+            completed_files INTEGER NOT NULL DEFAULT 0,
+            started_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """)
+    db.cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_import_jobs_status ON import_jobs(status)"
+    )
+
+
+def _v8_search_index(db):
+    """Index plein texte (FTS5) des noms de dossiers et de fichiers, avec leur chemin"""
+    # rowid = ID du fichier, ou -ID du dossier (voir Database.SEARCH_INDEX_TRIGGERS)
+    db.cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            name, path,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    db.cursor.execute("DELETE FROM search_index")
+    # Dossiers: chemin du parent; fichiers: chemin de leur dossier
+    for target in (
+        "SELECT -folders.id, folders.name, COALESCE(parent.path, '') "
+        "FROM folders LEFT JOIN folder_paths AS parent ON parent.id = folders.parent_id",
+        "SELECT files.id, files.filename, folder.path "
+        "FROM files JOIN folder_paths AS folder ON folder.id = files.folder_id",
+    ):
+        db.cursor.execute(f"""
+            WITH RECURSIVE folder_paths(id, path) AS (
+                SELECT id, name FROM folders
+                WHERE parent_id IS NULL OR parent_id NOT IN (SELECT id FROM folders)
+                UNION ALL
+                SELECT folders.id,
+                       CASE WHEN folder_paths.path = '' THEN folders.name
+                            ELSE folder_paths.path || ' / ' || folders.name END
+                FROM folders JOIN folder_paths ON folders.parent_id = folder_paths.id
+            )
+            INSERT INTO search_index (rowid, name, path) {target}
+        """)
+
+
+def _v9_content_index(db):
+    """Index plein texte du contenu des documents et file d'attente de l'extraction"""
+    # Fichiers à (ré)indexer, alimentée par les triggers (voir utils.content_indexer)
+    db.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS content_queue (
+            file_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    # rowid = ID du fichier
+    db.cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS content_index USING fts5(
+            body,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+    """)
+    db.cursor.execute("INSERT OR IGNORE INTO content_queue (file_id) SELECT id FROM files")
+
+
+def _v10_file_sort_indexes(db):
+    """Index des tris de fichiers par nom, taille et type (Database.get_files_page)"""
+    db.cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_files_folder_name "
+        "ON files(folder_id, filename COLLATE NOCASE)"
+    )
+    db.cursor.execute("CREATE INDEX IF NOT EXISTS idx_files_folder_size ON files(folder_id, size)")
+    db.cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_files_folder_extension ON files(folder_id, extension)"
+    )
+    db.cursor.execute("ANALYZE")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Schéma initial", _v1_base_schema),
+    Migration(2, "Agrégats par dossier (folder_stats)", _v2_folder_stats),
+    Migration(3, "Table de fermeture de l'arborescence", _v3_folder_closure),
+    Migration(4, "Index des listings de dossiers et fichiers", _v4_listing_indexes),
+    Migration(5, "Métadonnées des fichiers (mtime, type MIME, extension)", _v5_file_metadata),
+    Migration(6, "Stockage par contenu (content_hash)", _v6_content_hash),
+    Migration(7, "Journal des imports", _v7_import_journal),
+    Migration(8, "Index de recherche plein texte (search_index)", _v8_search_index),
+    Migration(9, "Index du contenu des documents (content_index)", _v9_content_index),
+    Migration(10, "Index des tris de fichiers (nom, taille, type)", _v10_file_sort_indexes),
+]
@@ -0,0 +1,3 @@
+"""
+Tests du Portail Document (pytest, ou python -m unittest depuis la racine)
+"""
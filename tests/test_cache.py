@@ -0,0 +1,158 @@
+"""
+Cache LRU des lectures de l'arborescence (QueryCache) et son invalidation
+"""
+
+import os
+import tempfile
+import unittest
+
+from cache import QueryCache
+from database import Database
+from events import FilesAdded, FolderRenamed
+
+
+class QueryCacheEvictionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = QueryCache(max_rows=5)
+    
+    def load(self, value):
+        return lambda: value
+    
+    def test_least_recently_read_entry_is_evicted(self):
+        self.cache.get(('folder', 1), self.load({'id': 1}))
+        self.cache.get(('files', 2), self.load([{'id': 10}, {'id': 11}]))
+        self.cache.get(('folder', 1), self.load(None))      # relu: le plus récent
+        self.cache.get(('files', 3), self.load([{'id': 12}, {'id': 13}, {'id': 14}]))
+        
+        # 1 + 2 + 3 lignes > 5: la liste du dossier 2 est la moins récemment lue
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.assertEqual(self.cache.stats()['rows'], 4)
+        self.assertEqual(self.cache.get(('folder', 1), self.load(None)), {'id': 1})
+        self.assertIsNone(self.cache.get(('files', 2), self.load(None)))
+    
+    def test_oversized_value_is_not_stored(self):
+        rows = [{'id': i} for i in range(6)]
+        self.assertEqual(self.cache.get(('files', 1), self.load(rows)), rows)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+    
+    def test_values_are_copied(self):
+        self.cache.get(('files', 1), self.load([{'id': 1, 'filename': 'a.pdf'}]))
+        self.cache.get(('files', 1), self.load(None))[0]['filename'] = 'modifié'
+        self.assertEqual(self.cache.get(('files', 1), self.load(None))[0]['filename'], 'a.pdf')
+    
+    def test_hit_and_miss_counters(self):
+        self.cache.get(('folder', 1), self.load({'id': 1}))
+        self.cache.get(('folder', 1), self.load(None))
+        self.cache.get_many('stats', [1, 2], lambda ids: {i: {'file_count': 0} for i in ids})
+        self.cache.get_many('stats', [1, 2], lambda ids: self.fail("déjà en cache"))
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (3, 3))
+
+
+class CacheInvalidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'portal.db')
+        self.db = Database(self.db_path, cache_size=1000)
+        self.root = self.db.create_folder('Racine')
+        self.child = self.db.create_folder('Enfant', self.root)
+        self.other = self.db.create_folder('Autre')
+        self.db.add_file(self.child, 'a.pdf', 'a', size=10, mtime=0)
+        self.db.cache.clear()
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def warm(self):
+        """Lire (et mettre en cache) listings, chemins et agrégats"""
+        self.db.get_subfolders(self.root)
+        self.db.get_files_in_folder(self.child)
+        self.db.get_folder_path(self.child)
+        self.db.get_folder_stats_bulk([self.root, self.child, self.other])
+    
+    def cached(self, kind, folder_id):
+        return (kind, folder_id) in self.db.cache._entries
+    
+    def test_files_added_drops_listing_and_ancestor_stats(self):
+        self.warm()
+        self.db.cache.invalidate(FilesAdded((self.child,), 1))
+        
+        self.assertFalse(self.cached('files', self.child))
+        self.assertFalse(self.cached('stats', self.child))
+        self.assertFalse(self.cached('stats', self.root))
+        # Hors de la lignée: conservé
+        self.assertTrue(self.cached('stats', self.other))
+        self.assertTrue(self.cached('subfolders', self.root))
+    
+    def test_folder_renamed_drops_parent_listing_and_paths(self):
+        self.warm()
+        self.db.cache.invalidate(FolderRenamed(self.root, 'Nouveau nom'))
+        
+        self.assertFalse(self.cached('path', self.child))
+        self.assertTrue(self.cached('subfolders', self.root))
+        self.assertTrue(self.cached('stats', self.root))
+    
+    def test_own_writes_are_visible(self):
+        self.warm()
+        self.db.add_file(self.child, 'b.pdf', 'b', size=5, mtime=0)
+        self.db.update_folder(self.child, 'Renommé')
+        
+        self.assertEqual(len(self.db.get_files_in_folder(self.child)), 2)
+        self.assertEqual(self.db.get_folder_stats(self.root)['total_bytes'], 15)
+        self.assertEqual(self.db.get_subfolders(self.root)[0]['name'], 'Renommé')
+        self.assertEqual(self.db.get_folder_path(self.child)[-1]['name'], 'Renommé')
+    
+    def test_events_from_another_connection(self):
+        # Comme un import en arrière-plan: écriture sur une autre connexion,
+        # événements republiés sur la Database de l'interface
+        self.warm()
+        worker = Database(self.db_path)
+        events = []
+        worker.events.subscribe(events.append)
+        try:
+            worker.add_file(self.child, 'b.pdf', 'b', size=5, mtime=0)
+            worker.update_folder(self.root, 'Renommé')
+        finally:
+            worker.close()
+        
+        # Tant que les événements n'ont pas été republiés, le cache sert l'ancien état
+        self.assertEqual(len(self.db.get_files_in_folder(self.child)), 1)
+        self.assertEqual(self.db.get_folder_stats(self.root)['total_file_count'], 1)
+        
+        for event in events:
+            self.db.events.publish(event)
+        self.assertEqual(len(self.db.get_files_in_folder(self.child)), 2)
+        self.assertEqual(self.db.get_folder_stats(self.root)['total_file_count'], 2)
+        self.assertEqual(self.db.get_folder_stats(self.child)['total_bytes'], 15)
+        self.assertEqual(self.db.get_folder_path(self.child)[0]['name'], 'Renommé')
+    
+    def test_metadata_backfill_from_another_connection(self):
+        # MetadataReconciler: tailles relevées sur sa propre connexion
+        path = os.path.join(self.tmp.name, 'c.pdf')
+        with open(path, 'wb') as f:
+            f.write(b'x' * 100)
+        self.db.add_file(self.child, 'c.pdf', path, size=0)
+        self.db.cursor.execute("UPDATE files SET mtime = NULL")
+        self.db.commit()
+        self.warm()
+        
+        worker = Database(self.db_path)
+        events = []
+        worker.events.subscribe(events.append)
+        try:
+            worker.backfill_all_file_metadata()
+        finally:
+            worker.close()
+        
+        for event in events:
+            self.db.events.publish(event)
+        sizes = {file['filename']: file['size'] for file in self.db.get_files_in_folder(self.child)}
+        self.assertEqual(sizes['c.pdf'], 100)
+        self.assertEqual(self.db.get_folder_stats(self.root)['total_bytes'], 110)
+
+
+if __name__ == '__main__':
+    unittest.main()
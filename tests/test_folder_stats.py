@@ -0,0 +1,89 @@
+"""
+Cohérence de folder_stats (tenue à jour par les triggers) avec les tables
+"""
+
+import os
+import tempfile
+import unittest
+
+from database import Database
+
+
+class FolderStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, 'portal.db'))
+        self.root = self.db.create_folder('Racine')
+        self.child = self.db.create_folder('Enfant', self.root)
+        self.leaf = self.db.create_folder('Feuille', self.child)
+        self.other = self.db.create_folder('Autre')
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def add_file(self, folder_id, name, size):
+        return self.db.add_file(folder_id, name, os.path.join(self.tmp.name, name), size=size, mtime=0)
+    
+    def assertConsistent(self):
+        self.assertEqual(self.db.verify_folder_stats(), [])
+    
+    def test_new_folders(self):
+        self.assertConsistent()
+        self.assertEqual(self.db.get_folder_stats(self.root)['subfolder_count'], 1)
+    
+    def test_added_files(self):
+        self.add_file(self.leaf, 'a.pdf', 100)
+        self.db.add_files_bulk([
+            {'folder_id': self.child, 'filename': 'b.pdf', 'filepath': 'b', 'size': 20},
+            {'folder_id': self.leaf, 'filename': 'c.pdf', 'filepath': 'c', 'size': 3},
+        ])
+        self.assertConsistent()
+        self.assertEqual(self.db.get_folder_stats(self.root), {
+            'file_count': 0, 'total_file_count': 3, 'total_bytes': 123, 'subfolder_count': 1,
+        })
+    
+    def test_deleted_and_updated_files(self):
+        file_id = self.add_file(self.leaf, 'a.pdf', 100)
+        self.add_file(self.leaf, 'b.pdf', 50)
+        self.db.update_file_content(file_id, os.path.join(self.tmp.name, 'a2.pdf'), 70, 0)
+        self.assertConsistent()
+        self.assertEqual(self.db.get_folder_stats(self.root)['total_bytes'], 120)
+        
+        self.db.delete_file(file_id)
+        self.assertConsistent()
+        self.assertEqual(self.db.get_folder_stats(self.root)['total_file_count'], 1)
+    
+    def test_moved_folder(self):
+        self.add_file(self.leaf, 'a.pdf', 100)
+        self.assertTrue(self.db.move_folder(self.child, self.other))
+        self.assertConsistent()
+        self.assertEqual(self.db.get_folder_stats(self.root)['total_file_count'], 0)
+        self.assertEqual(self.db.get_folder_stats(self.other)['total_bytes'], 100)
+    
+    def test_move_into_own_subtree_is_refused(self):
+        self.assertFalse(self.db.move_folder(self.root, self.leaf))
+        self.assertConsistent()
+    
+    def test_deleted_folder(self):
+        self.add_file(self.leaf, 'a.pdf', 100)
+        self.add_file(self.root, 'b.pdf', 5)
+        self.assertTrue(self.db.delete_folder(self.child))
+        self.assertConsistent()
+        self.assertEqual(self.db.get_folder_stats(self.root), {
+            'file_count': 1, 'total_file_count': 1, 'total_bytes': 5, 'subfolder_count': 0,
+        })
+    
+    def test_rebuild_repairs_drift(self):
+        self.add_file(self.leaf, 'a.pdf', 100)
+        self.db.cursor.execute("UPDATE folder_stats SET total_bytes = 0")
+        self.db.commit()
+        self.assertEqual(len(self.db.verify_folder_stats()), 3)
+        
+        self.db.rebuild_folder_stats()
+        self.assertConsistent()
+
+
+if __name__ == '__main__':
+    unittest.main()
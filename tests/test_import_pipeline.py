@@ -0,0 +1,131 @@
+"""
+Échec et reprise d'un import (ImportPipeline, journal import_jobs)
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from database import FILE_RESERVATIONS, Database
+from utils.file_handler import FileHandler
+from utils.import_journal import ImportJournal
+from utils.import_pipeline import ImportPipeline
+
+FILE_COUNT = 60
+BATCH_SIZE = 10
+
+
+class ImportFailureTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, 'portal.db'))
+        self.handler = FileHandler(os.path.join(self.tmp.name, 'uploads'))
+        self.source = os.path.join(self.tmp.name, 'Source')
+        for i in range(FILE_COUNT):
+            directory = os.path.join(self.source, f"sous-dossier {i % 3}")
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"fichier {i}.txt"), 'w') as f:
+                f.write(f"contenu {i}\n" * (i + 1))
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def run_failing_import(self, failing_call):
+        """Import dont la failing_call-ième écriture de fichiers échoue"""
+        add_files_bulk = self.db.add_files_bulk
+        calls = []
+        
+        def flaky(files):
+            calls.append(1)
+            if len(calls) == failing_call:
+                raise RuntimeError("disque plein")
+            return add_files_bulk(files)
+        
+        pipeline = ImportPipeline(self.handler, self.db, copy_workers=2, batch_size=BATCH_SIZE)
+        with mock.patch.object(self.db, 'add_files_bulk', side_effect=flaky):
+            with self.assertRaises(RuntimeError):
+                pipeline.run(self.source)
+        return pipeline.stats
+    
+    def stored_objects(self):
+        return [os.path.join(directory, name)
+                for directory, _, names in os.walk(self.handler.upload_dir) for name in names]
+    
+    def file_rows(self):
+        self.db.cursor.execute("SELECT * FROM files")
+        return [dict(row) for row in self.db.cursor.fetchall()]
+    
+    def assertNothingReserved(self, filepaths):
+        self.assertEqual(FILE_RESERVATIONS.unreserved(filepaths), list(filepaths))
+    
+    def test_failure_before_any_checkpoint_rolls_back(self):
+        stats = self.run_failing_import(failing_call=1)
+        
+        self.assertEqual(self.db.get_import_job(stats.job_id)['status'], 'rolled_back')
+        self.assertIsNone(self.db.get_folder(stats.root_folder_id))
+        self.assertEqual(self.db.get_all_folders(), [])
+        self.assertEqual(self.file_rows(), [])
+        self.assertEqual(self.stored_objects(), [])
+        self.assertEqual(self.db.get_interrupted_import_jobs(), [])
+    
+    def test_failure_after_checkpoint_keeps_committed_files(self):
+        stats = self.run_failing_import(failing_call=3)
+        
+        job = self.db.get_import_job(stats.job_id)
+        self.assertEqual(job['status'], 'failed')
+        self.assertIsNotNone(self.db.get_folder(stats.root_folder_id))
+        rows = self.file_rows()
+        self.assertGreaterEqual(len(rows), 2)
+        self.assertLess(len(rows), FILE_COUNT)
+        self.assertEqual(job['completed_files'], len(rows))
+        # Seules les copies validées restent dans uploads/
+        self.assertEqual(sorted(self.stored_objects()), sorted(row['filepath'] for row in rows))
+        self.assertNothingReserved([row['filepath'] for row in rows])
+        self.assertEqual(self.db.verify_folder_stats(), [])
+        self.assertEqual([job['id'] for job in self.db.get_interrupted_import_jobs()], [stats.job_id])
+    
+    def test_resume_completes_failed_import(self):
+        failed = self.run_failing_import(failing_call=3)
+        committed = len(self.file_rows())
+        
+        journal = ImportJournal(self.db, self.handler)
+        job = journal.interrupted_jobs()[0]
+        self.assertTrue(journal.can_resume(job))
+        stats = journal.resume(job, copy_workers=2, batch_size=BATCH_SIZE)
+        
+        self.assertEqual(stats.job_id, failed.job_id)
+        self.assertEqual(stats.root_folder_id, failed.root_folder_id)
+        self.assertEqual(self.db.get_import_job(job['id'])['status'], 'completed')
+        self.assertEqual(stats.unchanged, committed)
+        self.assertEqual(stats.files, FILE_COUNT - committed)
+        
+        rows = self.file_rows()
+        self.assertEqual(len(rows), FILE_COUNT)
+        self.assertEqual(len({(row['folder_id'], row['filename']) for row in rows}), FILE_COUNT)
+        self.assertTrue(all(os.path.exists(row['filepath']) for row in rows))
+        self.assertEqual(sorted(self.stored_objects()), sorted(row['filepath'] for row in rows))
+        self.assertNothingReserved([row['filepath'] for row in rows])
+        self.assertEqual(self.db.get_folder_stats(stats.root_folder_id)['total_file_count'], FILE_COUNT)
+        self.assertEqual(self.db.verify_folder_stats(), [])
+        self.assertEqual(journal.interrupted_jobs(), [])
+    
+    def test_failed_resume_stays_resumable(self):
+        failed = self.run_failing_import(failing_call=3)
+        journal = ImportJournal(self.db, self.handler)
+        job = journal.interrupted_jobs()[0]
+        
+        with mock.patch.object(self.db, 'add_files_bulk', side_effect=RuntimeError("disque plein")):
+            with self.assertRaises(RuntimeError):
+                journal.resume(job, copy_workers=2, batch_size=BATCH_SIZE)
+        
+        # Une reprise n'a pas créé le dossier racine: il n'est jamais retiré
+        self.assertIsNotNone(self.db.get_folder(failed.root_folder_id))
+        self.assertEqual(self.db.get_import_job(job['id'])['status'], 'failed')
+        self.assertEqual(len(journal.interrupted_jobs()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
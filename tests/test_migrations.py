@@ -0,0 +1,122 @@
+"""
+Migration d'une base créée avant les migrations (schéma historique, version 0)
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from database import Database
+from migrations import MIGRATIONS
+
+# Schéma des bases créées avant l'introduction des migrations
+BASELINE_SCHEMA = """
+    CREATE TABLE admins (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL UNIQUE,
+        password TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE folders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        parent_id INTEGER DEFAULT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (parent_id) REFERENCES folders(id) ON DELETE CASCADE
+    );
+    CREATE TABLE files (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        folder_id INTEGER NOT NULL,
+        filename TEXT NOT NULL,
+        filepath TEXT NOT NULL,
+        uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (folder_id) REFERENCES folders(id) ON DELETE CASCADE
+    );
+"""
+
+
+class BaselineMigrationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'portal.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(BASELINE_SCHEMA)
+        conn.executemany("INSERT INTO folders (id, name, parent_id) VALUES (?, ?, ?)", [
+            (1, 'Audits', None),
+            (2, 'Rapports 2023', 1),
+            (3, 'Annexes', 2),
+            (4, 'Divers', None),
+        ])
+        conn.executemany("INSERT INTO files (folder_id, filename, filepath) VALUES (?, ?, ?)", [
+            (1, 'sommaire.pdf', os.path.join(self.tmp.name, 'a')),
+            (2, 'rapport final.docx', os.path.join(self.tmp.name, 'b')),
+            (3, 'photo.JPG', os.path.join(self.tmp.name, 'c')),
+            (3, 'notes', os.path.join(self.tmp.name, 'd')),
+        ])
+        conn.commit()
+        conn.close()
+        self.db = Database(self.db_path)
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def test_upgrades_to_latest_version(self):
+        self.assertEqual(self.db.schema_version(), MIGRATIONS[-1].version)
+        # Rien à refaire à la connexion suivante
+        self.assertEqual(self.db.migrate(), 0)
+    
+    def test_existing_rows_are_kept(self):
+        self.assertEqual(len(self.db.get_all_folders()), 4)
+        self.assertEqual(len(self.db.get_files_in_folder(3)), 2)
+    
+    def test_folder_stats_are_filled(self):
+        self.assertEqual(self.db.verify_folder_stats(), [])
+        self.assertEqual(self.db.get_folder_stats(1), {
+            'file_count': 1, 'total_file_count': 4, 'total_bytes': 0, 'subfolder_count': 1,
+        })
+    
+    def test_folder_closure_is_filled(self):
+        self.assertTrue(self.db.is_descendant(3, 1))
+        self.assertFalse(self.db.is_descendant(1, 3))
+        self.assertFalse(self.db.is_descendant(3, 4))
+        self.assertEqual([folder['id'] for folder in self.db.get_folder_path(3)], [1, 2, 3])
+    
+    def test_file_types_are_guessed(self):
+        files = {file['filename']: file for file in self.db.get_files_in_folder(3)}
+        self.assertEqual(files['photo.JPG']['extension'], 'jpg')
+        self.assertEqual(files['photo.JPG']['mime_type'], 'image/jpeg')
+        self.assertEqual(files['notes']['extension'], '')
+        self.assertIsNone(files['notes']['mtime'])
+    
+    def test_search_index_is_filled(self):
+        results = self.db.search('rapport')
+        names = {result['name'] for result in results}
+        self.assertIn('rapport final.docx', names)
+        self.assertIn('Rapports 2023', names)
+        
+        # Les fichiers sont aussi trouvés par le chemin de leur dossier
+        self.assertIn('photo.JPG', {result['name'] for result in self.db.search('annexes')})
+    
+    def test_matches_current_fill_methods(self):
+        def snapshot():
+            tables = {}
+            for table, columns in (('folder_stats', 'folder_id, *'),
+                                   ('folder_closure', 'ancestor_id, descendant_id, *'),
+                                   ('search_index', 'rowid, *')):
+                self.db.cursor.execute(f"SELECT {columns} FROM {table} ORDER BY 1, 2")
+                tables[table] = [tuple(row) for row in self.db.cursor.fetchall()]
+            return tables
+        
+        migrated = snapshot()
+        self.db.fill_folder_stats()
+        self.db.fill_folder_closure()
+        self.db.fill_search_index()
+        self.assertEqual(snapshot(), migrated)
+        self.db.rollback()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Pagination par clé des sous-dossiers et des fichiers (bornes des pages)
+"""
+
+import os
+import tempfile
+import unittest
+
+from database import Database, FileListing
+
+
+class PaginationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, 'portal.db'))
+        self.parent = self.db.create_folder('Parent')
+    
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def subfolder_pages(self, limit):
+        pages, after = [], None
+        while True:
+            page = self.db.get_subfolders_page(self.parent, after, limit)
+            pages.append(page)
+            if len(page) < limit:
+                return pages
+            after = page[-1]
+    
+    def file_pages(self, limit, listing=FileListing()):
+        pages, after = [], None
+        while True:
+            page = self.db.get_files_page(self.parent, after, limit, listing)
+            pages.append(page)
+            if len(page) < limit:
+                return pages
+            after = page[-1]
+    
+    def add_files(self, names_and_sizes):
+        self.db.add_files_bulk([
+            {'folder_id': self.parent, 'filename': name, 'filepath': name, 'size': size}
+            for name, size in names_and_sizes
+        ])
+    
+    def test_empty_folder(self):
+        self.assertEqual(self.subfolder_pages(3), [[]])
+        self.assertEqual(self.file_pages(3), [[]])
+    
+    def test_exact_multiple_of_page_size(self):
+        self.db.create_folders_bulk((f"Dossier {i}", self.parent) for i in range(6))
+        pages = self.subfolder_pages(3)
+        self.assertEqual([len(page) for page in pages], [3, 3, 0])
+    
+    def test_partial_last_page(self):
+        self.db.create_folders_bulk((f"Dossier {i}", self.parent) for i in range(7))
+        pages = self.subfolder_pages(3)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+    
+    def test_duplicate_names_span_pages(self):
+        # Même nom: l'ID départage, aucun dossier n'est sauté ni répété
+        ids = self.db.create_folders_bulk(("Doublon", self.parent) for _ in range(5))
+        self.db.create_folders_bulk([("A", self.parent), ("Z", self.parent)])
+        listed = [folder for page in self.subfolder_pages(2) for folder in page]
+        self.assertEqual([folder['name'] for folder in listed], ['A'] + ['Doublon'] * 5 + ['Z'])
+        self.assertEqual([folder['id'] for folder in listed[1:6]], sorted(ids))
+    
+    def test_files_with_equal_sort_keys(self):
+        # Même date d'import (à la seconde) pour tous: tri par ID en cas d'égalité
+        self.add_files((f"f{i}.pdf", 10) for i in range(10))
+        listed = [file['id'] for page in self.file_pages(4) for file in page]
+        self.assertEqual(listed, sorted(listed, reverse=True))
+        self.assertEqual(len(set(listed)), 10)
+    
+    def test_each_sort_key_lists_every_file_once(self):
+        self.add_files([('b.PDF', 30), ('A.txt', 10), ('c.doc', 30), ('a.txt', 20),
+                        ('e', 0), ('d.pdf', 10), ('B.pdf', 30)])
+        expected = {file['id'] for file in self.db.get_files_in_folder(self.parent)}
+        for sort in ('date', 'name', 'size', 'type'):
+            for descending in (False, True):
+                listing = FileListing(sort=sort, descending=descending)
+                listed = [file['id'] for page in self.file_pages(2, listing) for file in page]
+                single = [file['id'] for file in self.db.get_files_page(self.parent, None, 100, listing)]
+                with self.subTest(sort=sort, descending=descending):
+                    self.assertEqual(len(listed), len(expected))
+                    self.assertEqual(set(listed), expected)
+                    self.assertEqual(listed, single)
+    
+    def test_filters_apply_across_pages(self):
+        self.add_files([(f"f{i}.pdf", i) for i in range(5)] + [(f"g{i}.txt", i) for i in range(5)])
+        listing = FileListing(sort='size', descending=False, extensions=('pdf',), min_size=1)
+        listed = [file for page in self.file_pages(2, listing) for file in page]
+        self.assertEqual([file['filename'] for file in listed], ['f1.pdf', 'f2.pdf', 'f3.pdf', 'f4.pdf'])
+
+
+if __name__ == '__main__':
+    unittest.main()
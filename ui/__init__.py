@@ -1,10 +1,11 @@
-"""
-Package UI pour l'application Portail Document
-"""
-
-from .login_window import LoginWindow
-from .main_window import MainWindow
-from .admin_window import AdminWindow
-from .folder_view import FolderView
-
-__all__ = ['LoginWindow', 'MainWindow', 'AdminWindow', 'FolderView']
\ No newline at end of file
+"""
+Package UI pour l'application Portail Document
+"""
+
+from .login_window import LoginWindow
+from .main_window import MainWindow
+from .admin_window import AdminWindow
+from .folder_view import FolderView
+from .search_view import SearchView
+
+__all__ = ['LoginWindow', 'MainWindow', 'AdminWindow', 'FolderView', 'SearchView']
\ No newline at end of file
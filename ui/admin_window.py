@@ -1,953 +1,1229 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-from tkinterdnd2 import DND_FILES, TkinterDnD
-from typing import Callable, Optional
-import os
-
-class AdminWindow:
-    """Fenêtre d'administration avec Drag & Drop"""
-    
-    def __init__(self, root: tk.Toplevel, db, file_handler, on_changes: Callable):
-        self.root = root
-        self.db = db
-        self.file_handler = file_handler
-        self.on_changes = on_changes
-        
-        self.root.title("Administration - Gestion des Dossiers")
-        self.root.geometry("900x600")
-        
-        # Centrer la fenêtre
-        self.center_window()
-        
-        # Créer l'interface
-        self.create_widgets()
-        
-        # Charger les dossiers
-        self.load_folders()
-    
-    def center_window(self):
-        """Centrer la fenêtre"""
-        self.root.update_idletasks()
-        width = 900
-        height = 600
-        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.root.winfo_screenheight() // 2) - (height // 2)
-        self.root.geometry(f'{width}x{height}+{x}+{y}')
-    
-    def create_widgets(self):
-        """Créer les widgets"""
-        # En-tête
-        header = tk.Frame(self.root, bg='#000', height=60)
-        header.pack(fill=tk.X)
-        header.pack_propagate(False)
-        
-        title_label = tk.Label(
-            header,
-            text="📁 Gestion des Dossiers",
-            font=('Segoe UI', 16, 'bold'),
-            bg='#000',
-            fg='white'
-        )
-        title_label.pack(side=tk.LEFT, padx=20, pady=15)
-        
-        close_button = tk.Button(
-            header,
-            text="✖️ Fermer",
-            font=('Segoe UI', 10),
-            bg='#dc3545',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.root.destroy
-        )
-        close_button.pack(side=tk.RIGHT, padx=20)
-        
-        # ZONE DRAG & DROP - NOUVELLE SECTION
-        dragdrop_frame = tk.Frame(self.root, bg='#e7f3ff', relief=tk.SOLID, bd=2)
-        dragdrop_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        # Titre de la zone
-        tk.Label(
-            dragdrop_frame,
-            text="📦 Zone Drag & Drop",
-            font=('Segoe UI', 12, 'bold'),
-            bg='#e7f3ff',
-            fg='#0066cc'
-        ).pack(pady=(10, 5))
-        
-        # Zone de drop
-        self.drop_zone = tk.Label(
-            dragdrop_frame,
-            text="⬇️ Glissez-déposez un dossier ici pour l'importer\n\n"
-                 "Tous les fichiers (.docx, .pdf, .xlsx, etc.) seront importés\n"
-                 "avec leur arborescence complète",
-            font=('Segoe UI', 10),
-            bg='#ffffff',
-            fg='#6c757d',
-            relief=tk.RIDGE,
-            bd=2,
-            height=5,
-            cursor='hand2'
-        )
-        self.drop_zone.pack(fill=tk.X, padx=20, pady=(5, 15))
-        
-        # Configuration du drag & drop
-        self.drop_zone.drop_target_register(DND_FILES)
-        self.drop_zone.dnd_bind('<<Drop>>', self.on_drop)
-        
-        # Effet hover sur la zone de drop
-        def on_enter(e):
-            self.drop_zone.config(bg='#f0f8ff', relief=tk.SOLID, bd=3)
-        
-        def on_leave(e):
-            self.drop_zone.config(bg='#ffffff', relief=tk.RIDGE, bd=2)
-        
-        self.drop_zone.bind('<Enter>', on_enter)
-        self.drop_zone.bind('<Leave>', on_leave)
-        
-        # Permettre aussi le clic pour sélectionner
-        self.drop_zone.bind('<Button-1>', lambda e: self.import_folder())
-        
-        # Barre d'outils
-        toolbar = tk.Frame(self.root, bg='#f8f9fa', height=60)
-        toolbar.pack(fill=tk.X, pady=10)
-        
-        # Bouton "Nouveau Dossier"
-        new_folder_btn = tk.Button(
-            toolbar,
-            text="➕ Nouveau Dossier",
-            font=('Segoe UI', 10, 'bold'),
-            bg='#28a745',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.create_folder
-        )
-        new_folder_btn.pack(side=tk.LEFT, padx=10)
-        
-        # Bouton "Importer Dossier"
-        import_folder_btn = tk.Button(
-            toolbar,
-            text="📂 Importer Dossier",
-            font=('Segoe UI', 10, 'bold'),
-            bg='#007bff',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.import_folder
-        )
-        import_folder_btn.pack(side=tk.LEFT, padx=10)
-        
-        # Bouton "Importer Fichiers"
-        import_files_btn = tk.Button(
-            toolbar,
-            text="📄 Importer Fichiers",
-            font=('Segoe UI', 10, 'bold'),
-            bg='#17a2b8',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.import_files
-        )
-        import_files_btn.pack(side=tk.LEFT, padx=10)
-        
-        # Bouton "Rafraîchir"
-        refresh_btn = tk.Button(
-            toolbar,
-            text="🔄 Rafraîchir",
-            font=('Segoe UI', 10),
-            bg='#6c757d',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.load_folders
-        )
-        refresh_btn.pack(side=tk.LEFT, padx=10)
-        
-        # TreeView pour afficher les dossiers
-        tree_frame = tk.Frame(self.root)
-        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Scrollbars
-        tree_scroll_y = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
-        tree_scroll_x = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL)
-        
-        # TreeView
-        self.tree = ttk.Treeview(
-            tree_frame,
-            columns=('id', 'fichiers'),
-            show='tree headings',
-            yscrollcommand=tree_scroll_y.set,
-            xscrollcommand=tree_scroll_x.set
-        )
-        
-        tree_scroll_y.config(command=self.tree.yview)
-        tree_scroll_x.config(command=self.tree.xview)
-        
-        # Colonnes
-        self.tree.heading('#0', text='Nom du Dossier')
-        self.tree.heading('id', text='ID')
-        self.tree.heading('fichiers', text='Fichiers')
-        
-        self.tree.column('#0', width=400)
-        self.tree.column('id', width=80)
-        self.tree.column('fichiers', width=100)
-        
-        # Pack
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        tree_scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
-        tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
-        
-        # Menu contextuel
-        self.context_menu = tk.Menu(self.root, tearoff=0)
-        self.context_menu.add_command(label="➕ Ajouter sous-dossier", command=self.add_subfolder)
-        self.context_menu.add_command(label="✏️ Renommer", command=self.rename_folder)
-        self.context_menu.add_command(label="📄 Gérer les fichiers", command=self.manage_files)
-        self.context_menu.add_separator()
-        self.context_menu.add_command(label="🗑️ Supprimer", command=self.delete_folder)
-        
-        # Bind clic droit
-        self.tree.bind('<Button-3>', self.show_context_menu)
-    
-    def on_drop(self, event):
-        """Gérer le drop d'un dossier"""
-        # Récupérer le chemin (peut être entre accolades sur Windows)
-        path = event.data
-        
-        # Nettoyer le chemin
-        if path.startswith('{') and path.endswith('}'):
-            path = path[1:-1]
-        
-        path = path.strip()
-        
-        # Vérifier que c'est un dossier
-        if not os.path.isdir(path):
-            messagebox.showerror(
-                "Erreur",
-                "Veuillez déposer un dossier, pas un fichier.\n\n"
-                "Pour importer des fichiers individuels, utilisez le bouton 'Importer Fichiers'."
-            )
-            return
-        
-        # Demander confirmation
-        folder_name = os.path.basename(path)
-        response = messagebox.askyesno(
-            "Confirmation",
-            f"Voulez-vous importer le dossier :\n\n{folder_name}\n\n"
-            "Tous les fichiers et sous-dossiers seront importés.",
-            icon='question'
-        )
-        
-        if response:
-            self.import_folder_path(path)
-    
-    def import_folder_path(self, folder_path: str):
-        """Importer un dossier depuis un chemin donné"""
-        try:
-            # Afficher une fenêtre de progression
-            progress_window = tk.Toplevel(self.root)
-            progress_window.title("Importation en cours...")
-            progress_window.geometry("500x200")
-            progress_window.transient(self.root)
-            progress_window.grab_set()
-            
-            # Centrer
-            progress_window.update_idletasks()
-            x = (progress_window.winfo_screenwidth() // 2) - 250
-            y = (progress_window.winfo_screenheight() // 2) - 100
-            progress_window.geometry(f'500x200+{x}+{y}')
-            
-            tk.Label(
-                progress_window,
-                text="⏳ Importation en cours...",
-                font=('Segoe UI', 14, 'bold'),
-                fg='#007bff'
-            ).pack(pady=20)
-            
-            progress_label = tk.Label(
-                progress_window,
-                text="Analyse du dossier et importation des fichiers...\nCela peut prendre quelques instants.",
-                font=('Segoe UI', 10),
-                fg='#6c757d',
-                justify=tk.CENTER
-            )
-            progress_label.pack(pady=10)
-            
-            # Message d'info
-            info_label = tk.Label(
-                progress_window,
-                text="✓ Tous les fichiers (.docx, .pdf, .xlsx, etc.) seront importés\n✓ L'arborescence des dossiers sera conservée",
-                font=('Segoe UI', 9),
-                fg='#28a745',
-                justify=tk.LEFT
-            )
-            info_label.pack(pady=10)
-            
-            progress_window.update()
-            
-            # Importer les fichiers
-            print("\n" + "="*60)
-            print("DÉBUT DE L'IMPORTATION")
-            print("="*60)
-            count = self.file_handler.save_files_from_folder(folder_path, self.db, None)
-            print("="*60)
-            print(f"FIN DE L'IMPORTATION: {count} fichier(s)")
-            print("="*60 + "\n")
-            
-            progress_window.destroy()
-            
-            messagebox.showinfo(
-                "Succès",
-                f"✅ {count} fichier(s) importé(s) avec succès !\n\n"
-                f"Le dossier '{os.path.basename(folder_path)}' et tous ses fichiers ont été ajoutés."
-            )
-            
-            self.load_folders()
-            self.on_changes()
-            
-        except Exception as e:
-            if 'progress_window' in locals():
-                progress_window.destroy()
-            messagebox.showerror("Erreur", f"Impossible d'importer le dossier:\n\n{e}")
-            import traceback
-            traceback.print_exc()
-    
-    def show_context_menu(self, event):
-        """Afficher le menu contextuel"""
-        item = self.tree.identify_row(event.y)
-        if item:
-            self.tree.selection_set(item)
-            self.context_menu.post(event.x_root, event.y_root)
-    
-    def load_folders(self):
-        """Charger les dossiers dans le TreeView"""
-        # Nettoyer le TreeView
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Charger les dossiers racine
-        root_folders = self.db.get_subfolders(None)
-        for folder in root_folders:
-            self.insert_folder(folder, '')
-    
-    def insert_folder(self, folder: dict, parent: str):
-        """Insérer un dossier dans le TreeView"""
-        file_count = self.db.count_files_in_folder(folder['id'], recursive=True)
-        
-        item_id = self.tree.insert(
-            parent,
-            'end',
-            text=f"📁 {folder['name']}",
-            values=(folder['id'], file_count)
-        )
-        
-        # Charger les sous-dossiers
-        subfolders = self.db.get_subfolders(folder['id'])
-        for subfolder in subfolders:
-            self.insert_folder(subfolder, item_id)
-    
-    def create_folder(self):
-        """Créer un nouveau dossier"""
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Nouveau Dossier")
-        dialog.geometry("400x150")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Centrer
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - 200
-        y = (dialog.winfo_screenheight() // 2) - 75
-        dialog.geometry(f'400x150+{x}+{y}')
-        
-        # Label
-        tk.Label(
-            dialog,
-            text="Nom du dossier:",
-            font=('Segoe UI', 10)
-        ).pack(pady=(20, 5))
-        
-        # Entry
-        name_entry = tk.Entry(dialog, font=('Segoe UI', 11), width=30)
-        name_entry.pack(pady=5)
-        name_entry.focus()
-        
-        # Boutons
-        button_frame = tk.Frame(dialog)
-        button_frame.pack(pady=20)
-        
-        def on_create():
-            name = name_entry.get().strip()
-            if not name:
-                messagebox.showerror("Erreur", "Veuillez entrer un nom")
-                return
-            
-            try:
-                self.db.create_folder(name, None)
-                messagebox.showinfo("Succès", "Dossier créé avec succès")
-                dialog.destroy()
-                self.load_folders()
-                self.on_changes()
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Impossible de créer le dossier:\n{e}")
-        
-        tk.Button(
-            button_frame,
-            text="Créer",
-            font=('Segoe UI', 10, 'bold'),
-            bg='#28a745',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=on_create
-        ).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            button_frame,
-            text="Annuler",
-            font=('Segoe UI', 10),
-            bg='#6c757d',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=dialog.destroy
-        ).pack(side=tk.LEFT, padx=5)
-        
-        # Enter pour créer
-        dialog.bind('<Return>', lambda e: on_create())
-    
-    def add_subfolder(self):
-        """Ajouter un sous-dossier"""
-        selection = self.tree.selection()
-        if not selection:
-            messagebox.showwarning("Attention", "Veuillez sélectionner un dossier parent")
-            return
-        
-        parent_id = self.tree.item(selection[0])['values'][0]
-        
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Nouveau Sous-Dossier")
-        dialog.geometry("400x150")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Centrer
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - 200
-        y = (dialog.winfo_screenheight() // 2) - 75
-        dialog.geometry(f'400x150+{x}+{y}')
-        
-        tk.Label(
-            dialog,
-            text="Nom du sous-dossier:",
-            font=('Segoe UI', 10)
-        ).pack(pady=(20, 5))
-        
-        name_entry = tk.Entry(dialog, font=('Segoe UI', 11), width=30)
-        name_entry.pack(pady=5)
-        name_entry.focus()
-        
-        button_frame = tk.Frame(dialog)
-        button_frame.pack(pady=20)
-        
-        def on_create():
-            name = name_entry.get().strip()
-            if not name:
-                messagebox.showerror("Erreur", "Veuillez entrer un nom")
-                return
-            
-            try:
-                self.db.create_folder(name, parent_id)
-                messagebox.showinfo("Succès", "Sous-dossier créé avec succès")
-                dialog.destroy()
-                self.load_folders()
-                self.on_changes()
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Impossible de créer le sous-dossier:\n{e}")
-        
-        tk.Button(
-            button_frame,
-            text="Créer",
-            font=('Segoe UI', 10, 'bold'),
-            bg='#28a745',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=on_create
-        ).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            button_frame,
-            text="Annuler",
-            font=('Segoe UI', 10),
-            bg='#6c757d',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=dialog.destroy
-        ).pack(side=tk.LEFT, padx=5)
-        
-        dialog.bind('<Return>', lambda e: on_create())
-    
-    def rename_folder(self):
-        """Renommer un dossier"""
-        selection = self.tree.selection()
-        if not selection:
-            messagebox.showwarning("Attention", "Veuillez sélectionner un dossier")
-            return
-        
-        folder_id = self.tree.item(selection[0])['values'][0]
-        folder = self.db.get_folder(folder_id)
-        
-        if not folder:
-            messagebox.showerror("Erreur", "Dossier introuvable")
-            return
-        
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Renommer le Dossier")
-        dialog.geometry("400x150")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Centrer
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - 200
-        y = (dialog.winfo_screenheight() // 2) - 75
-        dialog.geometry(f'400x150+{x}+{y}')
-        
-        tk.Label(
-            dialog,
-            text="Nouveau nom:",
-            font=('Segoe UI', 10)
-        ).pack(pady=(20, 5))
-        
-        name_entry = tk.Entry(dialog, font=('Segoe UI', 11), width=30)
-        name_entry.insert(0, folder['name'])
-        name_entry.pack(pady=5)
-        name_entry.focus()
-        name_entry.select_range(0, tk.END)
-        
-        button_frame = tk.Frame(dialog)
-        button_frame.pack(pady=20)
-        
-        def on_rename():
-            new_name = name_entry.get().strip()
-            if not new_name:
-                messagebox.showerror("Erreur", "Veuillez entrer un nom")
-                return
-            
-            try:
-                self.db.update_folder(folder_id, new_name)
-                messagebox.showinfo("Succès", "Dossier renommé avec succès")
-                dialog.destroy()
-                self.load_folders()
-                self.on_changes()
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Impossible de renommer le dossier:\n{e}")
-        
-        tk.Button(
-            button_frame,
-            text="Renommer",
-            font=('Segoe UI', 10,'bold'),
-            bg='#ffc107',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=on_rename
-        ).pack(side=tk.LEFT, padx=5)
-        
-        tk.Button(
-            button_frame,
-            text="Annuler",
-            font=('Segoe UI', 10),
-            bg='#6c757d',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=dialog.destroy
-        ).pack(side=tk.LEFT, padx=5)
-        
-        dialog.bind('<Return>', lambda e: on_rename())
-    
-    def delete_folder(self):
-        """Supprimer un dossier"""
-        selection = self.tree.selection()
-        if not selection:
-            messagebox.showwarning("Attention", "Veuillez sélectionner un dossier")
-            return
-        
-        folder_id = self.tree.item(selection[0])['values'][0]
-        folder = self.db.get_folder(folder_id)
-        
-        if not folder:
-            messagebox.showerror("Erreur", "Dossier introuvable")
-            return
-        
-        # Confirmation
-        response = messagebox.askyesno(
-            "Confirmation",
-            f"Êtes-vous sûr de vouloir supprimer le dossier '{folder['name']}' ?\n\n"
-            "Tous les fichiers et sous-dossiers seront également supprimés.",
-            icon='warning'
-        )
-        
-        if response:
-            try:
-                self.db.delete_folder(folder_id)
-                messagebox.showinfo("Succès", "Dossier supprimé avec succès")
-                self.load_folders()
-                self.on_changes()
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Impossible de supprimer le dossier:\n{e}")
-    
-    def manage_files(self):
-        """Gérer les fichiers d'un dossier"""
-        selection = self.tree.selection()
-        if not selection:
-            messagebox.showwarning("Attention", "Veuillez sélectionner un dossier")
-            return
-        
-        folder_id = self.tree.item(selection[0])['values'][0]
-        folder = self.db.get_folder(folder_id)
-        
-        if not folder:
-            messagebox.showerror("Erreur", "Dossier introuvable")
-            return
-        
-        # Ouvrir une fenêtre de gestion des fichiers
-        file_window = tk.Toplevel(self.root)
-        FileManagerWindow(file_window, self.db, self.file_handler, folder, self.on_changes)
-    
-    def import_folder(self):
-        """Importer un dossier complet avec son arborescence"""
-        folder_path = filedialog.askdirectory(title="Sélectionner un dossier à importer")
-        
-        if not folder_path:
-            return
-        
-        # Demander confirmation
-        response = messagebox.askyesno(
-            "Confirmation",
-            f"Voulez-vous importer le dossier :\n\n{folder_path}\n\n"
-            "Tous les fichiers et sous-dossiers seront importés.",
-            icon='question'
-        )
-        
-        if response:
-            self.import_folder_path(folder_path)
-    
-    def import_files(self):
-        """Importer des fichiers dans un dossier"""
-        selection = self.tree.selection()
-        if not selection:
-            messagebox.showwarning(
-                "Attention",
-                "Veuillez d'abord sélectionner un dossier de destination"
-            )
-            return
-        
-        folder_id = self.tree.item(selection[0])['values'][0]
-        
-        file_paths = filedialog.askopenfilenames(
-            title="Sélectionner des fichiers à importer"
-        )
-        
-        if not file_paths:
-            return
-        
-        try:
-            success_count = 0
-            error_count = 0
-            
-            for file_path in file_paths:
-                filename = os.path.basename(file_path)
-                success, dest_path = self.file_handler.save_file(file_path, filename)
-                
-                if success:
-                    self.db.add_file(folder_id, filename, dest_path)
-                    success_count += 1
-                else:
-                    error_count += 1
-            
-            if error_count == 0:
-                messagebox.showinfo(
-                    "Succès",
-                    f"✅ {success_count} fichier(s) importé(s) avec succès !"
-                )
-            else:
-                messagebox.showwarning(
-                    "Attention",
-                    f"{success_count} fichier(s) importé(s), {error_count} erreur(s)"
-                )
-            
-            self.load_folders()
-            self.on_changes()
-            
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Impossible d'importer les fichiers:\n{e}")
-
-
-class FileManagerWindow:
-    """Fenêtre de gestion des fichiers d'un dossier"""
-    
-    def __init__(self, root: tk.Toplevel, db, file_handler, folder: dict, on_changes: Callable):
-        self.root = root
-        self.db = db
-        self.file_handler = file_handler
-        self.folder = folder
-        self.on_changes = on_changes
-        
-        self.root.title(f"Fichiers - {folder['name']}")
-        self.root.geometry("800x500")
-        
-        # Centrer la fenêtre
-        self.center_window()
-        
-        # Créer l'interface
-        self.create_widgets()
-        
-        # Charger les fichiers
-        self.load_files()
-    
-    def center_window(self):
-        """Centrer la fenêtre"""
-        self.root.update_idletasks()
-        width = 800
-        height = 500
-        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
-        y = (self.root.winfo_screenheight() // 2) - (height // 2)
-        self.root.geometry(f'{width}x{height}+{x}+{y}')
-    
-    def create_widgets(self):
-        """Créer les widgets"""
-        # En-tête
-        header = tk.Frame(self.root, bg='#17a2b8', height=60)
-        header.pack(fill=tk.X)
-        header.pack_propagate(False)
-        
-        title_label = tk.Label(
-            header,
-            text=f"📄 Fichiers - {self.folder['name']}",
-            font=('Segoe UI', 14, 'bold'),
-            bg='#17a2b8',
-            fg='white'
-        )
-        title_label.pack(side=tk.LEFT, padx=20, pady=15)
-        
-        close_button = tk.Button(
-            header,
-            text="✖️ Fermer",
-            font=('Segoe UI', 10),
-            bg='#dc3545',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.root.destroy
-        )
-        close_button.pack(side=tk.RIGHT, padx=20)
-        
-        # Barre d'outils
-        toolbar = tk.Frame(self.root, bg='#f8f9fa', height=60)
-        toolbar.pack(fill=tk.X, pady=10)
-        
-        # Bouton "Ajouter Fichiers"
-        add_files_btn = tk.Button(
-            toolbar,
-            text="➕ Ajouter Fichiers",
-            font=('Segoe UI', 10, 'bold'),
-            bg='#28a745',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.add_files
-        )
-        add_files_btn.pack(side=tk.LEFT, padx=10)
-        
-        # Bouton "Supprimer"
-        delete_btn = tk.Button(
-            toolbar,
-            text="🗑️ Supprimer",
-            font=('Segoe UI', 10, 'bold'),
-            bg='#dc3545',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.delete_file
-        )
-        delete_btn.pack(side=tk.LEFT, padx=10)
-        
-        # Bouton "Ouvrir"
-        open_btn = tk.Button(
-            toolbar,
-            text="👁️ Ouvrir",
-            font=('Segoe UI', 10, 'bold'),
-            bg='#007bff',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.open_file
-        )
-        open_btn.pack(side=tk.LEFT, padx=10)
-        
-        # Bouton "Rafraîchir"
-        refresh_btn = tk.Button(
-            toolbar,
-            text="🔄 Rafraîchir",
-            font=('Segoe UI', 10),
-            bg='#6c757d',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=self.load_files
-        )
-        refresh_btn.pack(side=tk.LEFT, padx=10)
-        
-        # Listbox pour afficher les fichiers
-        list_frame = tk.Frame(self.root)
-        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
-        
-        # Listbox
-        self.file_listbox = tk.Listbox(
-            list_frame,
-            font=('Segoe UI', 10),
-            yscrollcommand=scrollbar.set,
-            selectmode=tk.SINGLE
-        )
-        
-        scrollbar.config(command=self.file_listbox.yview)
-        
-        # Pack
-        self.file_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Double-clic pour ouvrir
-        self.file_listbox.bind('<Double-Button-1>', lambda e: self.open_file())
-    
-    def load_files(self):
-        """Charger les fichiers"""
-        self.file_listbox.delete(0, tk.END)
-        
-        files = self.db.get_files_in_folder(self.folder['id'])
-        
-        for file in files:
-            extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
-            icon = self.file_handler.get_file_icon(extension)
-            
-            # Taille du fichier
-            try:
-                size = os.path.getsize(file['filepath']) if os.path.exists(file['filepath']) else 0
-                size_formatted = self.format_file_size(size)
-            except:
-                size_formatted = "N/A"
-            
-            display_text = f"{icon} {file['filename']} ({size_formatted})"
-            self.file_listbox.insert(tk.END, display_text)
-        
-        if not files:
-            self.file_listbox.insert(tk.END, "Aucun fichier dans ce dossier")
-    
-    @staticmethod
-    def format_file_size(size: int) -> str:
-        """Formater la taille d'un fichier"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.2f} {unit}"
-            size /= 1024.0
-        return f"{size:.2f} TB"
-    
-    def add_files(self):
-        """Ajouter des fichiers"""
-        file_paths = filedialog.askopenfilenames(
-            title="Sélectionner des fichiers à ajouter"
-        )
-        
-        if not file_paths:
-            return
-        
-        try:
-            success_count = 0
-            error_count = 0
-            
-            for file_path in file_paths:
-                filename = os.path.basename(file_path)
-                success, dest_path = self.file_handler.save_file(file_path, filename)
-                
-                if success:
-                    self.db.add_file(self.folder['id'], filename, dest_path)
-                    success_count += 1
-                else:
-                    error_count += 1
-            
-            if error_count == 0:
-                messagebox.showinfo(
-                    "Succès",
-                    f"✅ {success_count} fichier(s) ajouté(s) avec succès !"
-                )
-            else:
-                messagebox.showwarning(
-                    "Attention",
-                    f"{success_count} fichier(s) ajouté(s), {error_count} erreur(s)"
-                )
-            
-            self.load_files()
-            self.on_changes()
-            
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Impossible d'ajouter les fichiers:\n{e}")
-    
-    def delete_file(self):
-        """Supprimer le fichier sélectionné"""
-        selection = self.file_listbox.curselection()
-        if not selection:
-            messagebox.showwarning("Attention", "Veuillez sélectionner un fichier")
-            return
-        
-        index = selection[0]
-        files = self.db.get_files_in_folder(self.folder['id'])
-        
-        if index >= len(files):
-            return
-        
-        file = files[index]
-        
-        # Confirmation
-        response = messagebox.askyesno(
-            "Confirmation",
-            f"Êtes-vous sûr de vouloir supprimer le fichier :\n\n{file['filename']} ?",
-            icon='warning'
-        )
-        
-        if response:
-            try:
-                self.db.delete_file(file['id'])
-                messagebox.showinfo("Succès", "Fichier supprimé avec succès")
-                self.load_files()
-                self.on_changes()
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Impossible de supprimer le fichier:\n{e}")
-    
-    def open_file(self):
-        """Ouvrir le fichier sélectionné"""
-        selection = self.file_listbox.curselection()
-        if not selection:
-            messagebox.showwarning("Attention", "Veuillez sélectionner un fichier")
-            return
-        
-        index = selection[0]
-        files = self.db.get_files_in_folder(self.folder['id'])
-        
-        if index >= len(files):
-            return
-        
-        file = files[index]
-        
-        if not os.path.exists(file['filepath']):
-            messagebox.showerror("Erreur", "Le fichier n'existe pas")
-            return
-        
-        success = self.file_handler.open_file(file['filepath'])
-        if not success:
-            messagebox.showerror("Erreur", "Impossible d'ouvrir le fichier")
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from tkinterdnd2 import DND_FILES, TkinterDnD
+from typing import Iterable, List, Optional
+import dataclasses
+import os
+import queue
+import threading
+from database import Database
+from events import (
+    FilesAdded, FilesMeasured, FilesRemoved, FileUpdated, FolderAdded, FolderMoved,
+    FolderRemoved, FolderRenamed,
+)
+from utils.import_pipeline import ImportPipeline
+
+class AdminWindow:
+    """Fenêtre d'administration avec Drag & Drop"""
+    
+    # Intervalle de lecture de la file de progression d'un import (ms)
+    IMPORT_POLL_MS = 100
+    
+    def __init__(self, root: tk.Toplevel, db, file_handler):
+        self.root = root
+        self.db = db
+        self.file_handler = file_handler
+        self.active_import = None  # threading.Event d'annulation de l'import en cours
+        self.close_requested = False
+        
+        # Nœuds du TreeView par ID de dossier (dossiers déjà chargés)
+        self.folder_items = {}
+        self.pending_events = []
+        
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.root.title("Administration - Gestion des Dossiers")
+        self.root.geometry("900x600")
+        
+        # Centrer la fenêtre
+        self.center_window()
+        
+        # Créer l'interface
+        self.create_widgets()
+        
+        # Charger les dossiers
+        self.load_folders()
+        
+        # Mises à jour incrémentales du TreeView à chaque modification de la base
+        unsubscribe = self.db.events.subscribe(self.on_db_event)
+        self.root.bind('<Destroy>', lambda e: unsubscribe() if e.widget is self.root else None)
+    
+    def center_window(self):
+        """Centrer la fenêtre"""
+        self.root.update_idletasks()
+        width = 900
+        height = 600
+        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.root.winfo_screenheight() // 2) - (height // 2)
+        self.root.geometry(f'{width}x{height}+{x}+{y}')
+    
+    def create_widgets(self):
+        """Créer les widgets"""
+        # En-tête
+        header = tk.Frame(self.root, bg='#000', height=60)
+        header.pack(fill=tk.X)
+        header.pack_propagate(False)
+        
+        title_label = tk.Label(
+            header,
+            text="📁 Gestion des Dossiers",
+            font=('Segoe UI', 16, 'bold'),
+            bg='#000',
+            fg='white'
+        )
+        title_label.pack(side=tk.LEFT, padx=20, pady=15)
+        
+        close_button = tk.Button(
+            header,
+            text="✖️ Fermer",
+            font=('Segoe UI', 10),
+            bg='#dc3545',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.close
+        )
+        close_button.pack(side=tk.RIGHT, padx=20)
+        
+        # ZONE DRAG & DROP - NOUVELLE SECTION
+        dragdrop_frame = tk.Frame(self.root, bg='#e7f3ff', relief=tk.SOLID, bd=2)
+        dragdrop_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        # Titre de la zone
+        tk.Label(
+            dragdrop_frame,
+            text="📦 Zone Drag & Drop",
+            font=('Segoe UI', 12, 'bold'),
+            bg='#e7f3ff',
+            fg='#0066cc'
+        ).pack(pady=(10, 5))
+        
+        # Zone de drop
+        self.drop_zone = tk.Label(
+            dragdrop_frame,
+            text="⬇️ Glissez-déposez un dossier ici pour l'importer\n\n"
+                 "Tous les fichiers (.docx, .pdf, .xlsx, etc.) seront importés\n"
+                 "avec leur arborescence complète",
+            font=('Segoe UI', 10),
+            bg='#ffffff',
+            fg='#6c757d',
+            relief=tk.RIDGE,
+            bd=2,
+            height=5,
+            cursor='hand2'
+        )
+        self.drop_zone.pack(fill=tk.X, padx=20, pady=(5, 15))
+        
+        # Configuration du drag & drop
+        self.drop_zone.drop_target_register(DND_FILES)
+        self.drop_zone.dnd_bind('<<Drop>>', self.on_drop)
+        
+        # Effet hover sur la zone de drop
+        def on_enter(e):
+            self.drop_zone.config(bg='#f0f8ff', relief=tk.SOLID, bd=3)
+        
+        def on_leave(e):
+            self.drop_zone.config(bg='#ffffff', relief=tk.RIDGE, bd=2)
+        
+        self.drop_zone.bind('<Enter>', on_enter)
+        self.drop_zone.bind('<Leave>', on_leave)
+        
+        # Permettre aussi le clic pour sélectionner
+        self.drop_zone.bind('<Button-1>', lambda e: self.import_folder())
+        
+        # Barre d'outils
+        toolbar = tk.Frame(self.root, bg='#f8f9fa', height=60)
+        toolbar.pack(fill=tk.X, pady=10)
+        
+        # Bouton "Nouveau Dossier"
+        new_folder_btn = tk.Button(
+            toolbar,
+            text="➕ Nouveau Dossier",
+            font=('Segoe UI', 10, 'bold'),
+            bg='#28a745',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.create_folder
+        )
+        new_folder_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Bouton "Importer Dossier"
+        import_folder_btn = tk.Button(
+            toolbar,
+            text="📂 Importer Dossier",
+            font=('Segoe UI', 10, 'bold'),
+            bg='#007bff',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.import_folder
+        )
+        import_folder_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Bouton "Importer Fichiers"
+        import_files_btn = tk.Button(
+            toolbar,
+            text="📄 Importer Fichiers",
+            font=('Segoe UI', 10, 'bold'),
+            bg='#17a2b8',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.import_files
+        )
+        import_files_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Bouton "Rafraîchir"
+        refresh_btn = tk.Button(
+            toolbar,
+            text="🔄 Rafraîchir",
+            font=('Segoe UI', 10),
+            bg='#6c757d',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.load_folders
+        )
+        refresh_btn.pack(side=tk.LEFT, padx=10)
+        
+        # TreeView pour afficher les dossiers
+        tree_frame = tk.Frame(self.root)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Scrollbars
+        tree_scroll_y = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+        tree_scroll_x = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL)
+        
+        # TreeView
+        self.tree = ttk.Treeview(
+            tree_frame,
+            columns=('id', 'fichiers', 'taille'),
+            show='tree headings',
+            yscrollcommand=tree_scroll_y.set,
+            xscrollcommand=tree_scroll_x.set
+        )
+        
+        tree_scroll_y.config(command=self.tree.yview)
+        tree_scroll_x.config(command=self.tree.xview)
+        
+        # Colonnes
+        self.tree.heading('#0', text='Nom du Dossier')
+        self.tree.heading('id', text='ID')
+        self.tree.heading('fichiers', text='Fichiers')
+        self.tree.heading('taille', text='Taille')
+        
+        self.tree.column('#0', width=400)
+        self.tree.column('id', width=80)
+        self.tree.column('fichiers', width=100)
+        self.tree.column('taille', width=100)
+        
+        # Pack
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        tree_scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
+        tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Menu contextuel
+        self.context_menu = tk.Menu(self.root, tearoff=0)
+        self.context_menu.add_command(label="➕ Ajouter sous-dossier", command=self.add_subfolder)
+        self.context_menu.add_command(label="✏️ Renommer", command=self.rename_folder)
+        self.context_menu.add_command(label="📄 Gérer les fichiers", command=self.manage_files)
+        self.context_menu.add_separator()
+        self.context_menu.add_command(label="🗑️ Supprimer", command=self.delete_folder)
+        
+        # Bind clic droit
+        self.tree.bind('<Button-3>', self.show_context_menu)
+        
+        # Sous-dossiers chargés à la première ouverture d'un nœud
+        self.tree.bind('<<TreeviewOpen>>', self.on_tree_open)
+    
+    def on_drop(self, event):
+        """Gérer le drop d'un dossier"""
+        # Récupérer le chemin (peut être entre accolades sur Windows)
+        path = event.data
+        
+        # Nettoyer le chemin
+        if path.startswith('{') and path.endswith('}'):
+            path = path[1:-1]
+        
+        path = path.strip()
+        
+        # Vérifier que c'est un dossier
+        if not os.path.isdir(path):
+            messagebox.showerror(
+                "Erreur",
+                "Veuillez déposer un dossier, pas un fichier.\n\n"
+                "Pour importer des fichiers individuels, utilisez le bouton 'Importer Fichiers'."
+            )
+            return
+        
+        # Demander confirmation
+        folder_name = os.path.basename(path)
+        response = messagebox.askyesno(
+            "Confirmation",
+            f"Voulez-vous importer le dossier :\n\n{folder_name}\n\n"
+            "Tous les fichiers et sous-dossiers seront importés.",
+            icon='question'
+        )
+        
+        if response:
+            self.import_folder_path(path)
+    
+    def import_folder_path(self, folder_path: str):
+        """Importer un dossier depuis un chemin donné (en arrière-plan)"""
+        if self.active_import is not None:
+            messagebox.showwarning(
+                "Attention",
+                "Un import est déjà en cours.\n\nAttendez sa fin ou annulez-le."
+            )
+            return
+        
+        # Dossier déjà importé sous ce nom: proposer une synchronisation
+        folder_name = os.path.basename(os.path.normpath(folder_path))
+        existing = self.db.find_folder(folder_name, None)
+        sync_folder_id = None
+        if existing:
+            response = messagebox.askyesnocancel(
+                "Dossier déjà importé",
+                f"Le dossier '{folder_name}' existe déjà.\n\n"
+                "Oui: le synchroniser (seuls les fichiers nouveaux ou modifiés sont copiés, "
+                "ceux supprimés de la source sont retirés)\n"
+                "Non: l'importer une nouvelle fois",
+                icon='question'
+            )
+            if response is None:
+                return
+            if response:
+                sync_folder_id = existing['id']
+        
+        # Fenêtre de progression (non modale: la navigation reste possible)
+        progress_window = tk.Toplevel(self.root)
+        progress_window.title("Importation en cours...")
+        progress_window.geometry("500x260")
+        progress_window.transient(self.root)
+        
+        # Centrer
+        progress_window.update_idletasks()
+        x = (progress_window.winfo_screenwidth() // 2) - 250
+        y = (progress_window.winfo_screenheight() // 2) - 130
+        progress_window.geometry(f'500x260+{x}+{y}')
+        
+        tk.Label(
+            progress_window,
+            text="⏳ Importation en cours...",
+            font=('Segoe UI', 14, 'bold'),
+            fg='#007bff'
+        ).pack(pady=(20, 10))
+        
+        tk.Label(
+            progress_window,
+            text=os.path.basename(os.path.normpath(folder_path)),
+            font=('Segoe UI', 10, 'bold'),
+            fg='#212529'
+        ).pack()
+        
+        progress_bar = ttk.Progressbar(progress_window, mode='indeterminate', length=400)
+        progress_bar.pack(pady=10)
+        progress_bar.start(15)
+        
+        progress_label = tk.Label(
+            progress_window,
+            text="Analyse du dossier...",
+            font=('Segoe UI', 10),
+            fg='#6c757d',
+            justify=tk.CENTER
+        )
+        progress_label.pack(pady=5)
+        
+        cancel_button = tk.Button(
+            progress_window,
+            text="⏹️ Annuler",
+            font=('Segoe UI', 10),
+            bg='#dc3545',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2'
+        )
+        cancel_button.pack(pady=10)
+        
+        # Le thread d'import communique avec l'interface par cette file
+        events = queue.Queue()
+        cancel_event = threading.Event()
+        
+        def progress(stats):
+            events.put(('progress', dataclasses.replace(stats)))
+        
+        def worker():
+            # Connexion SQLite propre au thread d'import
+            worker_db = Database(self.db.db_path, profile=self.db.profile)
+            # Ses événements sont republiés par le thread de l'interface (poll)
+            worker_db.events.subscribe(lambda event: events.put(('change', event)))
+            try:
+                pipeline = ImportPipeline(
+                    self.file_handler, worker_db,
+                    progress=progress, cancel_event=cancel_event
+                )
+                events.put(('done', pipeline.run(folder_path, None, sync_folder_id)))
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                events.put(('error', e))
+            finally:
+                worker_db.close()
+        
+        def on_cancel():
+            cancel_event.set()
+            cancel_button.config(state=tk.DISABLED, text="Annulation...")
+            progress_label.config(text="Arrêt en cours: fin des copies commencées...")
+        
+        cancel_button.config(command=on_cancel)
+        progress_window.protocol("WM_DELETE_WINDOW", on_cancel)
+        
+        def poll():
+            finished = None
+            try:
+                while True:
+                    kind, payload = events.get_nowait()
+                    if kind == 'progress':
+                        progress_label.config(text=self.format_import_progress(payload))
+                    elif kind == 'change':
+                        self.db.events.publish(payload)
+                    else:
+                        finished = (kind, payload)
+            except queue.Empty:
+                pass
+            
+            if finished is None:
+                self.root.after(self.IMPORT_POLL_MS, poll)
+                return
+            
+            self.active_import = None
+            progress_window.destroy()
+            kind, payload = finished
+            
+            print("=" * 60)
+            if kind == 'error':
+                print(f"ÉCHEC DE L'IMPORTATION: {payload}")
+                print("=" * 60 + "\n")
+                messagebox.showerror("Erreur", f"Impossible d'importer le dossier:\n\n{payload}")
+            else:
+                print(f"FIN DE L'IMPORTATION: {payload.files} fichier(s)")
+                print("=" * 60 + "\n")
+                if sync_folder_id is not None and not payload.cancelled:
+                    messagebox.showinfo(
+                        "Synchronisation terminée",
+                        f"🔄 Le dossier '{folder_name}' est à jour.\n\n"
+                        f"{payload.files - payload.updated} nouveau(x) fichier(s), "
+                        f"{payload.updated} modifié(s), {payload.unchanged} inchangé(s), "
+                        f"{payload.deleted} élément(s) supprimé(s).\n"
+                        f"({self.format_import_progress(payload)})"
+                    )
+                elif payload.cancelled:
+                    messagebox.showwarning(
+                        "Import interrompu",
+                        f"⏹️ Import annulé: {payload.files} fichier(s) importé(s) avant l'arrêt.\n\n"
+                        f"Le dossier '{os.path.basename(os.path.normpath(folder_path))}' "
+                        "contient les fichiers copiés jusque-là."
+                    )
+                else:
+                    messagebox.showinfo(
+                        "Succès",
+                        f"✅ {payload.files} fichier(s) importé(s) avec succès !\n\n"
+                        f"Le dossier '{os.path.basename(os.path.normpath(folder_path))}' "
+                        f"et tous ses fichiers ont été ajoutés.\n"
+                        f"({self.format_import_progress(payload)})"
+                    )
+            
+            if self.close_requested:
+                self.root.destroy()
+        
+        print("\n" + "=" * 60)
+        print("DÉBUT DE L'IMPORTATION")
+        print("=" * 60)
+        self.active_import = cancel_event
+        threading.Thread(target=worker, name='import', daemon=True).start()
+        self.root.after(self.IMPORT_POLL_MS, poll)
+    
+    @staticmethod
+    def format_import_progress(stats) -> str:
+        """Texte de progression d'un import"""
+        return (
+            f"📄 {stats.files} fichier(s) · 📁 {stats.folders} dossier(s) · "
+            f"{FileManagerWindow.format_file_size(stats.bytes)}\n"
+            f"⚡ {stats.files_per_second:.1f} fichiers/s · "
+            f"{FileManagerWindow.format_file_size(stats.bytes_per_second)}/s"
+            + (f" · ⚠️ {stats.errors} erreur(s)" if stats.errors else "")
+            + (f"\n🔄 {stats.unchanged} fichier(s) inchangé(s)" if stats.unchanged else "")
+        )
+    
+    def close(self):
+        """Fermer la fenêtre (après l'import en cours s'il y en a un)"""
+        if self.active_import is None:
+            self.root.destroy()
+            return
+        
+        response = messagebox.askyesno(
+            "Import en cours",
+            "Un import est en cours.\n\nVoulez-vous l'annuler et fermer la fenêtre ?",
+            icon='warning'
+        )
+        if response:
+            self.close_requested = True
+            self.active_import.set()
+    
+    def show_context_menu(self, event):
+        """Afficher le menu contextuel"""
+        item = self.tree.identify_row(event.y)
+        if item:
+            self.tree.selection_set(item)
+            self.context_menu.post(event.x_root, event.y_root)
+    
+    def load_folders(self):
+        """
+        Charger les dossiers dans le TreeView
+        
+        Seuls les dossiers racine sont insérés; les sous-dossiers d'un nœud
+        sont lus à sa première ouverture (voir on_tree_open). Les nœuds
+        ouverts et la sélection sont conservés d'un rechargement à l'autre.
+        
+        Après le chargement initial, les modifications de la base sont
+        appliquées nœud par nœud (voir on_db_event).
+        """
+        expanded = {
+            folder_id for folder_id, item in self.folder_items.items()
+            if self.tree.item(item, 'open')
+        }
+        selected = set(self.tree.selection())
+        selected = [folder_id for folder_id, item in self.folder_items.items() if item in selected]
+        
+        # Nettoyer le TreeView
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        self.folder_items = {}
+        
+        # Charger les dossiers racine, puis rouvrir les nœuds qui l'étaient
+        pending = self.insert_children('', None)
+        while pending:
+            item = pending.pop()
+            if self.tree.item(item)['values'][0] in expanded:
+                self.tree.item(item, open=True)
+                pending.extend(self.load_children(item))
+        
+        items = [self.folder_items[folder_id] for folder_id in selected
+                 if folder_id in self.folder_items]
+        if items:
+            self.tree.selection_set(items)
+            self.tree.see(items[0])
+    
+    def insert_children(self, parent: str, parent_id: Optional[int]) -> List[str]:
+        """
+        Insérer les sous-dossiers directs d'un dossier, avec leurs agrégats
+        
+        Un dossier qui a des sous-dossiers reçoit un nœud d'attente: il
+        s'affiche comme ouvrable sans que ses enfants soient lus.
+        """
+        subfolders = self.db.get_subfolders(parent_id)
+        folder_stats = self.db.get_folder_stats_bulk(folder['id'] for folder in subfolders)
+        
+        return [
+            self.insert_folder_item(parent, 'end', folder, folder_stats[folder['id']])
+            for folder in subfolders
+        ]
+    
+    def insert_folder_item(self, parent: str, index, folder: dict, stats: dict) -> str:
+        """Insérer le nœud d'un dossier (sans ses sous-dossiers)"""
+        item_id = self.tree.insert(
+            parent,
+            index,
+            text=f"📁 {folder['name']}",
+            values=(
+                folder['id'],
+                stats['total_file_count'],
+                FileManagerWindow.format_file_size(stats['total_bytes'])
+            )
+        )
+        if stats['subfolder_count']:
+            self.tree.insert(item_id, 'end', text="⏳ Chargement...", tags=('placeholder',))
+        self.folder_items[folder['id']] = item_id
+        return item_id
+    
+    def load_children(self, item: str) -> List[str]:
+        """Remplacer le nœud d'attente d'un dossier par ses sous-dossiers"""
+        children = self.tree.get_children(item)
+        if len(children) != 1 or not self.tree.tag_has('placeholder', children[0]):
+            return []  # Déjà chargé
+        self.tree.delete(children[0])
+        return self.insert_children(item, self.tree.item(item)['values'][0])
+    
+    def on_tree_open(self, event=None):
+        """Charger les sous-dossiers du nœud ouvert"""
+        item = self.tree.focus()
+        if item:
+            self.load_children(item)
+    
+    # ==================== MISES À JOUR INCRÉMENTALES ====================
+    
+    def on_db_event(self, event):
+        """Noter une modification de la base; les modifications sont appliquées ensemble"""
+        if not self.pending_events:
+            self.root.after_idle(self.apply_pending_events)
+        self.pending_events.append(event)
+    
+    def apply_pending_events(self):
+        """Appliquer au TreeView les modifications reçues, nœud par nœud"""
+        events, self.pending_events = self.pending_events, []
+        if not self.tree.winfo_exists():
+            return
+        
+        # Dossiers dont les agrégats ont pu changer (leurs ancêtres aussi)
+        changed = set()
+        for event in events:
+            if isinstance(event, FolderAdded):
+                self.add_folder_item(event.folder_id, event.parent_id, event.name)
+                changed.add(event.parent_id)
+            elif isinstance(event, FolderRenamed):
+                item = self.folder_items.get(event.folder_id)
+                if item:
+                    self.tree.item(item, text=f"📁 {event.name}")
+                    parent = self.tree.parent(item)
+                    self.tree.move(item, parent, self.sorted_index(parent, event.name, item))
+            elif isinstance(event, FolderMoved):
+                self.remove_folder_item(event.folder_id)
+                folder = self.db.get_folder(event.folder_id)
+                if folder:
+                    self.add_folder_item(folder['id'], folder['parent_id'], folder['name'])
+                changed.update((event.old_parent_id, event.new_parent_id))
+            elif isinstance(event, FolderRemoved):
+                self.remove_folder_item(event.folder_id)
+                changed.add(event.parent_id)
+            elif isinstance(event, (FilesAdded, FilesRemoved, FilesMeasured)):
+                changed.update(event.folder_ids)
+            elif isinstance(event, FileUpdated):
+                changed.add(event.folder_id)
+        
+        # Seules les lignées touchées sont relues, pas tout l'arbre chargé
+        changed.discard(None)
+        if changed:
+            self.refresh_folder_items(self.db.get_ancestor_ids(changed))
+    
+    def add_folder_item(self, folder_id: int, parent_id: Optional[int], name: str):
+        """Insérer un nouveau dossier si son parent est affiché et déjà chargé"""
+        if folder_id in self.folder_items:
+            return
+        if parent_id is None:
+            parent = ''
+        else:
+            parent = self.folder_items.get(parent_id)
+            if parent is None:
+                return
+            children = self.tree.get_children(parent)
+            if children and self.tree.tag_has('placeholder', children[0]):
+                return  # Sera lu à l'ouverture du parent
+        folder = {'id': folder_id, 'name': name}
+        stats = self.db.get_folder_stats(folder_id)
+        self.insert_folder_item(parent, self.sorted_index(parent, name), folder, stats)
+    
+    def remove_folder_item(self, folder_id: int):
+        """Retirer le nœud d'un dossier et de tout son sous-arbre"""
+        item = self.folder_items.pop(folder_id, None)
+        if item is None:
+            return
+        pending = list(self.tree.get_children(item))
+        while pending:
+            child = pending.pop()
+            if not self.tree.tag_has('placeholder', child):
+                self.folder_items.pop(self.tree.item(child)['values'][0], None)
+                pending.extend(self.tree.get_children(child))
+        self.tree.delete(item)
+    
+    def sorted_index(self, parent: str, name: str, item: Optional[str] = None) -> int:
+        """Position de `name` parmi les enfants de `parent` (ordre alphabétique de la base)"""
+        siblings = [child for child in self.tree.get_children(parent) if child != item]
+        for index, child in enumerate(siblings):
+            if self.tree.item(child, 'text')[2:] > name:
+                return index
+        return len(siblings)
+    
+    def refresh_folder_items(self, folder_ids: Iterable[int]):
+        """Mettre à jour compteurs, tailles et nœuds d'attente de ces dossiers, s'ils sont chargés"""
+        loaded = [folder_id for folder_id in folder_ids if folder_id in self.folder_items]
+        folder_stats = self.db.get_folder_stats_bulk(loaded)
+        for folder_id in loaded:
+            item = self.folder_items[folder_id]
+            stats = folder_stats[folder_id]
+            self.tree.set(item, 'fichiers', stats['total_file_count'])
+            self.tree.set(item, 'taille', FileManagerWindow.format_file_size(stats['total_bytes']))
+            
+            children = self.tree.get_children(item)
+            if stats['subfolder_count'] and not children:
+                self.tree.insert(item, 'end', text="⏳ Chargement...", tags=('placeholder',))
+            elif not stats['subfolder_count'] and len(children) == 1 \
+                    and self.tree.tag_has('placeholder', children[0]):
+                self.tree.delete(children[0])
+    
+    def create_folder(self):
+        """Créer un nouveau dossier"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Nouveau Dossier")
+        dialog.geometry("400x150")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # Centrer
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - 200
+        y = (dialog.winfo_screenheight() // 2) - 75
+        dialog.geometry(f'400x150+{x}+{y}')
+        
+        # Label
+        tk.Label(
+            dialog,
+            text="Nom du dossier:",
+            font=('Segoe UI', 10)
+        ).pack(pady=(20, 5))
+        
+        # Entry
+        name_entry = tk.Entry(dialog, font=('Segoe UI', 11), width=30)
+        name_entry.pack(pady=5)
+        name_entry.focus()
+        
+        # Boutons
+        button_frame = tk.Frame(dialog)
+        button_frame.pack(pady=20)
+        
+        def on_create():
+            name = name_entry.get().strip()
+            if not name:
+                messagebox.showerror("Erreur", "Veuillez entrer un nom")
+                return
+            
+            try:
+                self.db.create_folder(name, None)
+                messagebox.showinfo("Succès", "Dossier créé avec succès")
+                dialog.destroy()
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Impossible de créer le dossier:\n{e}")
+        
+        tk.Button(
+            button_frame,
+            text="Créer",
+            font=('Segoe UI', 10, 'bold'),
+            bg='#28a745',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=on_create
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            button_frame,
+            text="Annuler",
+            font=('Segoe UI', 10),
+            bg='#6c757d',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=dialog.destroy
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # Enter pour créer
+        dialog.bind('<Return>', lambda e: on_create())
+    
+    def add_subfolder(self):
+        """Ajouter un sous-dossier"""
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning("Attention", "Veuillez sélectionner un dossier parent")
+            return
+        
+        parent_id = self.tree.item(selection[0])['values'][0]
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Nouveau Sous-Dossier")
+        dialog.geometry("400x150")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # Centrer
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - 200
+        y = (dialog.winfo_screenheight() // 2) - 75
+        dialog.geometry(f'400x150+{x}+{y}')
+        
+        tk.Label(
+            dialog,
+            text="Nom du sous-dossier:",
+            font=('Segoe UI', 10)
+        ).pack(pady=(20, 5))
+        
+        name_entry = tk.Entry(dialog, font=('Segoe UI', 11), width=30)
+        name_entry.pack(pady=5)
+        name_entry.focus()
+        
+        button_frame = tk.Frame(dialog)
+        button_frame.pack(pady=20)
+        
+        def on_create():
+            name = name_entry.get().strip()
+            if not name:
+                messagebox.showerror("Erreur", "Veuillez entrer un nom")
+                return
+            
+            try:
+                self.db.create_folder(name, parent_id)
+                messagebox.showinfo("Succès", "Sous-dossier créé avec succès")
+                dialog.destroy()
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Impossible de créer le sous-dossier:\n{e}")
+        
+        tk.Button(
+            button_frame,
+            text="Créer",
+            font=('Segoe UI', 10, 'bold'),
+            bg='#28a745',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=on_create
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            button_frame,
+            text="Annuler",
+            font=('Segoe UI', 10),
+            bg='#6c757d',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=dialog.destroy
+        ).pack(side=tk.LEFT, padx=5)
+        
+        dialog.bind('<Return>', lambda e: on_create())
+    
+    def rename_folder(self):
+        """Renommer un dossier"""
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning("Attention", "Veuillez sélectionner un dossier")
+            return
+        
+        folder_id = self.tree.item(selection[0])['values'][0]
+        folder = self.db.get_folder(folder_id)
+        
+        if not folder:
+            messagebox.showerror("Erreur", "Dossier introuvable")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Renommer le Dossier")
+        dialog.geometry("400x150")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # Centrer
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - 200
+        y = (dialog.winfo_screenheight() // 2) - 75
+        dialog.geometry(f'400x150+{x}+{y}')
+        
+        tk.Label(
+            dialog,
+            text="Nouveau nom:",
+            font=('Segoe UI', 10)
+        ).pack(pady=(20, 5))
+        
+        name_entry = tk.Entry(dialog, font=('Segoe UI', 11), width=30)
+        name_entry.insert(0, folder['name'])
+        name_entry.pack(pady=5)
+        name_entry.focus()
+        name_entry.select_range(0, tk.END)
+        
+        button_frame = tk.Frame(dialog)
+        button_frame.pack(pady=20)
+        
+        def on_rename():
+            new_name = name_entry.get().strip()
+            if not new_name:
+                messagebox.showerror("Erreur", "Veuillez entrer un nom")
+                return
+            
+            try:
+                self.db.update_folder(folder_id, new_name)
+                messagebox.showinfo("Succès", "Dossier renommé avec succès")
+                dialog.destroy()
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Impossible de renommer le dossier:\n{e}")
+        
+        tk.Button(
+            button_frame,
+            text="Renommer",
+            font=('Segoe UI', 10,'bold'),
+            bg='#ffc107',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=on_rename
+        ).pack(side=tk.LEFT, padx=5)
+        
+        tk.Button(
+            button_frame,
+            text="Annuler",
+            font=('Segoe UI', 10),
+            bg='#6c757d',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=dialog.destroy
+        ).pack(side=tk.LEFT, padx=5)
+        
+        dialog.bind('<Return>', lambda e: on_rename())
+    
+    def delete_folder(self):
+        """Supprimer un dossier"""
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning("Attention", "Veuillez sélectionner un dossier")
+            return
+        
+        folder_id = self.tree.item(selection[0])['values'][0]
+        folder = self.db.get_folder(folder_id)
+        
+        if not folder:
+            messagebox.showerror("Erreur", "Dossier introuvable")
+            return
+        
+        # Confirmation
+        response = messagebox.askyesno(
+            "Confirmation",
+            f"Êtes-vous sûr de vouloir supprimer le dossier '{folder['name']}' ?\n\n"
+            "Tous les fichiers et sous-dossiers seront également supprimés.",
+            icon='warning'
+        )
+        
+        if response:
+            try:
+                self.db.delete_folder(folder_id)
+                messagebox.showinfo("Succès", "Dossier supprimé avec succès")
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Impossible de supprimer le dossier:\n{e}")
+    
+    def manage_files(self):
+        """Gérer les fichiers d'un dossier"""
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning("Attention", "Veuillez sélectionner un dossier")
+            return
+        
+        folder_id = self.tree.item(selection[0])['values'][0]
+        folder = self.db.get_folder(folder_id)
+        
+        if not folder:
+            messagebox.showerror("Erreur", "Dossier introuvable")
+            return
+        
+        # Ouvrir une fenêtre de gestion des fichiers
+        file_window = tk.Toplevel(self.root)
+        FileManagerWindow(file_window, self.db, self.file_handler, folder)
+    
+    def import_folder(self):
+        """Importer un dossier complet avec son arborescence"""
+        folder_path = filedialog.askdirectory(title="Sélectionner un dossier à importer")
+        
+        if not folder_path:
+            return
+        
+        # Demander confirmation
+        response = messagebox.askyesno(
+            "Confirmation",
+            f"Voulez-vous importer le dossier :\n\n{folder_path}\n\n"
+            "Tous les fichiers et sous-dossiers seront importés.",
+            icon='question'
+        )
+        
+        if response:
+            self.import_folder_path(folder_path)
+    
+    def import_files(self):
+        """Importer des fichiers dans un dossier"""
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning(
+                "Attention",
+                "Veuillez d'abord sélectionner un dossier de destination"
+            )
+            return
+        
+        folder_id = self.tree.item(selection[0])['values'][0]
+        
+        file_paths = filedialog.askopenfilenames(
+            title="Sélectionner des fichiers à importer"
+        )
+        
+        if not file_paths:
+            return
+        
+        try:
+            success_count, error_count = self.file_handler.save_files_to_folder(
+                file_paths, self.db, folder_id
+            )
+            
+            if error_count == 0:
+                messagebox.showinfo(
+                    "Succès",
+                    f"✅ {success_count} fichier(s) importé(s) avec succès !"
+                )
+            else:
+                messagebox.showwarning(
+                    "Attention",
+                    f"{success_count} fichier(s) importé(s), {error_count} erreur(s)"
+                )
+            
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible d'importer les fichiers:\n{e}")
+
+
+class FileManagerWindow:
+    """Fenêtre de gestion des fichiers d'un dossier"""
+    
+    def __init__(self, root: tk.Toplevel, db, file_handler, folder: dict):
+        self.root = root
+        self.db = db
+        self.file_handler = file_handler
+        self.folder = folder
+        
+        self.root.title(f"Fichiers - {folder['name']}")
+        self.root.geometry("800x500")
+        
+        # Centrer la fenêtre
+        self.center_window()
+        
+        # Créer l'interface
+        self.create_widgets()
+        
+        # Charger les fichiers
+        self.load_files()
+    
+    def center_window(self):
+        """Centrer la fenêtre"""
+        self.root.update_idletasks()
+        width = 800
+        height = 500
+        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.root.winfo_screenheight() // 2) - (height // 2)
+        self.root.geometry(f'{width}x{height}+{x}+{y}')
+    
+    def create_widgets(self):
+        """Créer les widgets"""
+        # En-tête
+        header = tk.Frame(self.root, bg='#17a2b8', height=60)
+        header.pack(fill=tk.X)
+        header.pack_propagate(False)
+        
+        title_label = tk.Label(
+            header,
+            text=f"📄 Fichiers - {self.folder['name']}",
+            font=('Segoe UI', 14, 'bold'),
+            bg='#17a2b8',
+            fg='white'
+        )
+        title_label.pack(side=tk.LEFT, padx=20, pady=15)
+        
+        close_button = tk.Button(
+            header,
+            text="✖️ Fermer",
+            font=('Segoe UI', 10),
+            bg='#dc3545',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.root.destroy
+        )
+        close_button.pack(side=tk.RIGHT, padx=20)
+        
+        # Barre d'outils
+        toolbar = tk.Frame(self.root, bg='#f8f9fa', height=60)
+        toolbar.pack(fill=tk.X, pady=10)
+        
+        # Bouton "Ajouter Fichiers"
+        add_files_btn = tk.Button(
+            toolbar,
+            text="➕ Ajouter Fichiers",
+            font=('Segoe UI', 10, 'bold'),
+            bg='#28a745',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.add_files
+        )
+        add_files_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Bouton "Supprimer"
+        delete_btn = tk.Button(
+            toolbar,
+            text="🗑️ Supprimer",
+            font=('Segoe UI', 10, 'bold'),
+            bg='#dc3545',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.delete_file
+        )
+        delete_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Bouton "Ouvrir"
+        open_btn = tk.Button(
+            toolbar,
+            text="👁️ Ouvrir",
+            font=('Segoe UI', 10, 'bold'),
+            bg='#007bff',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.open_file
+        )
+        open_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Bouton "Rafraîchir"
+        refresh_btn = tk.Button(
+            toolbar,
+            text="🔄 Rafraîchir",
+            font=('Segoe UI', 10),
+            bg='#6c757d',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.load_files
+        )
+        refresh_btn.pack(side=tk.LEFT, padx=10)
+        
+        # Listbox pour afficher les fichiers
+        list_frame = tk.Frame(self.root)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Scrollbar
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        
+        # Listbox
+        self.file_listbox = tk.Listbox(
+            list_frame,
+            font=('Segoe UI', 10),
+            yscrollcommand=scrollbar.set,
+            selectmode=tk.SINGLE
+        )
+        
+        scrollbar.config(command=self.file_listbox.yview)
+        
+        # Pack
+        self.file_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Double-clic pour ouvrir
+        self.file_listbox.bind('<Double-Button-1>', lambda e: self.open_file())
+    
+    def load_files(self):
+        """Charger les fichiers"""
+        self.file_listbox.delete(0, tk.END)
+        
+        files = self.db.get_files_in_folder(self.folder['id'])
+        
+        for file in files:
+            icon = self.file_handler.get_file_icon(file['extension'])
+            size_formatted = self.format_file_size(file['size'])
+            
+            display_text = f"{icon} {file['filename']} ({size_formatted})"
+            self.file_listbox.insert(tk.END, display_text)
+        
+        if not files:
+            self.file_listbox.insert(tk.END, "Aucun fichier dans ce dossier")
+    
+    @staticmethod
+    def format_file_size(size: int) -> str:
+        """Formater la taille d'un fichier"""
+        for unit in ['B', 'KB', 'MB', 'GB']:
+            if size < 1024.0:
+                return f"{size:.2f} {unit}"
+            size /= 1024.0
+        return f"{size:.2f} TB"
+    
+    def add_files(self):
+        """Ajouter des fichiers"""
+        file_paths = filedialog.askopenfilenames(
+            title="Sélectionner des fichiers à ajouter"
+        )
+        
+        if not file_paths:
+            return
+        
+        try:
+            success_count, error_count = self.file_handler.save_files_to_folder(
+                file_paths, self.db, self.folder['id']
+            )
+            
+            if error_count == 0:
+                messagebox.showinfo(
+                    "Succès",
+                    f"✅ {success_count} fichier(s) ajouté(s) avec succès !"
+                )
+            else:
+                messagebox.showwarning(
+                    "Attention",
+                    f"{success_count} fichier(s) ajouté(s), {error_count} erreur(s)"
+                )
+            
+            self.load_files()
+            
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible d'ajouter les fichiers:\n{e}")
+    
+    def delete_file(self):
+        """Supprimer le fichier sélectionné"""
+        selection = self.file_listbox.curselection()
+        if not selection:
+            messagebox.showwarning("Attention", "Veuillez sélectionner un fichier")
+            return
+        
+        index = selection[0]
+        files = self.db.get_files_in_folder(self.folder['id'])
+        
+        if index >= len(files):
+            return
+        
+        file = files[index]
+        
+        # Confirmation
+        response = messagebox.askyesno(
+            "Confirmation",
+            f"Êtes-vous sûr de vouloir supprimer le fichier :\n\n{file['filename']} ?",
+            icon='warning'
+        )
+        
+        if response:
+            try:
+                self.db.delete_file(file['id'])
+                messagebox.showinfo("Succès", "Fichier supprimé avec succès")
+                self.load_files()
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Impossible de supprimer le fichier:\n{e}")
+    
+    def open_file(self):
+        """Ouvrir le fichier sélectionné"""
+        selection = self.file_listbox.curselection()
+        if not selection:
+            messagebox.showwarning("Attention", "Veuillez sélectionner un fichier")
+            return
+        
+        index = selection[0]
+        files = self.db.get_files_in_folder(self.folder['id'])
+        
+        if index >= len(files):
+            return
+        
+        file = files[index]
+        
+        if not os.path.exists(file['filepath']):
+            messagebox.showerror("Erreur", "Le fichier n'existe pas")
+            return
+        
+        success = self.file_handler.open_file(file['filepath'])
+        if not success:
+            messagebox.showerror("Erreur", "Impossible d'ouvrir le fichier")
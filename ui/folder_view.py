@@ -1,324 +1,991 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-from typing import Optional, Callable
-import os
-
-class FolderView(tk.Frame):
-    """Vue pour afficher le contenu d'un dossier"""
-    
-    def __init__(self, parent, db, file_handler, folder_id: Optional[int] = None):
-        super().__init__(parent, bg='#f8f9fa')
-        
-        self.db = db
-        self.file_handler = file_handler
-        self.folder_id = folder_id
-        
-        self.create_widgets()
-        self.load_content()
-    
-    def create_widgets(self):
-        """Créer les widgets"""
-        # En-tête avec fil d'Ariane
-        header_frame = tk.Frame(self, bg='white', relief=tk.SOLID, bd=1)
-        header_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        self.breadcrumb_label = tk.Label(
-            header_frame,
-            text="",
-            font=('Segoe UI', 10),
-            bg='white',
-            fg='#667eea',
-            anchor=tk.W
-        )
-        self.breadcrumb_label.pack(side=tk.LEFT, padx=15, pady=10)
-        
-        # Frame de contenu avec scrollbar
-        content_container = tk.Frame(self, bg='#f8f9fa')
-        content_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
-        
-        # Canvas et scrollbar
-        canvas = tk.Canvas(content_container, bg='#f8f9fa', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(content_container, orient=tk.VERTICAL, command=canvas.yview)
-        
-        self.scrollable_frame = tk.Frame(canvas, bg='#f8f9fa')
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=self.scrollable_frame, anchor=tk.NW)
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Permettre le scroll avec la molette
-        def on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", on_mousewheel)
-    
-    def load_content(self):
-        """Charger le contenu du dossier"""
-        # Nettoyer le contenu précédent
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        # Charger le fil d'Ariane
-        self.load_breadcrumb()
-        
-        # Charger les sous-dossiers
-        subfolders = self.db.get_subfolders(self.folder_id)
-        if subfolders:
-            self.create_section("📁 Sous-dossiers", subfolders, is_folder=True)
-        
-        # Charger les fichiers
-        if self.folder_id is not None:
-            files = self.db.get_files_in_folder(self.folder_id)
-            if files:
-                self.create_section("📄 Fichiers", files, is_folder=False)
-        
-        # Message si vide
-        if not subfolders and (self.folder_id is None or not self.db.get_files_in_folder(self.folder_id)):
-            empty_label = tk.Label(
-                self.scrollable_frame,
-                text="📭 Dossier vide",
-                font=('Segoe UI', 14),
-                bg='#f8f9fa',
-                fg='#6c757d'
-            )
-            empty_label.pack(pady=50)
-    
-    def load_breadcrumb(self):
-        """Charger le fil d'Ariane"""
-        if self.folder_id is None:
-            self.breadcrumb_label.config(text="🏠 Accueil")
-        else:
-            path = self.db.get_folder_path(self.folder_id)
-            breadcrumb_text = "🏠 Accueil"
-            for folder in path:
-                breadcrumb_text += f" > {folder['name']}"
-            self.breadcrumb_label.config(text=breadcrumb_text)
-    
-    def create_section(self, title: str, items: list, is_folder: bool):
-        """Créer une section (dossiers ou fichiers)"""
-        # Titre de section
-        title_label = tk.Label(
-            self.scrollable_frame,
-            text=f"{title} ({len(items)})",
-            font=('Segoe UI', 12, 'bold'),
-            bg='#f8f9fa',
-            fg='#212529'
-        )
-        title_label.pack(anchor=tk.W, padx=10, pady=(10, 5))
-        
-        # Grille d'items
-        grid_frame = tk.Frame(self.scrollable_frame, bg='#f8f9fa')
-        grid_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        # Afficher les items en grille (3 colonnes)
-        for idx, item in enumerate(items):
-            row = idx // 3
-            col = idx % 3
-            
-            if is_folder:
-                card = self.create_folder_card(grid_frame, item)
-            else:
-                card = self.create_file_card(grid_frame, item)
-            
-            card.grid(row=row, column=col, padx=5, pady=5, sticky='nsew')
-        
-        # Configurer les colonnes pour qu'elles s'étendent uniformément
-        for i in range(3):
-            grid_frame.columnconfigure(i, weight=1, uniform='column')
-    
-    def create_folder_card(self, parent, folder: dict) -> tk.Frame:
-        """Créer une carte pour un dossier"""
-        card = tk.Frame(parent, bg='white', relief=tk.RAISED, bd=1, cursor='hand2')
-        card.pack_propagate(False)
-        card.configure(width=200, height=120)
-        
-        # Icône de dossier
-        icon_label = tk.Label(
-            card,
-            text="📁",
-            font=('Arial', 32),
-            bg='white'
-        )
-        icon_label.pack(pady=(15, 5))
-        
-        # Nom du dossier
-        name_label = tk.Label(
-            card,
-            text=folder['name'],
-            font=('Segoe UI', 10, 'bold'),
-            bg='white',
-            fg='#212529',
-            wraplength=180
-        )
-        name_label.pack(pady=5)
-        
-        # Nombre de fichiers
-        file_count = self.db.count_files_in_folder(folder['id'], recursive=True)
-        count_label = tk.Label(
-            card,
-            text=f"{file_count} fichier{'s' if file_count > 1 else ''}",
-            font=('Segoe UI', 9),
-            bg='white',
-            fg='#6c757d'
-        )
-        count_label.pack()
-        
-        # Événement de clic - CORRECTION ICI
-        def on_click(event=None):
-            # Stocker l'ID dans un attribut temporaire
-            self._folder_id = folder['id']
-            # Générer l'événement personnalisé
-            self.event_generate('<<FolderOpen>>')
-        
-        # Lier tous les widgets au clic
-        card.bind('<Button-1>', on_click)
-        icon_label.bind('<Button-1>', on_click)
-        name_label.bind('<Button-1>', on_click)
-        count_label.bind('<Button-1>', on_click)
-        
-        # Effet hover
-        def on_enter(event):
-            card.config(bg='#f8f9fa')
-            icon_label.config(bg='#f8f9fa')
-            name_label.config(bg='#f8f9fa')
-            count_label.config(bg='#f8f9fa')
-        
-        def on_leave(event):
-            card.config(bg='white')
-            icon_label.config(bg='white')
-            name_label.config(bg='white')
-            count_label.config(bg='white')
-        
-        card.bind('<Enter>', on_enter)
-        card.bind('<Leave>', on_leave)
-        icon_label.bind('<Enter>', on_enter)
-        icon_label.bind('<Leave>', on_leave)
-        name_label.bind('<Enter>', on_enter)
-        name_label.bind('<Leave>', on_leave)
-        count_label.bind('<Enter>', on_enter)
-        count_label.bind('<Leave>', on_leave)
-        
-        return card
-    
-    def create_file_card(self, parent, file: dict) -> tk.Frame:
-        """Créer une carte pour un fichier"""
-        card = tk.Frame(parent, bg='white', relief=tk.RAISED, bd=1)
-        card.pack_propagate(False)
-        card.configure(width=200, height=140)
-        
-        # Récupérer l'extension et l'icône
-        extension = file['filename'].rsplit('.', 1)[-1].lower() if '.' in file['filename'] else ''
-        icon = self.file_handler.get_file_icon(extension)
-        
-        # Icône du fichier
-        icon_label = tk.Label(
-            card,
-            text=icon,
-            font=('Arial', 32),
-            bg='white'
-        )
-        icon_label.pack(pady=(10, 5))
-        
-        # Nom du fichier
-        name_label = tk.Label(
-            card,
-            text=file['filename'],
-            font=('Segoe UI', 9, 'bold'),
-            bg='white',
-            fg='#212529',
-            wraplength=180
-        )
-        name_label.pack(pady=5)
-        
-        # Taille du fichier
-        try:
-            size = os.path.getsize(file['filepath']) if os.path.exists(file['filepath']) else 0
-            size_formatted = self.format_file_size(size)
-        except:
-            size_formatted = "N/A"
-        
-        size_label = tk.Label(
-            card,
-            text=size_formatted,
-            font=('Segoe UI', 8),
-            bg='white',
-            fg='#6c757d'
-        )
-        size_label.pack()
-        
-        # Boutons d'action
-        button_frame = tk.Frame(card, bg='white')
-        button_frame.pack(pady=5)
-        
-        # Bouton "Ouvrir"
-        open_btn = tk.Button(
-            button_frame,
-            text="👁️ Voir",
-            font=('Segoe UI', 8),
-            bg='#4facfe',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=lambda: self.open_file(file)
-        )
-        open_btn.pack(side=tk.LEFT, padx=2)
-        
-        # Bouton "Télécharger" (copier vers...)
-        download_btn = tk.Button(
-            button_frame,
-            text="💾",
-            font=('Segoe UI', 8),
-            bg='#11998e',
-            fg='white',
-            relief=tk.FLAT,
-            cursor='hand2',
-            command=lambda: self.save_file_as(file)
-        )
-        download_btn.pack(side=tk.LEFT, padx=2)
-        
-        return card
-    
-    @staticmethod
-    def format_file_size(size: int) -> str:
-        """Formater la taille d'un fichier"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.2f} {unit}"
-            size /= 1024.0
-        return f"{size:.2f} TB"
-    
-    def open_file(self, file: dict):
-        """Ouvrir un fichier"""
-        if not os.path.exists(file['filepath']):
-            messagebox.showerror("Erreur", "Le fichier n'existe pas")
-            return
-        
-        success = self.file_handler.open_file(file['filepath'])
-        if not success:
-            messagebox.showerror("Erreur", "Impossible d'ouvrir le fichier")
-    
-    def save_file_as(self, file: dict):
-        """Enregistrer une copie du fichier"""
-        if not os.path.exists(file['filepath']):
-            messagebox.showerror("Erreur", "Le fichier n'existe pas")
-            return
-        
-        # Demander où enregistrer
-        destination = filedialog.asksaveasfilename(
-            defaultextension=f".{file['filename'].rsplit('.', 1)[-1]}",
-            initialfile=file['filename'],
-            title="Enregistrer sous"
-        )
-        
-        if destination:
-            try:
-                import shutil
-                shutil.copy2(file['filepath'], destination)
-                messagebox.showinfo("Succès", "Fichier enregistré avec succès")
-            except Exception as e:
-                messagebox.showerror("Erreur", f"Impossible d'enregistrer le fichier:\n{e}")
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from collections import OrderedDict
+from typing import Optional, Callable
+import base64
+import bisect
+import datetime
+import os
+import queue
+import re
+import threading
+from database import DEFAULT_FILE_LISTING, FileListing
+from events import (
+    FilesAdded, FilesMeasured, FilesRemoved, FileUpdated, FolderAdded, FolderMoved,
+    FolderRemoved, FolderRenamed,
+)
+
+
+class FolderCard(tk.Frame):
+    """Carte d'un dossier, réutilisable pour n'importe quel dossier (voir show)"""
+    
+    HEIGHT = 120
+    
+    def __init__(self, parent, on_open: Callable[[dict], None]):
+        super().__init__(parent, bg='white', relief=tk.RAISED, bd=1, cursor='hand2')
+        self.pack_propagate(False)
+        self.folder = None
+        
+        # Icône de dossier
+        self.icon_label = tk.Label(
+            self,
+            text="📁",
+            font=('Arial', 32),
+            bg='white'
+        )
+        self.icon_label.pack(pady=(15, 5))
+        
+        # Nom du dossier
+        self.name_label = tk.Label(
+            self,
+            text="",
+            font=('Segoe UI', 10, 'bold'),
+            bg='white',
+            fg='#212529',
+            wraplength=180
+        )
+        self.name_label.pack(pady=5)
+        
+        # Nombre de fichiers et taille totale
+        self.count_label = tk.Label(
+            self,
+            text="",
+            font=('Segoe UI', 9),
+            bg='white',
+            fg='#6c757d'
+        )
+        self.count_label.pack()
+        
+        # Clic et effet hover sur la carte et tous ses labels
+        widgets = (self, self.icon_label, self.name_label, self.count_label)
+        
+        def set_background(color):
+            for widget in widgets:
+                widget.config(bg=color)
+        
+        for widget in widgets:
+            widget.bind('<Button-1>', lambda event: on_open(self.folder))
+            widget.bind('<Enter>', lambda event: set_background('#f8f9fa'))
+            widget.bind('<Leave>', lambda event: set_background('white'))
+    
+    def show(self, folder: dict, stats: dict):
+        """Afficher un dossier dans cette carte"""
+        self.folder = folder
+        self.name_label.config(text=folder['name'])
+        file_count = stats['total_file_count']
+        self.count_label.config(
+            text=f"{file_count} fichier{'s' if file_count > 1 else ''} · "
+                 f"{FolderView.format_file_size(stats['total_bytes'])}"
+        )
+
+
+class PreviewImages:
+    """
+    Miniatures des cartes de fichiers, partagées par toutes les vues
+    
+    Les PNG de ThumbnailCache deviennent des PhotoImage gardées en mémoire
+    (les MAX_IMAGES plus récentes): une carte qui revient en vue au fil du
+    défilement, ou dans une vue gardée, reprend la même image sans relire
+    le disque. Les résultats des processus de rendu sont relevés toutes
+    les POLL_MS millisecondes par le thread de Tk, seul à créer des images.
+    """
+    
+    MAX_IMAGES = 500
+    POLL_MS = 50
+    
+    def __init__(self, root, thumbnails, max_images: int = MAX_IMAGES):
+        self.root = root
+        self.thumbnails = thumbnails
+        self.max_images = max(1, max_images)
+        self.images = OrderedDict()  # {chemin de la miniature: PhotoImage}
+        self.failed = set()          # Fichiers sans miniature (illisibles): pas de nouvel essai
+        self.pending = {}            # {chemin: (Future, [callbacks], nom du fichier)}
+        self.done = queue.Queue()
+        self.polling = False
+    
+    def supports(self, file: dict) -> bool:
+        return self.thumbnails.supports(file)
+    
+    def get(self, file: dict) -> Optional[tk.PhotoImage]:
+        """Miniature déjà en mémoire, sans attendre"""
+        key = self.thumbnails.path(file)
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+        return image
+    
+    def request(self, file: dict, callback: Callable[[tk.PhotoImage], None]) -> Optional[str]:
+        """
+        Demander la miniature d'un fichier; callback(image) est appelé dans
+        le thread de Tk quand elle est prête (jamais si le fichier n'en a pas)
+        
+        Returns:
+            Optional[str]: Clé de la demande pour cancel, None si rien n'est demandé
+        """
+        key = self.thumbnails.path(file)
+        if key in self.failed:
+            return None
+        if key in self.pending:
+            self.pending[key][1].append(callback)
+            return key
+        
+        future = self.thumbnails.request(file)
+        self.pending[key] = (future, [callback], file['filename'])
+        future.add_done_callback(lambda future: self.done.put((key, future)))
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.POLL_MS, self.poll)
+        return key
+    
+    def cancel(self, key: str, callback: Callable[[tk.PhotoImage], None]):
+        """Retirer une demande (carte sortie de la vue); le rendu est annulé s'il n'a pas commencé"""
+        entry = self.pending.get(key)
+        if entry is None:
+            return
+        future, callbacks, _ = entry
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks and future.cancel():
+            del self.pending[key]
+    
+    def poll(self):
+        """Créer les images des miniatures prêtes et prévenir les cartes"""
+        while True:
+            try:
+                key, future = self.done.get_nowait()
+            except queue.Empty:
+                break
+            entry = self.pending.get(key)
+            if entry is None or entry[0] is not future:
+                # Demande annulée (et peut-être refaite depuis)
+                continue
+            del self.pending[key]
+            
+            data = None
+            try:
+                data, _ = future.result()
+            except Exception as e:
+                print(f"⚠️ Miniature impossible ({type(e).__name__}): {entry[2]}")
+            if data is None:
+                self.failed.add(key)
+                continue
+            
+            image = tk.PhotoImage(master=self.root, data=base64.b64encode(data).decode('ascii'))
+            self.images[key] = image
+            while len(self.images) > self.max_images:
+                # Une carte qui affiche encore l'image en garde la référence
+                self.images.popitem(last=False)
+            for callback in entry[1]:
+                callback(image)
+        
+        if self.pending:
+            self.root.after(self.POLL_MS, self.poll)
+        else:
+            self.polling = False
+
+
+class FileCard(tk.Frame):
+    """Carte d'un fichier, réutilisable pour n'importe quel fichier (voir show)"""
+    
+    HEIGHT = 170
+    PREVIEW_HEIGHT = 80   # Zone de l'icône ou de la miniature (voir THUMBNAIL_SIZE)
+    
+    def __init__(self, parent, file_handler, on_open: Callable[[dict], None],
+                 on_save: Callable[[dict], None], previews: Optional[PreviewImages] = None):
+        super().__init__(parent, bg='white', relief=tk.RAISED, bd=1)
+        self.pack_propagate(False)
+        self.file_handler = file_handler
+        self.previews = previews
+        self.file = None
+        self.preview = None       # Miniature affichée (la référence la garde en vie)
+        self.preview_key = None   # Demande de miniature en cours
+        
+        # Icône du fichier, remplacée par sa miniature quand elle est prête
+        preview_frame = tk.Frame(self, bg='white', height=self.PREVIEW_HEIGHT)
+        preview_frame.pack(fill=tk.X, pady=(10, 5))
+        preview_frame.pack_propagate(False)
+        
+        self.icon_label = tk.Label(
+            preview_frame,
+            text="",
+            font=('Arial', 32),
+            bg='white'
+        )
+        self.icon_label.pack(expand=True)
+        
+        # Nom du fichier
+        self.name_label = tk.Label(
+            self,
+            text="",
+            font=('Segoe UI', 9, 'bold'),
+            bg='white',
+            fg='#212529',
+            wraplength=180
+        )
+        self.name_label.pack(pady=5)
+        
+        # Taille du fichier
+        self.size_label = tk.Label(
+            self,
+            text="",
+            font=('Segoe UI', 8),
+            bg='white',
+            fg='#6c757d'
+        )
+        self.size_label.pack()
+        
+        # Boutons d'action
+        button_frame = tk.Frame(self, bg='white')
+        button_frame.pack(pady=5)
+        
+        # Bouton "Ouvrir"
+        open_btn = tk.Button(
+            button_frame,
+            text="👁️ Voir",
+            font=('Segoe UI', 8),
+            bg='#4facfe',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=lambda: on_open(self.file)
+        )
+        open_btn.pack(side=tk.LEFT, padx=2)
+        
+        # Bouton "Télécharger" (copier vers...)
+        download_btn = tk.Button(
+            button_frame,
+            text="💾",
+            font=('Segoe UI', 8),
+            bg='#11998e',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=lambda: on_save(self.file)
+        )
+        download_btn.pack(side=tk.LEFT, padx=2)
+    
+    def show(self, file: dict):
+        """Afficher un fichier dans cette carte"""
+        self.cancel_preview()
+        self.file = file
+        # Icône selon l'extension et taille enregistrées en base: aucun accès disque
+        self.preview = None
+        self.icon_label.config(image='', text=self.file_handler.get_file_icon(file['extension']))
+        self.name_label.config(text=file['filename'])
+        self.size_label.config(text=FolderView.format_file_size(file['size']))
+        self.request_preview()
+    
+    def request_preview(self):
+        """Afficher la miniature du fichier, ou la demander si elle n'est pas en mémoire"""
+        if self.previews is None or self.preview is not None or self.preview_key is not None:
+            return
+        if not self.previews.supports(self.file):
+            return
+        image = self.previews.get(self.file)
+        if image is not None:
+            self.set_preview(image)
+        else:
+            self.preview_key = self.previews.request(self.file, self.set_preview)
+    
+    def cancel_preview(self):
+        """Abandonner la miniature demandée (carte masquée ou réutilisée)"""
+        if self.preview_key is not None:
+            self.previews.cancel(self.preview_key, self.set_preview)
+            self.preview_key = None
+    
+    def set_preview(self, image: tk.PhotoImage):
+        self.preview_key = None
+        self.preview = image
+        self.icon_label.config(image=image, text='')
+
+
+class FolderView(tk.Frame):
+    """
+    Vue pour afficher le contenu d'un dossier
+    
+    La grille est virtualisée: le contenu est découpé en lignes de hauteur
+    fixe (titres de section, lignes de COLUMNS cartes) et seules les lignes
+    visibles, plus OVERSCAN pixels de part et d'autre, ont des widgets. Les
+    cartes qui sortent de la vue sont masquées et réutilisées pour celles
+    qui entrent: le nombre de widgets et le temps d'ouverture ne dépendent
+    pas du nombre de fichiers du dossier.
+    
+    Les cartes des images et des PDF affichent une miniature (previews,
+    partagées entre les vues), demandée seulement pour les cartes en vue.
+    
+    Le contenu est lu par pages de PAGE_SIZE éléments (sous-dossiers, puis
+    fichiers), la suivante quand le défilement approche de la fin de ce qui
+    est chargé: un dossier énorme ne lit que ce qui est parcouru.
+    
+    Une vue masquée (suspend) peut être gardée pour y revenir: elle note
+    les modifications de la base et ne les applique qu'une fois réaffichée
+    (resume), à la même position de défilement.
+    """
+    
+    # Intervalle de lecture de la progression d'une copie (ms)
+    COPY_POLL_MS = 100
+    
+    COLUMNS = 3
+    CARD_PADDING = 5      # Marge autour de chaque carte
+    GRID_MARGIN = 10      # Marge à gauche et à droite de la grille
+    TITLE_HEIGHT = 40
+    OVERSCAN = 300        # Pixels rendus au-delà de la zone visible
+    PAGE_SIZE = 300       # Éléments lus par page (multiple de COLUMNS)
+    
+    # Tri et filtres des fichiers proposés dans l'en-tête (voir FileListing)
+    SORT_OPTIONS = {"Date": 'date', "Nom": 'name', "Taille": 'size', "Type": 'type'}
+    TYPE_FILTERS = {
+        "Tous types": (),
+        "PDF": ('pdf',),
+        "Word": ('doc', 'docx', 'odt', 'rtf'),
+        "Excel": ('xls', 'xlsx', 'ods', 'csv'),
+        "PowerPoint": ('ppt', 'pptx', 'odp'),
+        "Images": ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'tif', 'tiff'),
+    }
+    DATE_FILTERS = {  # Jours
+        "Toutes dates": None,
+        "7 derniers jours": 7,
+        "30 derniers jours": 30,
+        "12 derniers mois": 365,
+    }
+    SIZE_FILTERS = {  # (min, max) en octets
+        "Toutes tailles": (None, None),
+        "< 1 Mo": (None, 1024 ** 2),
+        "1 à 10 Mo": (1024 ** 2, 10 * 1024 ** 2),
+        "10 à 100 Mo": (10 * 1024 ** 2, 100 * 1024 ** 2),
+        "> 100 Mo": (100 * 1024 ** 2, None),
+    }
+    
+    # Au-delà, une vue masquée oublie les modifications et se recharge à l'affichage
+    MAX_PENDING_EVENTS = 500
+    
+    def __init__(self, parent, db, file_handler, folder_id: Optional[int] = None,
+                 previews: Optional[PreviewImages] = None):
+        super().__init__(parent, bg='#f8f9fa')
+        
+        self.db = db
+        self.file_handler = file_handler
+        self.folder_id = folder_id
+        self.previews = previews
+        
+        self.subfolders = []
+        self.files = []
+        self.subfolders_complete = False
+        self.files_complete = False
+        self.subfolder_total = 0
+        self.file_total = 0
+        self.loading_page = False
+        self.listing = DEFAULT_FILE_LISTING
+        self.pending_events = []
+        self.suspended = False
+        self.stale = False
+        
+        # Lignes de la grille: (y, hauteur, type, contenu)
+        self.rows = []
+        self.row_offsets = []
+        self.folder_stats = {}
+        
+        # Widgets affichés, par cellule (ligne, colonne), et widgets libres par type
+        self.visible = {}
+        self.pools = {'title': [], 'folder': [], 'file': []}
+        self.window_ids = {}
+        
+        self.create_widgets()
+        self.load_content()
+        
+        # Mises à jour incrémentales à chaque modification de la base
+        unsubscribe = self.db.events.subscribe(self.on_db_event)
+        self.bind('<Destroy>', lambda e: unsubscribe() if e.widget is self else None)
+    
+    def create_widgets(self):
+        """Créer les widgets"""
+        # En-tête avec fil d'Ariane
+        header_frame = tk.Frame(self, bg='white', relief=tk.SOLID, bd=1)
+        header_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.breadcrumb_label = tk.Label(
+            header_frame,
+            text="",
+            font=('Segoe UI', 10),
+            bg='white',
+            fg='#667eea',
+            anchor=tk.W
+        )
+        self.breadcrumb_label.pack(side=tk.LEFT, padx=15, pady=10)
+        
+        # Tri et filtres des fichiers (pas de fichiers à l'accueil)
+        if self.folder_id is not None:
+            self.create_listing_controls(header_frame)
+        
+        # Frame de contenu avec scrollbar
+        content_container = tk.Frame(self, bg='#f8f9fa')
+        content_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        # Canvas et scrollbar: les cartes sont placées directement sur le canvas
+        canvas = tk.Canvas(content_container, bg='#f8f9fa', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(content_container, orient=tk.VERTICAL, command=canvas.yview)
+        self.canvas = canvas
+        
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            self.render_visible()
+        
+        canvas.configure(yscrollcommand=on_scroll)
+        canvas.bind('<Configure>', lambda e: self.update_layout())
+        
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.empty_label = tk.Label(
+            canvas,
+            text="📭 Dossier vide",
+            font=('Segoe UI', 14),
+            bg='#f8f9fa',
+            fg='#6c757d'
+        )
+        
+        # Permettre le scroll avec la molette
+        self.bind_mousewheel()
+    
+    def bind_mousewheel(self):
+        """Diriger la molette vers cette vue (liaison globale, une seule vue à la fois)"""
+        def on_mousewheel(event):
+            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        self.canvas.bind_all("<MouseWheel>", on_mousewheel)
+    
+    def create_listing_controls(self, header_frame):
+        """Contrôles de tri et de filtre des fichiers, à droite de l'en-tête"""
+        controls = tk.Frame(header_frame, bg='white')
+        controls.pack(side=tk.RIGHT, padx=10)
+        
+        def combobox(label, values, width, readonly=True):
+            tk.Label(controls, text=label, font=('Segoe UI', 9), bg='white',
+                     fg='#6c757d').pack(side=tk.LEFT, padx=(8, 2))
+            variable = tk.StringVar(value=values[0])
+            box = ttk.Combobox(controls, textvariable=variable, values=values, width=width,
+                               state='readonly' if readonly else 'normal')
+            box.pack(side=tk.LEFT)
+            box.bind('<<ComboboxSelected>>', lambda e: self.apply_listing())
+            return variable, box
+        
+        self.sort_var, _ = combobox("Trier:", list(self.SORT_OPTIONS), 7)
+        self.descending = True
+        self.direction_button = tk.Button(
+            controls,
+            text="⬇️",
+            font=('Segoe UI', 8),
+            bg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.toggle_direction
+        )
+        self.direction_button.pack(side=tk.LEFT, padx=2)
+        
+        # Type: un groupe prédéfini, ou des extensions saisies ("pdf, xlsx" + Entrée)
+        self.type_var, type_box = combobox("Type:", list(self.TYPE_FILTERS), 11, readonly=False)
+        type_box.bind('<Return>', lambda e: self.apply_listing())
+        self.date_var, _ = combobox("Date:", list(self.DATE_FILTERS), 15)
+        self.size_var, _ = combobox("Taille:", list(self.SIZE_FILTERS), 11)
+    
+    def toggle_direction(self):
+        """Inverser l'ordre du tri"""
+        self.descending = not self.descending
+        self.direction_button.config(text="⬇️" if self.descending else "⬆️")
+        self.apply_listing()
+    
+    def current_listing(self) -> FileListing:
+        """Tri et filtres choisis dans l'en-tête"""
+        type_text = self.type_var.get().strip()
+        if type_text in self.TYPE_FILTERS:
+            extensions = self.TYPE_FILTERS[type_text]
+        else:
+            extensions = tuple(ext.lower() for ext in re.findall(r'\w+', type_text))
+        
+        days = self.DATE_FILTERS.get(self.date_var.get())
+        uploaded_from = None
+        if days is not None:
+            uploaded_from = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+        min_size, max_size = self.SIZE_FILTERS.get(self.size_var.get(), (None, None))
+        
+        return FileListing(
+            sort=self.SORT_OPTIONS.get(self.sort_var.get(), 'date'),
+            descending=self.descending,
+            extensions=extensions,
+            uploaded_from=uploaded_from,
+            min_size=min_size,
+            max_size=max_size,
+        )
+    
+    def apply_listing(self):
+        """
+        Appliquer le tri et les filtres choisis: seule la liste des fichiers
+        est relue (première page), la grille et ses cartes sont conservées
+        """
+        listing = self.current_listing()
+        if listing == self.listing:
+            return
+        self.listing = listing
+        self.files = []
+        self.files_complete = False
+        self.reload_files()
+        self.build_rows()
+        self.update_layout()
+    
+    def load_content(self):
+        """Charger le contenu du dossier"""
+        self.folder_stats = {}
+        
+        # Charger le fil d'Ariane
+        self.load_breadcrumb()
+        
+        self.subfolders, self.files = [], []
+        self.subfolders_complete = False
+        self.files_complete = self.folder_id is None  # Aucun fichier à l'accueil
+        self.count_content()
+        while len(self.subfolders) + len(self.files) < self.PAGE_SIZE and self.load_next_page():
+            pass
+        
+        self.build_rows()
+        self.canvas.yview_moveto(0)
+        self.update_layout()
+    
+    def reload(self):
+        """Relire tout le contenu en gardant la position de défilement"""
+        first = self.canvas.yview()[0]
+        self.pending_events = []
+        self.stale = False
+        self.load_content()
+        self.canvas.yview_moveto(first)
+    
+    def suspend(self):
+        """Vue masquée: les modifications sont seulement notées"""
+        self.suspended = True
+        for kind, widget in self.visible.values():
+            if kind == 'file':
+                widget.cancel_preview()
+    
+    def resume(self):
+        """Vue réaffichée: appliquer les modifications reçues entre-temps"""
+        self.suspended = False
+        self.bind_mousewheel()
+        if self.stale:
+            self.reload()
+        elif self.pending_events:
+            self.apply_pending_events()
+        for kind, widget in self.visible.values():
+            if kind == 'file':
+                widget.request_preview()
+    
+    def count_content(self):
+        """Nombre total de sous-dossiers et de fichiers (titres des sections)"""
+        if self.folder_id is None:
+            self.subfolder_total, self.file_total = self.db.count_subfolders(None), 0
+        else:
+            stats = self.db.get_folder_stats(self.folder_id)
+            self.subfolder_total, self.file_total = stats['subfolder_count'], stats['file_count']
+    
+    def load_next_page(self) -> bool:
+        """
+        Lire la page suivante: sous-dossiers d'abord, puis fichiers
+        
+        Returns:
+            bool: False s'il n'y avait plus rien à lire
+        """
+        if not self.subfolders_complete:
+            page = self.db.get_subfolders_page(
+                self.folder_id, self.subfolders[-1] if self.subfolders else None, self.PAGE_SIZE
+            )
+            self.subfolders.extend(page)
+            self.subfolders_complete = len(page) < self.PAGE_SIZE
+            return True
+        if not self.files_complete:
+            page = self.db.get_files_page(
+                self.folder_id, self.files[-1] if self.files else None, self.PAGE_SIZE,
+                self.listing
+            )
+            self.files.extend(page)
+            self.files_complete = len(page) < self.PAGE_SIZE
+            return True
+        return False
+    
+    def reload_files(self):
+        """Relire les fichiers déjà chargés (au moins une page), après une modification"""
+        if not self.subfolders_complete or self.folder_id is None:
+            return
+        limit = max(len(self.files), self.PAGE_SIZE)
+        self.files = self.db.get_files_page(self.folder_id, None, limit, self.listing)
+        self.files_complete = len(self.files) < limit
+    
+    def load_more_rows(self):
+        """Défilement arrivé en fin de contenu chargé: ajouter une page"""
+        self.loading_page = False
+        if self.suspended or not self.winfo_exists():
+            return
+        if self.load_next_page():
+            self.build_rows()
+            self.update_layout()
+    
+    def build_rows(self):
+        """Découper le contenu en lignes de hauteur fixe"""
+        self.canvas.delete('empty')
+        rows = []
+        for title, items, total, kind, card_height in (
+            ("📁 Sous-dossiers", self.subfolders, self.subfolder_total, 'folder', FolderCard.HEIGHT),
+            ("📄 Fichiers", self.files, self.file_total, 'file', FileCard.HEIGHT),
+        ):
+            if not items:
+                continue
+            if kind == 'file' and self.listing.filtered:
+                # Filtré: seul le nombre de fichiers déjà lus est connu
+                count = f"{len(items)}{'' if self.files_complete else '+'}"
+            else:
+                count = max(total, len(items))
+            rows.append((self.TITLE_HEIGHT, 'title', f"{title} ({count})"))
+            for start in range(0, len(items), self.COLUMNS):
+                rows.append((card_height + 2 * self.CARD_PADDING, kind,
+                             items[start:start + self.COLUMNS]))
+        
+        self.rows = []
+        self.row_offsets = []
+        y = self.CARD_PADDING
+        for height, kind, content in rows:
+            self.rows.append((y, height, kind, content))
+            self.row_offsets.append(y)
+            y += height
+        self.content_height = y + self.CARD_PADDING
+        
+        # Message si vide
+        if not self.rows:
+            self.empty_label.config(
+                text="🔍 Aucun fichier ne correspond aux filtres" if self.listing.filtered
+                else "📭 Dossier vide"
+            )
+            self.canvas.create_window(0, 50, window=self.empty_label, anchor=tk.N, tags='empty')
+    
+    def load_breadcrumb(self):
+        """Charger le fil d'Ariane"""
+        if self.folder_id is None:
+            self.breadcrumb_label.config(text="🏠 Accueil")
+        else:
+            path = self.db.get_folder_path(self.folder_id)
+            breadcrumb_text = "🏠 Accueil"
+            for folder in path:
+                breadcrumb_text += f" > {folder['name']}"
+            self.breadcrumb_label.config(text=breadcrumb_text)
+    
+    # ==================== GRILLE VIRTUALISÉE ====================
+    
+    def update_layout(self):
+        """Recalculer la zone de défilement et replacer les cartes (largeur modifiée)"""
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, self.content_height))
+        self.canvas.coords('empty', width / 2, 50)
+        for key in list(self.visible):
+            self.release(key)
+        self.render_visible()
+    
+    def render_visible(self):
+        """Afficher les lignes visibles (plus la marge), masquer les autres"""
+        if not self.rows:
+            return
+        top = self.canvas.canvasy(0) - self.OVERSCAN
+        bottom = self.canvas.canvasy(self.canvas.winfo_height()) + self.OVERSCAN
+        first = max(bisect.bisect_right(self.row_offsets, top) - 1, 0)
+        last = bisect.bisect_right(self.row_offsets, bottom)
+        
+        wanted = set()
+        for index in range(first, last):
+            _, _, kind, content = self.rows[index]
+            if kind == 'title':
+                wanted.add((index, 0))
+            else:
+                wanted.update((index, column) for column in range(len(content)))
+        
+        for key in list(self.visible):
+            if key not in wanted:
+                self.release(key)
+        
+        self.load_folder_stats(first, last)
+        for key in sorted(wanted - self.visible.keys()):
+            self.place(key)
+        
+        # Fin du contenu chargé en vue: lire la page suivante
+        complete = self.subfolders_complete and self.files_complete
+        if last >= len(self.rows) and not complete and not self.loading_page:
+            self.loading_page = True
+            self.after_idle(self.load_more_rows)
+    
+    def load_folder_stats(self, first: int, last: int):
+        """Agrégats des dossiers des lignes à afficher, en une requête"""
+        missing = [
+            folder['id']
+            for _, _, kind, content in self.rows[first:last] if kind == 'folder'
+            for folder in content if folder['id'] not in self.folder_stats
+        ]
+        if missing:
+            self.folder_stats.update(self.db.get_folder_stats_bulk(missing))
+    
+    def column_width(self) -> float:
+        width = self.canvas.winfo_width() - 2 * self.GRID_MARGIN
+        return max(width / self.COLUMNS, 120)
+    
+    def place(self, key):
+        """Afficher la cellule `key` avec un widget libre (ou nouveau)"""
+        index, column = key
+        y, height, kind, content = self.rows[index]
+        widget = self.acquire(kind)
+        window_id = self.window_ids[widget]
+        
+        if kind == 'title':
+            widget.config(text=content)
+            self.canvas.coords(window_id, self.GRID_MARGIN, y + 10)
+        else:
+            item = content[column]
+            if kind == 'folder':
+                widget.show(item, self.folder_stats.get(item['id']) or self.db.get_folder_stats(item['id']))
+            else:
+                widget.show(item)
+            column_width = self.column_width()
+            self.canvas.coords(
+                window_id,
+                self.GRID_MARGIN + column * column_width + self.CARD_PADDING,
+                y + self.CARD_PADDING
+            )
+            self.canvas.itemconfigure(
+                window_id,
+                width=column_width - 2 * self.CARD_PADDING,
+                height=height - 2 * self.CARD_PADDING
+            )
+        self.canvas.itemconfigure(window_id, state=tk.NORMAL)
+        self.visible[key] = (kind, widget)
+    
+    def release(self, key):
+        """Masquer une cellule et rendre son widget au pool"""
+        kind, widget = self.visible.pop(key)
+        self.canvas.itemconfigure(self.window_ids[widget], state=tk.HIDDEN)
+        if kind == 'file':
+            # Miniature demandée seulement pour les cartes en vue
+            widget.cancel_preview()
+        self.pools[kind].append(widget)
+    
+    def acquire(self, kind: str) -> tk.Widget:
+        """Widget libre du type demandé, créé s'il n'y en a plus"""
+        pool = self.pools[kind]
+        if pool:
+            return pool.pop()
+        
+        if kind == 'title':
+            widget = tk.Label(
+                self.canvas,
+                font=('Segoe UI', 12, 'bold'),
+                bg='#f8f9fa',
+                fg='#212529'
+            )
+        elif kind == 'folder':
+            widget = FolderCard(self.canvas, self.open_folder)
+        else:
+            widget = FileCard(self.canvas, self.file_handler, self.open_file, self.save_file_as,
+                              self.previews)
+        self.window_ids[widget] = self.canvas.create_window(0, 0, window=widget, anchor=tk.NW)
+        return widget
+    
+    # ==================== MISES À JOUR INCRÉMENTALES ====================
+    
+    def on_db_event(self, event):
+        """Noter une modification de la base; les modifications sont appliquées ensemble"""
+        if self.stale:
+            return
+        if self.suspended:
+            if len(self.pending_events) >= self.MAX_PENDING_EVENTS:
+                self.pending_events = []
+                self.stale = True
+                return
+        elif not self.pending_events:
+            self.after_idle(self.apply_pending_events)
+        self.pending_events.append(event)
+    
+    def apply_pending_events(self):
+        """
+        Appliquer les modifications reçues au contenu affiché
+        
+        Seules les listes concernées changent (sous-dossiers ajoutés, renommés,
+        déplacés ou supprimés; fichiers du dossier affiché). La position de
+        défilement est conservée et seules les cartes visibles sont réaffichées.
+        """
+        if self.suspended or not self.winfo_exists():
+            return
+        events, self.pending_events = self.pending_events, []
+        
+        changed = False
+        for event in events:
+            if isinstance(event, FolderAdded):
+                if event.parent_id == self.folder_id:
+                    changed |= self.add_subfolder(event.folder_id)
+            elif isinstance(event, FolderRenamed):
+                for folder in self.subfolders:
+                    if folder['id'] == event.folder_id:
+                        # Replacé à son rang, ou laissé à une page pas encore lue
+                        self.remove_subfolder(folder['id'])
+                        folder['name'] = event.name
+                        self.insert_subfolder(folder)
+                        changed = True
+                        break
+            elif isinstance(event, FolderMoved):
+                if event.old_parent_id == self.folder_id:
+                    changed |= self.remove_subfolder(event.folder_id)
+                if event.new_parent_id == self.folder_id:
+                    changed |= self.add_subfolder(event.folder_id)
+            elif isinstance(event, FolderRemoved):
+                if event.parent_id == self.folder_id:
+                    changed |= self.remove_subfolder(event.folder_id)
+            elif isinstance(event, (FilesAdded, FilesRemoved, FilesMeasured)):
+                if self.folder_id in event.folder_ids:
+                    self.reload_files()
+                    changed = True
+            elif isinstance(event, FileUpdated):
+                if event.folder_id == self.folder_id:
+                    self.reload_files()
+                    changed = True
+        
+        # Le dossier affiché ou un ancêtre a pu être renommé, déplacé ou supprimé
+        if self.folder_id is not None and any(
+                isinstance(event, (FolderRenamed, FolderMoved, FolderRemoved)) for event in events):
+            if self.db.get_folder(self.folder_id) is None:
+                self.subfolders, self.files = [], []
+                self.subfolders_complete = self.files_complete = True
+                changed = True
+            self.load_breadcrumb()
+        
+        # Les agrégats des sous-dossiers ont pu changer: relus pour les cartes visibles
+        self.folder_stats = {}
+        if changed:
+            self.count_content()
+            self.build_rows()
+        self.update_layout()
+    
+    def add_subfolder(self, folder_id: int) -> bool:
+        if any(folder['id'] == folder_id for folder in self.subfolders):
+            return False
+        folder = self.db.get_folder(folder_id)
+        if folder is None:
+            return False
+        self.insert_subfolder(folder)
+        return True
+    
+    def insert_subfolder(self, folder: dict):
+        """Insérer à son rang (nom, id), sauf s'il tombe après la dernière page lue"""
+        key = (folder['name'], folder['id'])
+        keys = [(f['name'], f['id']) for f in self.subfolders]
+        if not self.subfolders_complete and (not keys or key > keys[-1]):
+            return
+        self.subfolders.insert(bisect.bisect_right(keys, key), folder)
+    
+    def remove_subfolder(self, folder_id: int) -> bool:
+        count = len(self.subfolders)
+        self.subfolders = [folder for folder in self.subfolders if folder['id'] != folder_id]
+        return len(self.subfolders) != count
+    
+    def open_folder(self, folder: dict):
+        """Ouvrir un sous-dossier (événement <<FolderOpen>> pour la fenêtre principale)"""
+        # Stocker l'ID dans un attribut temporaire
+        self._folder_id = folder['id']
+        # Générer l'événement personnalisé
+        self.event_generate('<<FolderOpen>>')
+    
+    @staticmethod
+    def format_file_size(size: int) -> str:
+        """Formater la taille d'un fichier"""
+        for unit in ['B', 'KB', 'MB', 'GB']:
+            if size < 1024.0:
+                return f"{size:.2f} {unit}"
+            size /= 1024.0
+        return f"{size:.2f} TB"
+    
+    def open_file(self, file: dict):
+        """Ouvrir un fichier"""
+        if not os.path.exists(file['filepath']):
+            messagebox.showerror("Erreur", "Le fichier n'existe pas")
+            return
+        
+        success = self.file_handler.open_file(file['filepath'])
+        if not success:
+            messagebox.showerror("Erreur", "Impossible d'ouvrir le fichier")
+    
+    def save_file_as(self, file: dict):
+        """Enregistrer une copie du fichier"""
+        if not os.path.exists(file['filepath']):
+            messagebox.showerror("Erreur", "Le fichier n'existe pas")
+            return
+        
+        # Demander où enregistrer
+        destination = filedialog.asksaveasfilename(
+            defaultextension=f".{file['filename'].rsplit('.', 1)[-1]}",
+            initialfile=file['filename'],
+            title="Enregistrer sous"
+        )
+        
+        if destination:
+            self.copy_file_with_progress(file, destination)
+    
+    def copy_file_with_progress(self, file: dict, destination: str):
+        """Copier un fichier en arrière-plan avec une fenêtre de progression"""
+        progress_window = tk.Toplevel(self)
+        progress_window.title("Enregistrement...")
+        progress_window.geometry("420x130")
+        progress_window.transient(self.winfo_toplevel())
+        progress_window.resizable(False, False)
+        
+        tk.Label(
+            progress_window,
+            text=f"💾 {file['filename']}",
+            font=('Segoe UI', 10, 'bold'),
+            wraplength=380
+        ).pack(pady=(15, 5))
+        
+        progress_bar = ttk.Progressbar(progress_window, mode='determinate', length=380, maximum=1)
+        progress_bar.pack(pady=5)
+        
+        progress_label = tk.Label(progress_window, text="", font=('Segoe UI', 9), fg='#6c757d')
+        progress_label.pack()
+        
+        # Le thread de copie communique avec l'interface par cette file
+        events = queue.Queue()
+        
+        def progress(copied, total):
+            events.put(('progress', (copied, total)))
+        
+        def worker():
+            try:
+                events.put(('done', self.file_handler.copy_file(file['filepath'], destination, progress)))
+            except Exception as e:
+                events.put(('error', e))
+        
+        def poll():
+            finished = None
+            try:
+                while True:
+                    kind, payload = events.get_nowait()
+                    if kind == 'progress':
+                        copied, total = payload
+                        progress_bar.config(value=copied / total if total else 1)
+                        progress_label.config(
+                            text=f"{self.format_file_size(copied)} / {self.format_file_size(total)}"
+                        )
+                    else:
+                        finished = (kind, payload)
+            except queue.Empty:
+                pass
+            
+            if finished is None:
+                self.after(self.COPY_POLL_MS, poll)
+                return
+            
+            progress_window.destroy()
+            kind, payload = finished
+            if kind == 'error':
+                messagebox.showerror("Erreur", f"Impossible d'enregistrer le fichier:\n{payload}")
+            else:
+                messagebox.showinfo("Succès", "Fichier enregistré avec succès")
+        
+        threading.Thread(target=worker, name='save-file-as', daemon=True).start()
+        self.after(self.COPY_POLL_MS, poll)
@@ -0,0 +1,146 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Callable
+import os
+import time
+
+
+class SearchView(tk.Frame):
+    """
+    Résultats de la recherche (Database.search), page par page
+    
+    Avec "Contenu des documents", la recherche porte sur le texte extrait
+    des fichiers (Database.search_content), avec un extrait autour des mots.
+    
+    Double-clic: un dossier est ouvert dans la fenêtre principale
+    (on_open_folder), un fichier avec l'application du système.
+    """
+    
+    PAGE_SIZE = 100
+    
+    def __init__(self, parent, db, file_handler, on_open_folder: Callable[[int], None]):
+        super().__init__(parent, bg='#f8f9fa')
+        
+        self.db = db
+        self.file_handler = file_handler
+        self.on_open_folder = on_open_folder
+        
+        self.text = ''
+        self.results = {}  # {item de l'arbre: résultat}
+        self.loaded = 0
+        self.content_var = tk.BooleanVar(value=False)
+        
+        self.create_widgets()
+    
+    def create_widgets(self):
+        """Créer les widgets"""
+        header_frame = tk.Frame(self, bg='white', relief=tk.SOLID, bd=1)
+        header_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.title_label = tk.Label(
+            header_frame,
+            text="",
+            font=('Segoe UI', 10),
+            bg='white',
+            fg='#667eea',
+            anchor=tk.W
+        )
+        self.title_label.pack(side=tk.LEFT, padx=15, pady=10)
+        
+        tk.Checkbutton(
+            header_frame,
+            text="Contenu des documents",
+            variable=self.content_var,
+            font=('Segoe UI', 9),
+            bg='white',
+            command=lambda: self.search(self.text)
+        ).pack(side=tk.RIGHT, padx=15)
+        
+        self.more_button = tk.Button(
+            header_frame,
+            text="⬇️ Plus de résultats",
+            font=('Segoe UI', 9),
+            bg='#495057',
+            fg='white',
+            relief=tk.FLAT,
+            cursor='hand2',
+            command=self.load_more
+        )
+        
+        tree_frame = tk.Frame(self, bg='#f8f9fa')
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        self.tree = ttk.Treeview(tree_frame, columns=('path', 'snippet'), selectmode='browse')
+        self.tree.heading('#0', text="Nom", anchor=tk.W)
+        self.tree.heading('path', text="Emplacement", anchor=tk.W)
+        self.tree.heading('snippet', text="Extrait", anchor=tk.W)
+        self.tree.column('#0', width=400)
+        self.tree.column('path', width=600)
+        self.tree.column('snippet', width=500)
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.tree.bind('<Double-1>', self.on_double_click)
+        self.tree.bind('<Return>', self.on_double_click)
+    
+    def search(self, text: str):
+        """Afficher la première page de résultats pour `text`"""
+        self.text = text
+        self.results = {}
+        self.loaded = 0
+        self.tree.delete(*self.tree.get_children())
+        self.tree.configure(
+            displaycolumns=('path', 'snippet') if self.content_var.get() else ('path',)
+        )
+        self.load_more()
+    
+    def load_more(self):
+        """Ajouter la page de résultats suivante"""
+        started = time.perf_counter()
+        # Un résultat de plus que la page: indique s'il en reste
+        search = self.db.search_content if self.content_var.get() else self.db.search
+        results = search(self.text, limit=self.PAGE_SIZE + 1, offset=self.loaded)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        has_more = len(results) > self.PAGE_SIZE
+        for result in results[:self.PAGE_SIZE]:
+            icon = "📁" if result['kind'] == 'folder' else "📄"
+            item = self.tree.insert(
+                '', tk.END,
+                text=f"{icon} {result['name']}",
+                values=(result['path'] or "🏠 Accueil",
+                        result.get('snippet', '').replace('\n', ' '))
+            )
+            self.results[item] = result
+        self.loaded += min(len(results), self.PAGE_SIZE)
+        
+        if self.loaded == 0:
+            title = f"🔍 Aucun résultat pour « {self.text} »"
+        else:
+            plus = "+" if has_more else ""
+            title = f"🔍 {self.loaded}{plus} résultat(s) pour « {self.text} » ({elapsed_ms:.0f} ms)"
+        self.title_label.config(text=title)
+        
+        if has_more:
+            self.more_button.pack(side=tk.RIGHT, padx=15, pady=5)
+        else:
+            self.more_button.pack_forget()
+    
+    def on_double_click(self, event):
+        """Ouvrir le résultat sélectionné"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        result = self.results[selection[0]]
+        if result['kind'] == 'folder':
+            self.on_open_folder(result['id'])
+            return
+        
+        if not os.path.exists(result['filepath']):
+            messagebox.showerror("Erreur", "Le fichier n'existe pas")
+            return
+        if not self.file_handler.open_file(result['filepath']):
+            messagebox.showerror("Erreur", "Impossible d'ouvrir le fichier")
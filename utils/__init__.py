@@ -1,7 +1,7 @@
-"""
-Package Utils pour l'application Portail Document
-"""
-
-from .file_handler import FileHandler
-
+"""
+Package Utils pour l'application Portail Document
+"""
+
+from .file_handler import FileHandler
+
 __all__ = ['FileHandler']
\ No newline at end of file
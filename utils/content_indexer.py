@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from database import Database
+from .text_extractor import extract_text, is_supported
+
+
+class ContentIndexer:
+    """
+    Indexation en arrière-plan du contenu des documents (content_index)
+    
+    Les triggers de la table files remplissent content_queue à chaque ajout
+    ou remplacement de fichier, quel que soit le chemin (FileHandler,
+    import de dossier, synchronisation): la file survit donc à un arrêt de
+    l'application et l'indexation reprend où elle en était.
+    
+    Ce thread prend la file par lots, sur sa propre connexion SQLite, et
+    confie l'extraction du texte à un pool de processus (analyse XML et
+    PDF coûteuse en CPU: hors du processus de l'interface, elle ne la
+    ralentit pas). Le texte d'un contenu déjà indexé (même objet du
+    stockage par contenu) est repris sans nouvelle extraction.
+    """
+    
+    DEFAULT_BATCH_SIZE = 20
+    DEFAULT_PAUSE = 0.05        # Secondes entre deux lots: laisse la main aux écritures de l'UI
+    IDLE_INTERVAL = 30.0        # Secondes entre deux vérifications de la file vide
+    MAX_ATTEMPTS = 3            # Essais d'extraction avant d'abandonner un fichier
+    EXTRACTION_TIMEOUT = 120.0  # Secondes accordées à un document
+    
+    def __init__(self, db_path: str, profile, workers: Optional[int] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, pause: float = DEFAULT_PAUSE):
+        self.db_path = db_path
+        self.profile = profile
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.batch_size = max(1, batch_size)
+        self.pause = pause
+        self.indexed = 0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def start(self):
+        """Démarrer l'indexation (sans effet si elle est déjà en cours)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='content-indexer', daemon=True)
+        self._thread.start()
+    
+    def notify(self):
+        """Signaler de nouveaux fichiers en file d'attente (appelable de n'importe quel thread)"""
+        self._wake.set()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Demander l'arrêt après le lot en cours"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def _run(self):
+        # Connexion propre au thread (une connexion SQLite par thread)
+        db = Database(self.db_path, profile=self.profile)
+        try:
+            pending = db.count_pending_content(self.MAX_ATTEMPTS)
+            if pending:
+                print(f"🔎 Indexation du contenu: {pending} fichier(s) en attente")
+            while not self._stop.is_set():
+                self._wake.clear()
+                batch = db.claim_content_batch(self.batch_size, self.MAX_ATTEMPTS)
+                if not batch:
+                    self._wake.wait(self.IDLE_INTERVAL)
+                    continue
+                self.indexed += db.store_content(self._extract_batch(db, batch))
+                self._stop.wait(self.pause)
+            if self.indexed:
+                print(f"✅ Contenu indexé pour {self.indexed} fichier(s)")
+        except Exception as e:
+            print(f"⚠️ Indexation du contenu interrompue: {e}")
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            db.close()
+    
+    def _extract_batch(self, db: Database, batch):
+        """
+        Texte des fichiers d'un lot
+        
+        Returns:
+            List[Tuple[Dict, Optional[str]]]: Éléments traités. Un document
+            illisible ou absent est traité sans texte; ceux dont l'extraction
+            a fait tomber un processus ou dépassé le délai restent en file
+            d'attente (nouvel essai)
+        """
+        results = []
+        futures = []
+        for item in batch:
+            if item['twin_id'] is not None:
+                results.append((item, db.get_content_text(item['twin_id'])))
+            elif not is_supported(item['extension']):
+                results.append((item, None))
+            else:
+                futures.append((item, self._executor().submit(
+                    extract_text, item['filepath'], item['extension'])))
+        
+        for item, future in futures:
+            try:
+                results.append((item, future.result(timeout=self.EXTRACTION_TIMEOUT)))
+            except BrokenProcessPool:
+                # Un document a fait tomber un processus: nouveau pool au prochain lot
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = None
+                print(f"⚠️ Extraction interrompue: {item['filepath']}")
+            except TimeoutError:
+                print(f"⚠️ Extraction trop longue: {item['filepath']}")
+            except FileNotFoundError:
+                results.append((item, None))
+            except Exception as e:
+                print(f"⚠️ Contenu illisible ({type(e).__name__}): {item['filepath']}")
+                results.append((item, None))
+        return results
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: pas de fork d'un processus qui fait tourner Tk et des threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
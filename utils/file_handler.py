@@ -1,212 +1,372 @@
-import os
-import shutil
-from typing import Optional, Tuple
-from pathlib import Path
-
-class FileHandler:
-    """Gestionnaire de fichiers avec import récursif corrigé"""
-    
-    def __init__(self, upload_dir: str = "uploads"):
-        self.upload_dir = upload_dir
-        self.create_upload_directory()
-    
-    def create_upload_directory(self):
-        """Créer le répertoire d'upload s'il n'existe pas"""
-        if not os.path.exists(self.upload_dir):
-            os.makedirs(self.upload_dir, exist_ok=True)
-            print(f"✅ Répertoire {self.upload_dir} créé")
-    
-    def save_file(self, source_path: str, filename: str) -> Tuple[bool, str]:
-        """
-        Copier un fichier dans le répertoire d'upload
-        
-        Returns:
-            Tuple[bool, str]: (succès, chemin_destination)
-        """
-        try:
-            # Générer un nom de fichier unique
-            import time
-            timestamp = int(time.time() * 1000)  # Millisecondes pour plus d'unicité
-            safe_filename = self.sanitize_filename(filename)
-            unique_filename = f"{timestamp}_{safe_filename}"
-            
-            destination = os.path.join(self.upload_dir, unique_filename)
-            
-            # Copier le fichier
-            shutil.copy2(source_path, destination)
-            print(f"✅ Fichier copié: {source_path} -> {destination}")
-            
-            return True, destination
-        except Exception as e:
-            print(f"❌ Erreur lors de la copie du fichier {source_path}: {e}")
-            return False, ""
-    
-    def save_files_from_folder(self, folder_path: str, db, parent_folder_id: Optional[int] = None) -> int:
-        """
-        ✅ CORRECTION MAJEURE: Importer récursivement TOUS les fichiers d'un dossier
-        
-        Cette fonction importe maintenant:
-        - TOUS les fichiers (.docx, .pdf, .xlsx, .txt, images, etc.)
-        - Toute l'arborescence de sous-dossiers
-        - Conserve la structure exacte du dossier source
-        
-        Args:
-            folder_path: Chemin du dossier source à importer
-            db: Instance de la base de données
-            parent_folder_id: ID du dossier parent dans la DB (None pour racine)
-        
-        Returns:
-            int: Nombre de fichiers importés
-        """
-        count = 0
-        folder_name = os.path.basename(folder_path)
-        
-        print(f"\n📂 IMPORTATION: {folder_name}")
-        print(f"   📍 Source: {folder_path}")
-        print(f"   🔗 Parent ID: {parent_folder_id}")
-        
-        # Créer le dossier dans la base de données
-        try:
-            folder_id = db.create_folder(folder_name, parent_folder_id)
-            print(f"   ✅ Dossier DB créé (ID: {folder_id})")
-        except Exception as e:
-            print(f"   ❌ Erreur création dossier DB: {e}")
-            return 0
-        
-        try:
-            # Lister TOUS les éléments du dossier
-            items = os.listdir(folder_path)
-            print(f"   📋 {len(items)} élément(s) trouvé(s)")
-            
-            for item in items:
-                item_path = os.path.join(folder_path, item)
-                
-                # CAS 1: C'est un FICHIER
-                if os.path.isfile(item_path):
-                    print(f"      📄 Fichier: {item}")
-                    
-                    # ✅ CORRECTION: On importe TOUS les fichiers, pas de filtre
-                    # Copier le fichier dans uploads/
-                    success, dest_path = self.save_file(item_path, item)
-                    
-                    if success:
-                        # Ajouter à la base de données
-                        try:
-                            file_id = db.add_file(folder_id, item, dest_path)
-                            count += 1
-                            print(f"         ✅ Ajouté à la DB (ID: {file_id})")
-                        except Exception as db_error:
-                            print(f"         ❌ Erreur DB: {db_error}")
-                    else:
-                        print(f"         ❌ Échec de la copie")
-                
-                # CAS 2: C'est un SOUS-DOSSIER
-                elif os.path.isdir(item_path):
-                    print(f"      📁 Sous-dossier: {item}")
-                    
-                    # ✅ APPEL RÉCURSIF pour traiter le sous-dossier
-                    subfolder_count = self.save_files_from_folder(item_path, db, folder_id)
-                    count += subfolder_count
-                    print(f"      ✅ {subfolder_count} fichier(s) depuis '{item}'")
-        
-        except Exception as e:
-            print(f"   ❌ ERREUR lors de l'importation: {e}")
-            import traceback
-            traceback.print_exc()
-        
-        print(f"📂 FIN '{folder_name}': {count} fichier(s) importé(s)\n")
-        return count
-    
-    @staticmethod
-    def sanitize_filename(filename: str) -> str:
-        """Nettoyer un nom de fichier pour éviter les caractères problématiques"""
-        import re
-        # Remplacer les caractères non autorisés par des underscores
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        # Limiter la longueur à 200 caractères
-        if len(filename) > 200:
-            name, ext = os.path.splitext(filename)
-            filename = name[:200-len(ext)] + ext
-        return filename
-    
-    @staticmethod
-    def open_file(filepath: str) -> bool:
-        """Ouvrir un fichier avec l'application par défaut du système"""
-        try:
-            import platform
-            import subprocess
-            
-            if not os.path.exists(filepath):
-                print(f"❌ Le fichier n'existe pas: {filepath}")
-                return False
-            
-            system = platform.system()
-            
-            if system == 'Windows':
-                os.startfile(filepath)
-            elif system == 'Darwin':  # macOS
-                subprocess.call(['open', filepath])
-            else:  # Linux et autres Unix
-                subprocess.call(['xdg-open', filepath])
-            
-            print(f"✅ Fichier ouvert: {filepath}")
-            return True
-        except Exception as e:
-            print(f"❌ Erreur lors de l'ouverture du fichier: {e}")
-            return False
-    
-    @staticmethod
-    def get_file_icon(extension: str) -> str:
-        """
-        Récupérer l'emoji icône correspondant à l'extension du fichier
-        
-        Args:
-            extension: Extension du fichier (sans le point)
-        
-        Returns:
-            str: Emoji représentant le type de fichier
-        """
-        # Dictionnaire des icônes par extension
-        icons = {
-            # Documents
-            'pdf': '📄',
-            'doc': '📝', 'docx': '📝', 'odt': '📝',
-            'txt': '📃', 'rtf': '📃',
-            
-            # Tableurs
-            'xls': '📊', 'xlsx': '📊', 'ods': '📊', 'csv': '📊',
-            
-            # Présentations
-            'ppt': '📽️', 'pptx': '📽️', 'odp': '📽️',
-            
-            # Images
-            'jpg': '🖼️', 'jpeg': '🖼️', 'png': '🖼️', 
-            'gif': '🖼️', 'bmp': '🖼️', 'svg': '🖼️',
-            'ico': '🖼️', 'webp': '🖼️',
-            
-            # Archives
-            'zip': '🗜️', 'rar': '🗜️', '7z': '🗜️',
-            'tar': '🗜️', 'gz': '🗜️', 'bz2': '🗜️',
-            
-            # Audio
-            'mp3': '🎵', 'wav': '🎵', 'ogg': '🎵',
-            'flac': '🎵', 'aac': '🎵', 'm4a': '🎵',
-            
-            # Vidéo
-            'mp4': '🎬', 'avi': '🎬', 'mov': '🎬',
-            'mkv': '🎬', 'flv': '🎬', 'wmv': '🎬',
-            'webm': '🎬',
-            
-            # Code
-            'py': '🐍', 'js': '💛', 'html': '🌐',
-            'css': '🎨', 'java': '☕', 'cpp': '⚙️',
-            'c': '⚙️', 'php': '🐘', 'rb': '💎',
-            'go': '🔷', 'rs': '🦀', 'ts': '🔷',
-            
-            # Autres
-            'json': '📋', 'xml': '📋', 'yaml': '📋',
-            'md': '📝', 'log': '📋',
-        }
-        
-        # Retourner l'icône correspondante ou une icône par défaut
-        return icons.get(extension.lower(), '📄')
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from pathlib import Path
+from database import FILE_RESERVATIONS, guess_file_type
+from .import_pipeline import ImportPipeline
+from .copy_engine import CopyEngine, CopyStats, ProgressCallback
+from .storage import DEFAULT_LAYOUT, DEFAULT_STORAGE, LAYOUTS, STORAGE_BACKENDS, StoredFile
+
+class FileHandler:
+    """Gestionnaire de fichiers avec import récursif corrigé"""
+    
+    def __init__(self, upload_dir: str = "uploads", storage: str = DEFAULT_STORAGE,
+                 layout: str = DEFAULT_LAYOUT):
+        """
+        Args:
+            upload_dir: Répertoire de stockage des fichiers importés
+            storage: 'cas' (par contenu, dédupliqué) ou 'flat' (copie horodatée)
+            layout: 'hex' (sous-dossiers hexadécimaux) ou 'flat' (un seul dossier).
+                    Les fichiers déjà stockés se déplacent avec utils/relayout.py.
+        """
+        self.upload_dir = upload_dir
+        self.create_upload_directory()
+        self.copy_engine = CopyEngine()
+        self.storage = STORAGE_BACKENDS[storage](upload_dir, LAYOUTS[layout](), self.copy_engine)
+    
+    def create_upload_directory(self):
+        """Créer le répertoire d'upload s'il n'existe pas"""
+        if not os.path.exists(self.upload_dir):
+            os.makedirs(self.upload_dir, exist_ok=True)
+            print(f"✅ Répertoire {self.upload_dir} créé")
+    
+    def store_file(self, source_path: str, filename: str) -> Optional[StoredFile]:
+        """
+        Enregistrer un fichier dans le répertoire d'upload
+        
+        Returns:
+            Optional[StoredFile]: Chemin, hachage et indicateur de création,
+            None en cas d'erreur
+        """
+        try:
+            stored = self.storage.store(source_path, self.sanitize_filename(filename))
+            if stored.created:
+                print(f"✅ Fichier copié: {source_path} -> {stored.filepath}")
+            else:
+                print(f"♻️ Contenu déjà présent: {source_path} -> {stored.filepath}")
+            return stored
+        except Exception as e:
+            print(f"❌ Erreur lors de la copie du fichier {source_path}: {e}")
+            return None
+    
+    def save_file(self, source_path: str, filename: str) -> Tuple[bool, str]:
+        """
+        Copier un fichier dans le répertoire d'upload
+        
+        La ligne qui référence la copie est à insérer aussitôt: le chemin
+        n'est pas gardé réservé (voir FileReservations).
+        
+        Returns:
+            Tuple[bool, str]: (succès, chemin_destination)
+        """
+        stored = self.store_file(source_path, filename)
+        if not stored:
+            return False, ""
+        FILE_RESERVATIONS.release([stored.filepath])
+        return True, stored.filepath
+    
+    def copy_file(self, source_path: str, destination: str,
+                  progress: Optional[ProgressCallback] = None) -> CopyStats:
+        """
+        Copier un fichier hors de uploads/ (ex: "Enregistrer sous")
+        
+        Args:
+            progress: Appelé avec (octets copiés, taille totale)
+        
+        Returns:
+            CopyStats: Octets copiés, méthode utilisée et débit
+        """
+        stats = self.copy_engine.copy(source_path, destination, progress)
+        print(f"✅ Fichier copié ({stats.method}, "
+              f"{stats.bytes_per_second / (1024 * 1024):.1f} Mo/s): {source_path} -> {destination}")
+        return stats
+    
+    @staticmethod
+    def file_metadata(filename: str, filepath: str,
+                      stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """
+        Métadonnées d'un fichier importé, relevées une seule fois à l'import
+        
+        Args:
+            filename: Nom d'origine (extension et type MIME)
+            filepath: Copie dans uploads/
+            stat: Résultat de stat() déjà connu (ex: DirEntry.stat() de la
+                  source, dont copy2 conserve taille et date de modification)
+        
+        Returns:
+            Dict: {size, mtime, mime_type, extension}
+        """
+        if stat is None:
+            stat = os.stat(filepath)
+        extension, mime_type = guess_file_type(filename)
+        return {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'mime_type': mime_type,
+            'extension': extension,
+        }
+    
+    def save_files_to_folder(self, file_paths, db, folder_id: int) -> Tuple[int, int]:
+        """
+        Importer une liste de fichiers dans un dossier, en une seule transaction
+        
+        Si l'écriture en base échoue, la transaction est annulée et les copies
+        déjà faites dans uploads/ sont supprimées avant de relever l'erreur.
+        
+        Returns:
+            Tuple[int, int]: (fichiers importés, erreurs de copie)
+        """
+        rows = []
+        created = []
+        reserved = []
+        error_count = 0
+        
+        for file_path in file_paths:
+            filename = os.path.basename(file_path)
+            stored = self.store_file(file_path, filename)
+            
+            if stored:
+                rows.append({
+                    'folder_id': folder_id,
+                    'filename': filename,
+                    'filepath': stored.filepath,
+                    'content_hash': stored.content_hash,
+                    **self.file_metadata(filename, stored.filepath, os.stat(file_path)),
+                })
+                reserved.append(stored.filepath)
+                if stored.created:
+                    created.append(stored.filepath)
+            else:
+                error_count += 1
+        
+        try:
+            with db.batch():
+                db.add_files_bulk(rows)
+        except Exception:
+            FILE_RESERVATIONS.release(reserved)
+            self.remove_copies(created, db)
+            raise
+        # Lignes validées: elles protègent désormais les objets
+        FILE_RESERVATIONS.release(reserved)
+        
+        return len(rows), error_count
+    
+    def save_files_from_folder(self, folder_path: str, db, parent_folder_id: Optional[int] = None,
+                               sync: bool = False, **pipeline_options) -> int:
+        """
+        ✅ CORRECTION MAJEURE: Importer récursivement TOUS les fichiers d'un dossier
+        
+        Cette fonction importe maintenant:
+        - TOUS les fichiers (.docx, .pdf, .xlsx, .txt, images, etc.)
+        - Toute l'arborescence de sous-dossiers
+        - Conserve la structure exacte du dossier source
+        
+        Le parcours, la copie (en parallèle) et l'écriture en base sont
+        enchaînés par ImportPipeline, qui valide l'import par étapes
+        (checkpoint, au plus toutes les CHECKPOINT_INTERVAL secondes). En cas
+        d'erreur, seules les copies non validées sont supprimées: un nouvel
+        import dont rien n'a encore été validé est retiré de la base, sinon
+        les dossiers et fichiers validés restent en base et l'import est
+        inscrit au journal comme interrompu. Au démarrage suivant,
+        ImportJournal propose de le reprendre (resume) ou de l'annuler
+        (rollback).
+        
+        Avec sync=True, si le parent contient déjà un dossier de ce nom, il est
+        synchronisé: seuls les fichiers nouveaux ou modifiés sont copiés et ce
+        qui a disparu de la source est supprimé.
+        
+        Args:
+            folder_path: Chemin du dossier source à importer
+            db: Instance de la base de données
+            parent_folder_id: ID du dossier parent dans la DB (None pour racine)
+            sync: Synchroniser le dossier existant de même nom
+            **pipeline_options: copy_workers, batch_size, max_pending... (voir ImportPipeline)
+        
+        Returns:
+            int: Nombre de fichiers importés
+        """
+        pipeline = ImportPipeline(self, db, **pipeline_options)
+        existing = None
+        if sync:
+            existing = db.find_folder(os.path.basename(os.path.normpath(folder_path)), parent_folder_id)
+        
+        print(f"\n📂 {'SYNCHRONISATION' if existing else 'IMPORTATION'}: {folder_path}")
+        try:
+            stats = pipeline.run(folder_path, parent_folder_id, existing['id'] if existing else None)
+        except Exception as e:
+            job = db.get_import_job(pipeline.stats.job_id) if pipeline.stats.job_id else None
+            if job is None or job['status'] == 'rolled_back':
+                print(f"❌ Importation annulée, aucune modification conservée: {e}")
+            else:
+                print(f"❌ Importation interrompue: {job['completed_files']} fichier(s) "
+                      f"conservé(s), reprise possible au prochain démarrage: {e}")
+            raise
+        
+        print(f"📂 FIN: {stats.files} fichier(s) dont {stats.deduplicated} déjà stocké(s), "
+              f"{stats.folders} dossier(s), {stats.errors} erreur(s) en {stats.elapsed:.1f} s "
+              f"({stats.files_per_second:.1f} fichiers/s)")
+        if existing:
+            print(f"🔄 {stats.updated} modifié(s), {stats.unchanged} inchangé(s), "
+                  f"{stats.deleted} supprimé(s)")
+        print()
+        return stats.files
+    
+    WALK_BATCH_SIZE = 1000
+    
+    @staticmethod
+    def walk_tree(root: str, batch_size: int = WALK_BATCH_SIZE,
+                  on_error: Optional[Callable[[str, OSError], None]] = None
+                  ) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+        """
+        Parcourir une arborescence sans récursion, avec os.scandir
+        
+        Produit des lots (dossier_relatif, entrées) où dossier_relatif vaut ''
+        pour la racine. Un dossier est toujours produit comme entrée de son
+        parent avant ses propres lots. Les entrées sont des os.DirEntry: leur
+        type et leur stat() sont mis en cache, aucun appel système n'est répété.
+        
+        La mémoire reste bornée: une pile de chemins relatifs et au plus
+        `batch_size` entrées par lot, même pour un dossier très volumineux.
+        Les liens symboliques vers des dossiers ne sont pas suivis (boucles).
+        
+        Args:
+            root: Dossier à parcourir
+            batch_size: Nombre maximal d'entrées par lot
+            on_error: Appelé avec (chemin, erreur) pour un dossier illisible,
+                      qui est alors ignoré
+        """
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            path = os.path.join(root, rel_dir) if rel_dir else root
+            batch = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(os.path.join(rel_dir, entry.name))
+                        elif not entry.is_file():
+                            continue
+                        batch.append(entry)
+                        if len(batch) >= batch_size:
+                            yield rel_dir, batch
+                            batch = []
+            except OSError as e:
+                if on_error is None:
+                    raise
+                on_error(path, e)
+            if batch:
+                yield rel_dir, batch
+    
+    @staticmethod
+    def remove_copies(filepaths, db=None):
+        """
+        Supprimer des copies faites dans uploads/ (annulation d'un import)
+        
+        Avec `db`, les objets encore référencés par la table files (contenu
+        partagé avec un autre import) sont conservés. Les objets réservés par
+        un enregistrement en cours (FILE_RESERVATIONS) le sont toujours.
+        """
+        with FILE_RESERVATIONS.lock:
+            filepaths = list(filepaths)
+            if db is not None:
+                filepaths = db.unreferenced_filepaths(filepaths)
+            for filepath in FILE_RESERVATIONS.unreserved(filepaths):
+                try:
+                    if os.path.exists(filepath):
+                        os.remove(filepath)
+                except OSError as e:
+                    print(f"⚠️ Impossible de supprimer la copie {filepath}: {e}")
+    
+    @staticmethod
+    def sanitize_filename(filename: str) -> str:
+        """Nettoyer un nom de fichier pour éviter les caractères problématiques"""
+        import re
+        # Remplacer les caractères non autorisés par des underscores
+        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        # Limiter la longueur à 200 caractères
+        if len(filename) > 200:
+            name, ext = os.path.splitext(filename)
+            filename = name[:200-len(ext)] + ext
+        return filename
+    
+    @staticmethod
+    def open_file(filepath: str) -> bool:
+        """Ouvrir un fichier avec l'application par défaut du système"""
+        try:
+            import platform
+            import subprocess
+            
+            if not os.path.exists(filepath):
+                print(f"❌ Le fichier n'existe pas: {filepath}")
+                return False
+            
+            system = platform.system()
+            
+            if system == 'Windows':
+                os.startfile(filepath)
+            elif system == 'Darwin':  # macOS
+                subprocess.call(['open', filepath])
+            else:  # Linux et autres Unix
+                subprocess.call(['xdg-open', filepath])
+            
+            print(f"✅ Fichier ouvert: {filepath}")
+            return True
+        except Exception as e:
+            print(f"❌ Erreur lors de l'ouverture du fichier: {e}")
+            return False
+    
+    @staticmethod
+    def get_file_icon(extension: str) -> str:
+        """
+        Récupérer l'emoji icône correspondant à l'extension du fichier
+        
+        Args:
+            extension: Extension du fichier (sans le point)
+        
+        Returns:
+            str: Emoji représentant le type de fichier
+        """
+        # Dictionnaire des icônes par extension
+        icons = {
+            # Documents
+            'pdf': '📄',
+            'doc': '📝', 'docx': '📝', 'odt': '📝',
+            'txt': '📃', 'rtf': '📃',
+            
+            # Tableurs
+            'xls': '📊', 'xlsx': '📊', 'ods': '📊', 'csv': '📊',
+            
+            # Présentations
+            'ppt': '📽️', 'pptx': '📽️', 'odp': '📽️',
+            
+            # Images
+            'jpg': '🖼️', 'jpeg': '🖼️', 'png': '🖼️', 
+            'gif': '🖼️', 'bmp': '🖼️', 'svg': '🖼️',
+            'ico': '🖼️', 'webp': '🖼️',
+            
+            # Archives
+            'zip': '🗜️', 'rar': '🗜️', '7z': '🗜️',
+            'tar': '🗜️', 'gz': '🗜️', 'bz2': '🗜️',
+            
+            # Audio
+            'mp3': '🎵', 'wav': '🎵', 'ogg': '🎵',
+            'flac': '🎵', 'aac': '🎵', 'm4a': '🎵',
+            
+            # Vidéo
+            'mp4': '🎬', 'avi': '🎬', 'mov': '🎬',
+            'mkv': '🎬', 'flv': '🎬', 'wmv': '🎬',
+            'webm': '🎬',
+            
+            # Code
+            'py': '🐍', 'js': '💛', 'html': '🌐',
+            'css': '🎨', 'java': '☕', 'cpp': '⚙️',
+            'c': '⚙️', 'php': '🐘', 'rb': '💎',
+            'go': '🔷', 'rs': '🦀', 'ts': '🔷',
+            
+            # Autres
+            'json': '📋', 'xml': '📋', 'yaml': '📋',
+            'md': '📝', 'log': '📋',
+        }
+        
+        # Retourner l'icône correspondante ou une icône par défaut
+        return icons.get(extension.lower(), '📄')
@@ -0,0 +1,109 @@
+import os
+import shutil
+from typing import Any, Dict, List
+
+from database import Database
+from .import_pipeline import ImportPipeline, ImportStats
+
+
+class ImportJournal:
+    """
+    Reprise ou annulation des imports interrompus (table import_jobs)
+    
+    Un import est validé par étapes (voir ImportPipeline): après un arrêt
+    brutal, son entrée du journal est restée 'running' ('failed' après une
+    erreur), la base contient
+    l'arborescence et les fichiers validés jusqu'au dernier checkpoint, et
+    uploads/ peut contenir des copies faites depuis, que rien ne référence.
+    
+    - resume(): relance l'import en synchronisation sur le dossier déjà
+      créé; les fichiers validés sont reconnus (taille, date) et ne sont
+      pas recopiés.
+    - rollback(): retire l'arborescence d'un nouvel import (une
+      synchronisation interrompue est simplement close: ses fichiers
+      validés sont des versions complètes).
+    - sweep(): supprime les copies orphelines laissées par l'arrêt.
+    """
+    
+    def __init__(self, db: Database, file_handler):
+        self.db = db
+        self.file_handler = file_handler
+    
+    def interrupted_jobs(self) -> List[Dict[str, Any]]:
+        """Imports interrompus, en attente d'une reprise ou d'une annulation"""
+        return self.db.get_interrupted_import_jobs()
+    
+    @staticmethod
+    def describe(job: Dict[str, Any]) -> str:
+        """Résumé lisible d'une entrée du journal"""
+        action = "Synchronisation" if job['mode'] == 'sync' else "Import"
+        return (f"{action} de {job['source_path']}: {job['completed_files']} / "
+                f"{job['planned_files']} fichier(s) enregistré(s)")
+    
+    def can_resume(self, job: Dict[str, Any]) -> bool:
+        """La source et le dossier de destination existent encore"""
+        return (os.path.isdir(job['source_path'])
+                and job['root_folder_id'] is not None
+                and self.db.get_folder(job['root_folder_id']) is not None)
+    
+    def resume(self, job: Dict[str, Any], **pipeline_options) -> ImportStats:
+        """
+        Reprendre un import interrompu là où il s'est arrêté
+        
+        Args:
+            pipeline_options: Transmis à ImportPipeline (progress, cancel_event...)
+        """
+        pipeline = ImportPipeline(self.file_handler, self.db, **pipeline_options)
+        return pipeline.run(job['source_path'], sync_folder_id=job['root_folder_id'],
+                            job_id=job['id'])
+    
+    def rollback(self, job: Dict[str, Any]) -> bool:
+        """Annuler un import interrompu"""
+        if job['mode'] == 'import' and job['root_folder_id'] is not None:
+            folder = self.db.get_folder(job['root_folder_id'])
+            if folder is not None and not self.db.delete_folder(folder['id']):
+                return False
+        self.db.update_import_job(job['id'], status='rolled_back')
+        return True
+    
+    def sweep(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Supprimer les copies orphelines laissées par des imports interrompus
+        
+        Sont concernés les fichiers temporaires du stockage par contenu et
+        les fichiers de uploads/ créés depuis le début du plus ancien de ces
+        imports qu'aucune ligne de la table files ne référence. À n'appeler
+        qu'en l'absence d'import en cours (démarrage de l'application).
+        
+        Returns:
+            int: Nombre de fichiers supprimés
+        """
+        if not jobs:
+            return 0
+        since = min(job['started_at'] for job in jobs)
+        upload_dir = self.file_handler.upload_dir
+        tmp_dir = getattr(self.file_handler.storage, 'tmp_dir', None)
+        removed = 0
+        
+        if tmp_dir and os.path.isdir(tmp_dir):
+            for entry in os.scandir(tmp_dir):
+                removed += entry.is_file(follow_symlinks=False)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir, exist_ok=True)
+        
+        candidates = []
+        for rel_dir, entries in self.file_handler.walk_tree(upload_dir):
+            for entry in entries:
+                try:
+                    # st_ctime: création (Windows) ou dernier lien / copie des métadonnées
+                    if entry.is_file(follow_symlinks=False) and entry.stat().st_ctime >= since:
+                        candidates.append(os.path.join(upload_dir, rel_dir, entry.name))
+                except OSError:
+                    continue
+        
+        orphans = self.db.unreferenced_filepaths(candidates)
+        self.file_handler.remove_copies(orphans)
+        removed += len(orphans)
+        if removed:
+            print(f"🧹 {removed} copie(s) orpheline(s) supprimée(s) de {upload_dir}")
+        return removed
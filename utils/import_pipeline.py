@@ -0,0 +1,478 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+from database import FILE_RESERVATIONS
+from .storage import content_hash
+
+
+@dataclass
+class ImportStats:
+    """Compteurs d'un import en cours ou terminé"""
+    files: int = 0
+    planned: int = 0          # Fichiers trouvés par le parcours
+    bytes: int = 0
+    folders: int = 0
+    errors: int = 0
+    deduplicated: int = 0     # Fichiers dont le contenu était déjà stocké
+    unchanged: int = 0        # Synchronisation: fichiers identiques, non copiés
+    updated: int = 0          # Synchronisation: fichiers modifiés (compris dans files)
+    deleted: int = 0          # Synchronisation: fichiers et dossiers disparus de la source
+    cancelled: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    root_folder_id: Optional[int] = None
+    job_id: Optional[int] = None
+    
+    @property
+    def elapsed(self) -> float:
+        """Durée écoulée en secondes"""
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return max(end - self.started_at, 1e-6)
+    
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed
+    
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed
+
+
+class ImportPipeline:
+    """
+    Import d'une arborescence en trois étages reliés par des files d'attente
+    
+    1. Parcours: un thread suit FileHandler.walk_tree (os.scandir, sans
+       récursion) et distribue les entrées au fil de l'eau.
+    2. Copie: un pool de `copy_workers` threads copie les fichiers dans uploads/.
+       Le nombre de copies en attente est borné par `max_pending`.
+    3. Écriture: le thread qui appelle run() est l'unique écrivain SQLite.
+       Il crée les dossiers et insère les fichiers par lots de `batch_size`.
+    
+    Chaque dossier est annoncé à l'écrivain avant que ses fichiers ne soient
+    copiés: l'écrivain connaît donc toujours l'ID du dossier de destination.
+    
+    En mode synchronisation (run(..., sync_folder_id=...)), l'arborescence
+    est comparée à un dossier déjà importé: seuls les fichiers nouveaux ou
+    modifiés (taille ou date différente) sont copiés, et ce qui a disparu
+    de la source est supprimé. Avec verify_hash=True, un fichier de même
+    taille et même date est encore relu et comparé au hachage de la version
+    importée (stockage par contenu): une réécriture qui a conservé la date
+    (cp -p, rsync --times, archive restaurée) est alors recopiée. C'est
+    désactivé par défaut: relire toute la source coûte autant que la
+    copier, et la comparaison taille + date est celle de rsync.
+    
+    Chaque import est inscrit au journal (table import_jobs) et validé par
+    étapes (checkpoint): après un arrêt brutal, les fichiers déjà enregistrés
+    restent en base et l'import peut être repris au démarrage suivant sans
+    recopier ces fichiers (voir utils.import_journal).
+    """
+    
+    # Écart toléré entre deux dates de modification (secondes)
+    MTIME_TOLERANCE = 0.001
+    
+    DEFAULT_COPY_WORKERS = min(8, (os.cpu_count() or 2) * 2)
+    DEFAULT_BATCH_SIZE = 500
+    # Secondes au plus entre deux validations. L'écrivain garde la transaction
+    # d'écriture ouverte jusque-là: ce délai doit rester bien en deçà du
+    # busy_timeout des autres connexions (5 s), sans quoi une écriture de
+    # l'interface pendant l'import échoue ("database is locked")
+    CHECKPOINT_INTERVAL = 0.5
+    
+    def __init__(self, file_handler, db,
+                 copy_workers: int = DEFAULT_COPY_WORKERS,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_pending: Optional[int] = None,
+                 progress: Optional[Callable[[ImportStats], None]] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 verify_hash: bool = False):
+        self.file_handler = file_handler
+        self.db = db
+        self.copy_workers = max(1, copy_workers)
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max_pending or self.copy_workers * 4
+        self.progress = progress
+        self.progress_interval = 0.25
+        self.verify_hash = verify_hash
+        
+        self.stats = ImportStats()
+        self._results = queue.Queue(maxsize=self.max_pending * 2)
+        self._pending = threading.BoundedSemaphore(self.max_pending)
+        self._stop = threading.Event()
+        self._cancel = cancel_event or threading.Event()
+        self._copied: List[str] = []
+        self._reserved: List[str] = []   # Chemins stockés, réservés jusqu'à leur validation
+        self._scan_finished = False
+        
+        # Synchronisation: état du dossier existant, par chemin relatif
+        self._sync = False
+        self._existing_folders: Dict[str, int] = {}
+        self._existing_files: Dict[str, dict] = {}
+        self._seen_folders: Set[str] = set()
+        self._seen_files: Set[str] = set()
+        self._existing_rows = None
+        self._job_mode = None
+        self._created_root = False   # Dossier racine créé par cet appel de run()
+        self._checkpointed = False   # Des fichiers ont été validés par un checkpoint
+        self._committed_files = 0    # Fichiers validés (ou inchangés) au dernier checkpoint
+    
+    def cancel(self):
+        """
+        Demander l'arrêt de l'import (appelable depuis n'importe quel thread,
+        équivalent à cancel_event.set())
+        
+        Le parcours s'arrête et les copies non commencées sont abandonnées;
+        les copies en cours se terminent et sont enregistrées. L'import est
+        ensuite validé tel quel: la base ne contient que des fichiers complets.
+        """
+        self._cancel.set()
+    
+    def _stopping(self) -> bool:
+        return self._stop.is_set() or self._cancel.is_set()
+    
+    # ==================== ÉTAGE 1: PARCOURS ====================
+    
+    def _scan(self, folder_path: str):
+        """Parcourir l'arborescence, annoncer les dossiers et soumettre les copies"""
+        # Clé de dossier = chemin relatif à la racine ('' pour la racine)
+        def on_error(path, error):
+            print(f"   ❌ Dossier illisible, ignoré: {error}")
+            self._results.put(('error', path, error))
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.copy_workers,
+                                    thread_name_prefix='import-copy') as executor:
+                for rel_dir, entries in self.file_handler.walk_tree(folder_path, on_error=on_error):
+                    for entry in entries:
+                        if self._stopping():
+                            return
+                        key = os.path.join(rel_dir, entry.name)
+                        if entry.is_dir(follow_symlinks=False):
+                            self._seen_folders.add(key)
+                            self._results.put(('folder', key, rel_dir, entry.name))
+                        else:
+                            self.stats.planned += 1
+                            self._submit_copy(executor, entry, rel_dir)
+        except Exception as e:
+            self._results.put(('error', folder_path, e))
+        finally:
+            self._results.put(('done',))
+    
+    def _submit_copy(self, executor: ThreadPoolExecutor, entry: os.DirEntry, folder_key: str):
+        """Soumettre la copie d'un fichier au pool (bloque si trop de copies en attente)"""
+        try:
+            # Taille et date lues sur l'entrée (stat mis en cache par os.scandir)
+            stat = entry.stat()
+        except OSError as e:
+            self._results.put(('error', entry.path, e))
+            return
+        
+        if self._sync:
+            key = os.path.join(folder_key, entry.name)
+            self._seen_files.add(key)
+            existing = self._existing_files.get(key)
+            if existing is not None and self._unchanged(existing, stat):
+                if self.verify_hash and existing['content_hash']:
+                    # Contenu relu par le pool de copie, recopié s'il diffère
+                    self._pending.acquire()
+                    executor.submit(self._copy_file, entry.path, entry.name, folder_key, stat,
+                                    existing['content_hash'])
+                else:
+                    self.stats.unchanged += 1
+                return
+        
+        self._pending.acquire()
+        executor.submit(self._copy_file, entry.path, entry.name, folder_key, stat)
+    
+    @classmethod
+    def _unchanged(cls, existing: dict, stat: os.stat_result) -> bool:
+        """Même taille et même date de modification que la version importée"""
+        return (existing['size'] == stat.st_size
+                and existing['mtime'] is not None
+                and abs(existing['mtime'] - stat.st_mtime) <= cls.MTIME_TOLERANCE)
+    
+    # ==================== ÉTAGE 2: COPIE ====================
+    
+    def _copy_file(self, source_path: str, filename: str, folder_key: str,
+                   stat: os.stat_result, known_hash: Optional[str] = None):
+        """
+        Copier un fichier dans uploads/ et transmettre le résultat à l'écrivain
+        
+        known_hash: hachage de la version déjà importée (verify_hash); le
+        fichier n'est copié que si son contenu en diffère
+        """
+        try:
+            if self._stopping():
+                return
+            if known_hash is not None and content_hash(source_path) == known_hash:
+                self._results.put(('unchanged',))
+                return
+            stored = self.file_handler.store_file(source_path, filename)
+            if stored:
+                metadata = self.file_handler.file_metadata(filename, stored.filepath, stat)
+                self._results.put(('file', folder_key, filename, stored, metadata))
+            else:
+                self._results.put(('error', source_path, None))
+        except Exception as e:
+            self._results.put(('error', source_path, e))
+        finally:
+            self._pending.release()
+    
+    # ==================== ÉTAGE 3: ÉCRITURE ====================
+    
+    def run(self, folder_path: str, parent_folder_id: Optional[int] = None,
+            sync_folder_id: Optional[int] = None,
+            job_id: Optional[int] = None) -> ImportStats:
+        """
+        Importer un dossier et toute son arborescence
+        
+        L'import est validé par lots (au plus toutes les CHECKPOINT_INTERVAL
+        secondes). En cas d'erreur, un nouvel import dont rien n'a encore été
+        validé est retiré de la base; sinon les fichiers déjà validés sont
+        gardés et l'entrée du journal passe à 'failed' (reprise proposée au
+        démarrage). Les copies non validées sont supprimées.
+        
+        Args:
+            folder_path: Dossier source
+            parent_folder_id: Dossier parent du dossier créé (None = racine)
+            sync_folder_id: Synchroniser ce dossier existant au lieu d'en
+                créer un nouveau (parent_folder_id est alors ignoré)
+            job_id: Entrée du journal à poursuivre (reprise d'un import
+                interrompu, avec sync_folder_id = son dossier racine)
+        
+        Returns:
+            ImportStats: Compteurs finaux (root_folder_id = dossier créé
+            ou synchronisé)
+        """
+        folder_ids: Dict[str, int] = {}
+        rows = []
+        last_progress = last_checkpoint = time.monotonic()
+        scanner = threading.Thread(target=self._scan, args=(folder_path,),
+                                   name='import-scan', daemon=True)
+        
+        try:
+            with self.db.batch():
+                if sync_folder_id is not None:
+                    self._load_existing(sync_folder_id)
+                    folder_ids.update(self._existing_folders)
+                    self.stats.root_folder_id = sync_folder_id
+                else:
+                    root_name = os.path.basename(os.path.normpath(folder_path))
+                    root_id = self.db.create_folder(root_name, parent_folder_id)
+                    folder_ids[''] = root_id
+                    self.stats.root_folder_id = root_id
+                    self._created_root = True
+                    self.stats.folders += 1
+                self._open_job(folder_path, parent_folder_id, sync_folder_id, job_id)
+                scanner.start()
+                
+                while True:
+                    try:
+                        message = self._results.get(timeout=self.progress_interval)
+                    except queue.Empty:
+                        message = ('idle',)
+                    kind = message[0]
+                    
+                    if kind == 'done':
+                        self._scan_finished = True
+                        break
+                    elif kind == 'folder':
+                        _, key, parent_key, name = message
+                        if key not in folder_ids:
+                            folder_ids[key] = self.db.create_folder(name, folder_ids[parent_key])
+                            self.stats.folders += 1
+                    elif kind == 'file':
+                        _, folder_key, filename, stored, metadata = message
+                        self._reserved.append(stored.filepath)
+                        if stored.created:
+                            self._copied.append(stored.filepath)
+                        else:
+                            self.stats.deduplicated += 1
+                        existing = self._existing_files.get(os.path.join(folder_key, filename))
+                        if existing is not None:
+                            # Nouvelle version d'un fichier déjà importé
+                            self.db.update_file_content(
+                                existing['id'], stored.filepath, metadata['size'],
+                                metadata['mtime'], stored.content_hash
+                            )
+                            self.stats.updated += 1
+                        else:
+                            rows.append({
+                                'folder_id': folder_ids[folder_key],
+                                'filename': filename,
+                                'filepath': stored.filepath,
+                                'content_hash': stored.content_hash,
+                                **metadata,
+                            })
+                        self.stats.files += 1
+                        self.stats.bytes += metadata['size']
+                    elif kind == 'unchanged':
+                        self.stats.unchanged += 1
+                    elif kind == 'error':
+                        self.stats.errors += 1
+                    
+                    if (len(rows) >= self.batch_size
+                            or time.monotonic() - last_checkpoint >= self.CHECKPOINT_INTERVAL):
+                        self._checkpoint(rows)
+                        last_checkpoint = time.monotonic()
+                    if self.progress and time.monotonic() - last_progress >= self.progress_interval:
+                        last_progress = time.monotonic()
+                        self.progress(self.stats)
+                
+                self._flush(rows)
+                if self._sync:
+                    self._delete_missing()
+                self._update_job(status='cancelled' if self._cancel.is_set() else 'completed')
+                if self.progress:
+                    self.progress(self.stats)
+        except BaseException:
+            self._abort(scanner)
+            self._fail_job()
+            raise
+        finally:
+            # Lignes validées (ou annulées): les objets n'ont plus à être réservés
+            self._release()
+            self.stats.cancelled = self._cancel.is_set()
+            self.stats.finished_at = time.monotonic()
+        
+        return self.stats
+    
+    def _load_existing(self, folder_id: int):
+        """Charger l'état du dossier à synchroniser, indexé par chemin relatif"""
+        folders, files = self.db.get_subtree(folder_id)
+        paths = {folder_id: ''}
+        for folder in folders:
+            if folder['id'] != folder_id:
+                paths[folder['id']] = os.path.join(paths[folder['parent_id']], folder['name'])
+        
+        # En cas de doublons de nom, le plus ancien est conservé, les autres
+        # seront supprimés comme absents de la source
+        for folder in folders:
+            self._existing_folders.setdefault(paths[folder['id']], folder['id'])
+        for file in files:
+            key = os.path.join(paths[file['folder_id']], file['filename'])
+            self._existing_files.setdefault(key, file)
+        
+        self._existing_rows = (folders, files, paths)
+        self._sync = True
+    
+    def _delete_missing(self):
+        """Supprimer ce qui n'existe plus dans la source (fin de synchronisation)"""
+        if self._cancel.is_set() or self.stats.errors:
+            # Un parcours incomplet ne permet pas de savoir ce qui a disparu
+            print("⚠️ Synchronisation incomplète: aucune suppression effectuée")
+            return
+        
+        folders, files, paths = self._existing_rows
+        kept = {
+            folder_id for path, folder_id in self._existing_folders.items()
+            if path == '' or path in self._seen_folders
+        }
+        for folder in folders:
+            # Seul le plus haut dossier disparu est supprimé (avec son sous-arbre)
+            if folder['id'] not in kept and folder['parent_id'] in kept:
+                if self.db.delete_folder(folder['id']):
+                    self.stats.deleted += 1
+        for file in files:
+            key = os.path.join(paths[file['folder_id']], file['filename'])
+            if file['folder_id'] in kept and (
+                    key not in self._seen_files or self._existing_files[key] is not file):
+                if self.db.delete_file(file['id']):
+                    self.stats.deleted += 1
+    
+    # ==================== JOURNAL ====================
+    
+    def _open_job(self, folder_path: str, parent_folder_id: Optional[int],
+                  sync_folder_id: Optional[int], job_id: Optional[int]):
+        """Inscrire l'import au journal et valider son dossier racine"""
+        if job_id is None:
+            mode = 'import' if sync_folder_id is None else 'sync'
+            job_id = self.db.create_import_job(
+                os.path.abspath(folder_path), mode, parent_folder_id, self.stats.root_folder_id
+            )
+        else:
+            self.db.update_import_job(job_id, status='running')
+        self.stats.job_id = job_id
+        job = self.db.get_import_job(job_id)
+        self._job_mode = job['mode']
+        # Reprise: ce qui a été validé avant l'interruption, tant que ce
+        # passage n'a rien validé lui-même
+        self._committed_files = job['completed_files']
+        self.db.checkpoint()
+    
+    def _update_job(self, **values):
+        """Reporter les compteurs (et le statut) dans le journal"""
+        self.db.update_import_job(
+            self.stats.job_id, planned_files=self.stats.planned,
+            completed_files=self.stats.files + self.stats.unchanged, **values
+        )
+    
+    def _checkpoint(self, rows: list):
+        """Valider les lignes accumulées: elles survivront à un arrêt brutal"""
+        validated = bool(rows or self.stats.updated)
+        self._flush(rows)
+        self._update_job()
+        self.db.checkpoint()
+        # Seulement une fois le commit fait: une erreur pendant l'écriture
+        # laisse l'import sans rien de validé (_fail_job le retire)
+        self._checkpointed = self._checkpointed or validated
+        self._committed_files = self.stats.files + self.stats.unchanged
+        # Les copies validées appartiennent désormais à la base
+        self._copied.clear()
+        self._release()
+    
+    def _fail_job(self):
+        """
+        Clore l'entrée du journal après une erreur (la transaction est annulée)
+        
+        Seul un import qui vient de créer son dossier racine, sans rien avoir
+        validé depuis, est retiré. Un import repris (ImportJournal) ou déjà
+        validé en partie garde ses fichiers: l'entrée passe à 'failed' et la
+        reprise reste possible.
+        """
+        if self.stats.job_id is None:
+            return
+        try:
+            if self._job_mode == 'import' and self._created_root and not self._checkpointed:
+                self.db.delete_folder(self.stats.root_folder_id)
+                self.db.update_import_job(self.stats.job_id, status='rolled_back')
+            else:
+                # Les fichiers reçus depuis le dernier checkpoint ont été annulés
+                self.db.update_import_job(
+                    self.stats.job_id, planned_files=self.stats.planned,
+                    completed_files=self._committed_files, status='failed'
+                )
+        except Exception as e:
+            # L'entrée reste 'running': la reprise sera proposée au démarrage
+            print(f"⚠️ Journal d'import non mis à jour: {e}")
+    
+    def _flush(self, rows: list):
+        """Insérer les lignes accumulées"""
+        if rows:
+            self.db.add_files_bulk(rows)
+            rows.clear()
+    
+    def _abort(self, scanner: threading.Thread):
+        """Arrêter les étages amont et supprimer les copies créées par cet import"""
+        self._stop.set()
+        if scanner.ident is not None and not self._scan_finished:
+            # Vider la file pour débloquer les threads de copie en attente
+            while True:
+                message = self._results.get()
+                if message[0] == 'file':
+                    self._reserved.append(message[3].filepath)
+                    if message[3].created:
+                        self._copied.append(message[3].filepath)
+                elif message[0] == 'done':
+                    break
+        # Un objet partagé avec un import concurrent (validé ou en cours) est conservé
+        self._release()
+        self.file_handler.remove_copies(self._copied, self.db)
+    
+    def _release(self):
+        FILE_RESERVATIONS.release(self._reserved)
+        self._reserved.clear()
@@ -0,0 +1,69 @@
+import queue
+import threading
+from typing import Optional
+from database import Database
+
+
+class MetadataReconciler:
+    """
+    Rattrapage en arrière-plan des métadonnées des fichiers (taille, mtime)
+    
+    Les fichiers importés avant l'ajout des colonnes mtime / type MIME n'ont
+    pas été mesurés. Ce thread les relève par petits lots, sur sa propre
+    connexion SQLite, pour que l'interface n'ait jamais à interroger le disque
+    (coûteux sur un uploads/ monté en réseau).
+    
+    Les événements de cette connexion (FilesMeasured, un par lot) sont
+    déposés dans la file `events`, à republier dans le thread de l'interface
+    sur la Database principale: son cache et les vues restent à jour.
+    """
+    
+    DEFAULT_BATCH_SIZE = 200
+    DEFAULT_PAUSE = 0.05  # Secondes entre deux lots: laisse la main aux écritures de l'UI
+    
+    def __init__(self, db_path: str, profile,
+                 batch_size: int = DEFAULT_BATCH_SIZE, pause: float = DEFAULT_PAUSE):
+        self.db_path = db_path
+        self.profile = profile
+        self.batch_size = max(1, batch_size)
+        self.pause = pause
+        self.updated = 0
+        self.events = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Démarrer le rattrapage (sans effet s'il est déjà en cours)"""
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metadata-reconciler', daemon=True)
+        self._thread.start()
+    
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Demander l'arrêt après le lot en cours"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def _run(self):
+        # Connexion propre au thread (une connexion SQLite par thread)
+        db = Database(self.db_path, profile=self.profile)
+        db.events.subscribe(self.events.put)
+        try:
+            last_id = 0
+            while not self._stop.is_set():
+                updated, last_id = db.backfill_file_metadata(last_id, self.batch_size)
+                if last_id is None:
+                    break
+                self.updated += updated
+                self._stop.wait(self.pause)
+            if self.updated:
+                print(f"✅ Métadonnées renseignées pour {self.updated} fichier(s)")
+        except Exception as e:
+            print(f"⚠️ Rattrapage des métadonnées interrompu: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,167 @@
+"""
+Déplacement des fichiers de uploads/ vers une autre disposition
+
+    python -m utils.relayout --db portal.db --uploads uploads --layout hex
+
+Les lignes de la table files sont traitées par lots, dans l'ordre des ID.
+Pour chaque fichier, la nouvelle copie est créée (lien physique, ou copie)
+avant la mise à jour de files.filepath; l'ancien chemin n'est supprimé
+qu'une fois le lot validé. À tout instant, chaque ligne pointe donc sur un
+fichier présent.
+
+L'outil peut être interrompu et relancé: les fichiers déjà à leur place
+sont ignorés sans accès disque, et un fichier copié mais pas encore
+enregistré est reconnu et simplement enregistré.
+"""
+
+import filecmp
+import os
+import shutil
+from typing import Any, Dict, Set
+
+from database import CONNECTION_PROFILES, DEFAULT_PROFILE, Database
+from .storage import DEFAULT_LAYOUT, LAYOUTS, ContentAddressedStorage, FlatStorage
+
+
+class Relayout:
+    """Réorganiser les fichiers stockés selon une disposition (voir storage.LAYOUTS)"""
+    
+    DEFAULT_BATCH_SIZE = 500
+    
+    def __init__(self, db: Database, upload_dir: str, layout: str = DEFAULT_LAYOUT,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.db = db
+        self.layout = LAYOUTS[layout]()
+        self.flat = FlatStorage(upload_dir, self.layout)
+        self.cas = ContentAddressedStorage(upload_dir, self.layout)
+        self.batch_size = max(1, batch_size)
+        self.moved = 0
+        self.unchanged = 0
+        self.missing = 0
+    
+    def target_path(self, row: Dict[str, Any]) -> str:
+        """Emplacement d'un fichier stocké dans la nouvelle disposition"""
+        name = os.path.basename(row['filepath'])
+        if row['content_hash']:
+            # Objet du stockage par contenu: la clé est le hachage
+            return os.path.join(self.cas.objects_dir,
+                                self.layout.relative_path(row['content_hash'], name))
+        return self.flat.target_path(name)
+    
+    def run(self, after_id: int = 0) -> int:
+        """
+        Déplacer tous les fichiers dont l'ID est supérieur à after_id
+        
+        Returns:
+            int: Nombre de fichiers déplacés
+        """
+        last_id = after_id
+        while True:
+            self.db.cursor.execute(
+                "SELECT id, filename, filepath, content_hash FROM files "
+                "WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, self.batch_size)
+            )
+            rows = self.db.cursor.fetchall()
+            if not rows:
+                break
+            
+            done: Set[str] = set()
+            with self.db.batch():
+                for row in rows:
+                    if row['filepath'] not in done:
+                        self.relocate(row)
+                        done.add(row['filepath'])
+            last_id = rows[-1]['id']
+            print(f"   ... ID {last_id}: {self.moved} déplacé(s), "
+                  f"{self.unchanged} déjà en place, {self.missing} introuvable(s)")
+        
+        return self.moved
+    
+    def relocate(self, row: Dict[str, Any]):
+        """Déplacer un fichier et toutes les lignes qui le référencent"""
+        source = row['filepath']
+        target = self.target_path(row)
+        if os.path.normpath(source) == os.path.normpath(target):
+            self.unchanged += 1
+            return
+        
+        if os.path.exists(source):
+            target = self.place(source, target)
+        elif not os.path.exists(target):
+            print(f"⚠️ Fichier introuvable, ignoré: {source}")
+            self.missing += 1
+            return
+        
+        # Un objet partagé est référencé par plusieurs lignes
+        self.db.cursor.execute("UPDATE files SET filepath = ? WHERE filepath = ?", (target, source))
+        self.db.after_commit(lambda: self.db.remove_physical_files([source]))
+        self.moved += 1
+    
+    def place(self, source: str, target: str) -> str:
+        """
+        Créer la copie de `source` à `target` (ou à côté en cas de conflit)
+        
+        Returns:
+            str: Chemin de la copie
+        """
+        directory, name = os.path.split(target)
+        os.makedirs(directory, exist_ok=True)
+        candidate = target
+        attempt = 0
+        while True:
+            if os.path.exists(candidate):
+                # Reprise après interruption: copie déjà faite
+                if self.same_file(source, candidate):
+                    return candidate
+            else:
+                try:
+                    os.link(source, candidate)
+                except OSError:
+                    # Système de fichiers sans liens physiques
+                    shutil.copy2(source, candidate + '.tmp')
+                    os.replace(candidate + '.tmp', candidate)
+                return candidate
+            attempt += 1
+            candidate = os.path.join(directory, f"{attempt}_{name}")
+    
+    @staticmethod
+    def same_file(first: str, second: str) -> bool:
+        """Même fichier (lien physique) ou même contenu"""
+        try:
+            return os.path.samefile(first, second) or filecmp.cmp(first, second, shallow=False)
+        except OSError:
+            return False
+
+
+def main():
+    """Point d'entrée: python -m utils.relayout [--layout hex]"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Réorganiser les fichiers de uploads/")
+    parser.add_argument('--db', default="portal.db", help="Chemin de la base SQLite")
+    parser.add_argument('--profile', default=DEFAULT_PROFILE, choices=sorted(CONNECTION_PROFILES),
+                        help="Profil de connexion SQLite")
+    parser.add_argument('--uploads', default="uploads", help="Répertoire des fichiers importés")
+    parser.add_argument('--layout', default=DEFAULT_LAYOUT, choices=sorted(LAYOUTS),
+                        help="Disposition cible")
+    parser.add_argument('--batch-size', type=int, default=Relayout.DEFAULT_BATCH_SIZE,
+                        help="Nombre de fichiers par transaction")
+    parser.add_argument('--after-id', type=int, default=0,
+                        help="Ne traiter que les fichiers d'ID supérieur")
+    args = parser.parse_args()
+    
+    db = Database(args.db, profile=args.profile)
+    try:
+        relayout = Relayout(db, args.uploads, args.layout, args.batch_size)
+        relayout.run(args.after_id)
+        print(f"✅ {relayout.moved} fichier(s) déplacé(s), {relayout.unchanged} déjà en place, "
+              f"{relayout.missing} introuvable(s)")
+        return 1 if relayout.missing else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional
+from database import FILE_RESERVATIONS
+from .copy_engine import CopyEngine
+
+
+class FlatLayout:
+    """Tous les fichiers dans un seul dossier"""
+    
+    name = 'flat'
+    
+    def relative_path(self, key: str, filename: str) -> str:
+        return filename
+
+
+class HexFanoutLayout:
+    """
+    Répartition sur `levels` niveaux de sous-dossiers hexadécimaux
+    
+    Avec les valeurs par défaut (2 niveaux de 2 caractères), 65 536 dossiers:
+    un million de fichiers fait une quinzaine d'entrées par dossier au lieu
+    d'un million dans un seul, ce qui garde rapides les recherches de noms,
+    os.path.exists et les sauvegardes.
+    """
+    
+    name = 'hex'
+    
+    def __init__(self, levels: int = 2, width: int = 2):
+        self.levels = levels
+        self.width = width
+    
+    def relative_path(self, key: str, filename: str) -> str:
+        """key: chaîne hexadécimale (hachage du contenu ou du nom)"""
+        shards = [key[i * self.width:(i + 1) * self.width] for i in range(self.levels)]
+        return os.path.join(*shards, filename)
+
+
+LAYOUTS = {
+    FlatLayout.name: FlatLayout,
+    HexFanoutLayout.name: HexFanoutLayout,
+}
+
+DEFAULT_LAYOUT = HexFanoutLayout.name
+
+
+def name_key(name: str) -> str:
+    """Clé de répartition d'un fichier sans hachage de contenu"""
+    return hashlib.md5(name.encode('utf-8')).hexdigest()
+
+
+def content_hash(filepath: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 hexadécimal du contenu d'un fichier (clé de ContentAddressedStorage)"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class StoredFile:
+    """
+    Résultat de l'enregistrement d'un fichier dans uploads/
+    
+    Stockage par contenu: filepath est réservé (FILE_RESERVATIONS) jusqu'à
+    ce que l'appelant libère la réservation, une fois sa ligne validée.
+    """
+    filepath: str
+    content_hash: Optional[str] = None  # SHA-256 hexadécimal (stockage par contenu)
+    created: bool = True                # False: contenu déjà présent, rien n'a été écrit
+
+
+class FlatStorage:
+    """
+    Stockage historique: une copie horodatée par import
+    
+    uploads/{timestamp}_{nom}, réparti selon la disposition choisie
+    (uploads/3f/a2/{timestamp}_{nom} avec HexFanoutLayout, clé = nom)
+    """
+    
+    name = 'flat'
+    
+    def __init__(self, root: str, layout=None, copy_engine: Optional[CopyEngine] = None):
+        self.root = root
+        self.layout = layout or LAYOUTS[DEFAULT_LAYOUT]()
+        self.copy_engine = copy_engine or CopyEngine()
+    
+    def store(self, source_path: str, filename: str) -> StoredFile:
+        """Copier un fichier sous un nom horodaté unique"""
+        timestamp = int(time.time() * 1000)  # Millisecondes pour plus d'unicité
+        destination = self.reserve_destination(f"{timestamp}_{filename}")
+        self.copy_engine.copy(source_path, destination)
+        return StoredFile(destination)
+    
+    def target_path(self, filename: str) -> str:
+        """Emplacement d'un fichier de ce nom dans la disposition courante"""
+        return os.path.join(self.root, self.layout.relative_path(name_key(filename), filename))
+    
+    def reserve_destination(self, filename: str) -> str:
+        """
+        Réserver un chemin libre dans uploads/ (création exclusive)
+        
+        Les copies parallèles d'un import peuvent produire le même nom
+        horodaté: un suffixe numérique est ajouté jusqu'à trouver un nom libre.
+        """
+        candidate = filename
+        attempt = 0
+        while True:
+            destination = self.target_path(candidate)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            try:
+                os.close(os.open(destination, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return destination
+            except FileExistsError:
+                attempt += 1
+                candidate = f"{attempt}_{filename}"
+
+
+class ContentAddressedStorage:
+    """
+    Stockage par contenu (dédupliqué)
+    
+    uploads/objects/ab/cd/abcd...ef.pdf (HexFanoutLayout), où abcd...ef est
+    le SHA-256 du contenu. Le hachage est calculé pendant la copie vers un
+    fichier temporaire (copie par tampons: les copies noyau ne laissent pas
+    voir les octets); si l'objet existe déjà, la copie est abandonnée.
+    Un même contenu importé dans dix dossiers n'occupe donc qu'une place.
+    
+    L'extension est conservée dans le nom de l'objet pour que le système
+    sache ouvrir le fichier. Les lignes de `files` pointent sur l'objet: il
+    ne doit être supprimé que lorsque plus aucune ligne ne le référence
+    (voir Database.unreferenced_filepaths) et qu'aucun enregistrement en
+    cours ne l'a réservé (voir FileReservations).
+    """
+    
+    name = 'cas'
+    
+    def __init__(self, root: str, layout=None, copy_engine: Optional[CopyEngine] = None):
+        self.root = root
+        self.layout = layout or LAYOUTS[DEFAULT_LAYOUT]()
+        self.copy_engine = copy_engine or CopyEngine()
+        self.objects_dir = os.path.join(root, 'objects')
+        self.tmp_dir = os.path.join(self.objects_dir, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+    
+    def object_path(self, content_hash: str, extension: str = '') -> str:
+        """Chemin de l'objet correspondant à un hachage"""
+        name = f"{content_hash}.{extension}" if extension else content_hash
+        return os.path.join(self.objects_dir, self.layout.relative_path(content_hash, name))
+    
+    @staticmethod
+    def object_extension(filename: str) -> str:
+        """Extension conservée dans le nom de l'objet (vide si inhabituelle)"""
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        return extension if re.fullmatch(r'[a-z0-9]{1,16}', extension) else ''
+    
+    def store(self, source_path: str, filename: str) -> StoredFile:
+        """Copier un fichier en calculant son hachage, sans doublon"""
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        os.close(fd)
+        try:
+            self.copy_engine.copy(source_path, tmp_path, digest=digest)
+            content_hash = digest.hexdigest()
+            destination = self.object_path(content_hash, self.object_extension(filename))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            # Réservé avant d'être réutilisé: l'objet ne peut plus être supprimé
+            # avant que la ligne de l'appelant soit validée
+            FILE_RESERVATIONS.hold(destination)
+            try:
+                created = self.publish(tmp_path, destination)
+            except BaseException:
+                FILE_RESERVATIONS.release([destination])
+                raise
+            return StoredFile(destination, content_hash, created)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    @staticmethod
+    def publish(tmp_path: str, destination: str) -> bool:
+        """
+        Placer la copie temporaire à l'emplacement de l'objet
+        
+        Returns:
+            bool: True si l'objet a été créé, False s'il existait déjà
+        """
+        try:
+            # Création atomique: échoue si un autre import a déjà stocké ce contenu
+            os.link(tmp_path, destination)
+            return True
+        except FileExistsError:
+            return False
+        except OSError:
+            # Système de fichiers sans liens physiques
+            if os.path.exists(destination):
+                return False
+            os.replace(tmp_path, destination)
+            return True
+
+
+STORAGE_BACKENDS = {
+    FlatStorage.name: FlatStorage,
+    ContentAddressedStorage.name: ContentAddressedStorage,
+}
+
+DEFAULT_STORAGE = ContentAddressedStorage.name
@@ -0,0 +1,236 @@
+"""
+Extraction du texte des documents, pour l'index de recherche du contenu
+
+Bibliothèque standard uniquement: les formats Office Open XML (docx, xlsx,
+pptx) et OpenDocument (odt, ods, odp) sont des archives zip de XML; le
+texte brut est décodé; le PDF est lu au mieux (flux compressés par
+FlateDecode, opérateurs de texte Tj/TJ), sans garantie pour les polices
+à encodage spécial ni pour les documents scannés.
+
+Les fonctions sont appelées dans les processus de ContentIndexer: elles ne
+touchent pas à la base et ne renvoient que des chaînes.
+"""
+
+import re
+import zipfile
+import zlib
+from typing import Callable, Iterable, Optional
+from xml.etree import ElementTree
+
+# Texte conservé au plus par document (le début suffit à le retrouver)
+MAX_CHARS = 200_000
+
+# Octets lus au plus dans un fichier texte ou PDF, ou dans une partie XML d'archive
+MAX_BYTES = 50 * 1024 * 1024
+
+TEXT_EXTENSIONS = {'txt', 'csv', 'md', 'log', 'json', 'xml', 'html', 'htm', 'ini', 'sql'}
+
+# Parties XML contenant le texte, par format d'archive
+OOXML_PARTS = {
+    'docx': r'word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml',
+    'xlsx': r'xl/(sharedStrings|worksheets/sheet\d+)\.xml',
+    'pptx': r'ppt/(slides/slide\d+|notesSlides/notesSlide\d+)\.xml',
+}
+ODF_PARTS = {
+    'odt': r'content\.xml',
+    'ods': r'content\.xml',
+    'odp': r'content\.xml',
+}
+
+SUPPORTED_EXTENSIONS = TEXT_EXTENSIONS | set(OOXML_PARTS) | set(ODF_PARTS) | {'pdf'}
+
+
+def is_supported(extension: str) -> bool:
+    """Le contenu de ce type de fichier peut être extrait"""
+    return extension in SUPPORTED_EXTENSIONS
+
+
+def extract_text(filepath: str, extension: str) -> Optional[str]:
+    """
+    Texte d'un document (MAX_CHARS caractères au plus)
+    
+    Returns:
+        Optional[str]: Le texte, ou None si le format n'est pas pris en
+        charge ou si le document n'en contient pas
+    
+    Raises:
+        OSError, zipfile.BadZipFile, ElementTree.ParseError: fichier
+        illisible ou endommagé
+    """
+    if extension in TEXT_EXTENSIONS:
+        text = _plain_text(filepath, strip_tags=extension in ('html', 'htm', 'xml'))
+    elif extension in OOXML_PARTS:
+        text = _archive_text(filepath, OOXML_PARTS[extension], _ooxml_text)
+    elif extension in ODF_PARTS:
+        text = _archive_text(filepath, ODF_PARTS[extension], _odf_text)
+    elif extension == 'pdf':
+        text = _pdf_text(filepath)
+    else:
+        return None
+    text = re.sub(r'[ \t\r\f\v]+', ' ', text)
+    text = re.sub(r'\n\s*\n+', '\n', text).strip()
+    return text[:MAX_CHARS] or None
+
+
+def _decode(data: bytes) -> str:
+    for encoding in ('utf-8-sig', 'cp1252'):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('latin-1')
+
+
+def _plain_text(filepath: str, strip_tags: bool) -> str:
+    with open(filepath, 'rb') as f:
+        text = _decode(f.read(min(MAX_BYTES, MAX_CHARS * 4)))
+    if strip_tags:
+        text = re.sub(r'<(script|style)\b.*?</\1>', ' ', text, flags=re.S | re.I)
+        text = re.sub(r'<[^>]+>', ' ', text)
+    return text
+
+
+def _archive_text(filepath: str, pattern: str, parse: Callable) -> str:
+    chunks = []
+    size = 0
+    with zipfile.ZipFile(filepath) as archive:
+        names = [
+            info.filename for info in archive.infolist()
+            if info.file_size <= MAX_BYTES and re.fullmatch(pattern, info.filename)
+        ]
+        # slide2 avant slide10
+        names.sort(key=lambda name: [int(part) if part.isdigit() else part
+                                     for part in re.split(r'(\d+)', name)])
+        for name in names:
+            with archive.open(name) as part:
+                for chunk in parse(part):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= MAX_CHARS:
+                        return ''.join(chunks)
+    return ''.join(chunks)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _ooxml_text(stream) -> Iterable[str]:
+    """Texte d'une partie Office Open XML (<w:t>, <a:t>, <t>, cellules <c>)"""
+    for _, element in ElementTree.iterparse(stream, events=('end',)):
+        tag = _local_name(element.tag)
+        if tag == 't':
+            yield element.text or ''
+        elif tag == 'tab':
+            yield ' '
+        elif tag == 'c':
+            # Cellule xlsx: les chaînes partagées (t="s") sont lues dans sharedStrings.xml
+            if element.get('t') not in ('s', 'inlineStr'):
+                value = element.find('{*}v')
+                if value is not None and value.text:
+                    yield value.text
+            yield ' '
+            element.clear()
+        elif tag in ('p', 'si', 'row'):
+            yield '\n'
+            element.clear()
+
+
+def _odf_text(stream) -> Iterable[str]:
+    """Texte d'un content.xml OpenDocument (paragraphes et titres)"""
+    for _, element in ElementTree.iterparse(stream, events=('end',)):
+        if _local_name(element.tag) in ('p', 'h'):
+            yield ''.join(element.itertext())
+            yield '\n'
+            element.clear()
+
+
+# ==================== PDF (au mieux) ====================
+
+_PDF_STREAM = re.compile(rb'<<(.{0,2000}?)>>\s*stream\r?\n', re.S)
+_PDF_TEXT_BLOCK = re.compile(rb'BT(.*?)ET', re.S)
+_PDF_TEXT_OPERAND = re.compile(
+    rb'(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)|(T\*|\'|"|Td|TD)|(-\d+(?:\.\d*)?)', re.S)
+
+# Décalage (en millièmes d'em) d'un tableau TJ au-delà duquel on voit une espace
+_PDF_WORD_GAP = 200
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+
+def _pdf_text(filepath: str) -> str:
+    with open(filepath, 'rb') as f:
+        data = f.read(MAX_BYTES)
+    chunks = []
+    size = 0
+    for match in _PDF_STREAM.finditer(data):
+        start = match.end()
+        end = data.find(b'endstream', start)
+        if end < 0:
+            break
+        content = data[start:end]
+        if b'/FlateDecode' in match.group(1):
+            try:
+                content = zlib.decompressobj().decompress(content, MAX_CHARS * 20)
+            except zlib.error:
+                continue
+        elif b'/Filter' in match.group(1):
+            # Images et autres filtres: pas de texte exploitable
+            continue
+        for text in _pdf_stream_text(content):
+            chunks.append(text)
+            size += len(text)
+        if size >= MAX_CHARS:
+            break
+    return ''.join(chunks)
+
+
+def _pdf_stream_text(content: bytes) -> Iterable[str]:
+    """Chaînes affichées par les opérateurs de texte d'un flux de contenu"""
+    for block in _PDF_TEXT_BLOCK.finditer(content):
+        for operand, operator, offset in _PDF_TEXT_OPERAND.findall(block.group(1)):
+            if operand.startswith(b'('):
+                yield _pdf_literal(operand[1:-1]).decode('latin-1')
+            elif operand.startswith(b'<'):
+                text = _pdf_hex(operand[1:-1])
+                if text:
+                    yield text
+            elif operator or (offset and -float(offset) > _PDF_WORD_GAP):
+                # Retour à la ligne, déplacement ou espacement entre deux mots
+                yield ' '
+        yield '\n'
+
+
+def _pdf_literal(raw: bytes) -> bytes:
+    out = bytearray()
+    i = 0
+    while i < len(raw):
+        byte = raw[i:i + 1]
+        if byte != b'\\':
+            out += byte
+            i += 1
+            continue
+        following = raw[i + 1:i + 2]
+        if following in _PDF_ESCAPES:
+            out += _PDF_ESCAPES[following]
+            i += 2
+        elif following and following in b'01234567':
+            octal = re.match(rb'[0-7]{1,3}', raw[i + 1:i + 4]).group()
+            out.append(int(octal, 8) & 0xFF)
+            i += 1 + len(octal)
+        else:
+            out += following
+            i += 2
+    return bytes(out)
+
+
+def _pdf_hex(raw: bytes) -> str:
+    """Chaîne hexadécimale: gardée seulement si elle donne du texte lisible"""
+    digits = re.sub(rb'\s', b'', raw)
+    if len(digits) % 2:
+        digits += b'0'
+    data = bytes.fromhex(digits.decode('ascii'))
+    # Polices CID: deux octets par caractère, souvent de l'UTF-16
+    if len(data) % 2 == 0 and data[::2].count(0) == len(data) // 2:
+        data = data[1::2]
+    text = data.decode('latin-1')
+    return text if text.isprintable() else ''
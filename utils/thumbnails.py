@@ -0,0 +1,279 @@
+"""
+Miniatures des images et des PDF, pour les cartes de fichiers
+
+Le rendu passe par des bibliothèques optionnelles: Pillow pour les images,
+PyMuPDF pour les PDF (et pour les images si Pillow manque). Sans elles,
+aucun type n'est pris en charge et les cartes gardent leur emoji.
+
+Les miniatures sont des PNG, format que Tk 8.6 lit sans aide
+(tk.PhotoImage(data=...)): l'interface n'a besoin d'aucune bibliothèque.
+"""
+
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF avant 1.24.3
+        PYMUPDF_AVAILABLE = True
+    except ImportError:
+        PYMUPDF_AVAILABLE = False
+
+# Taille maximale d'une miniature (largeur, hauteur), proportions conservées
+THUMBNAIL_SIZE = (160, 80)
+
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tif', 'tiff', 'webp'}
+
+
+def is_supported(extension: str) -> bool:
+    """Une miniature peut être rendue pour ce type de fichier"""
+    if extension == 'pdf':
+        return PYMUPDF_AVAILABLE
+    if extension in IMAGE_EXTENSIONS:
+        return PIL_AVAILABLE or PYMUPDF_AVAILABLE
+    return False
+
+
+def render_thumbnail(filepath: str, extension: str,
+                     size: Tuple[int, int] = THUMBNAIL_SIZE) -> Optional[bytes]:
+    """
+    Miniature PNG d'une image ou de la première page d'un PDF
+    
+    Returns:
+        Optional[bytes]: Le PNG, ou None si le type n'est pas pris en charge
+        ou si le document n'a pas de page
+    
+    Raises:
+        OSError, ou l'erreur de la bibliothèque de rendu: fichier illisible
+        ou endommagé
+    """
+    if extension in IMAGE_EXTENSIONS and PIL_AVAILABLE:
+        return _render_image(filepath, size)
+    if is_supported(extension):
+        return _render_page(filepath, size)
+    return None
+
+
+def _render_image(filepath: str, size: Tuple[int, int]) -> bytes:
+    with Image.open(filepath) as image:
+        # JPEG: décodage directement à une taille réduite, bien plus rapide
+        image.draft('RGB', size)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(size)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        output = io.BytesIO()
+        image.save(output, 'PNG')
+        return output.getvalue()
+
+
+def _render_page(filepath: str, size: Tuple[int, int]) -> Optional[bytes]:
+    with pymupdf.open(filepath) as document:
+        if document.page_count == 0:
+            return None
+        page = document.load_page(0)
+        if page.rect.width <= 0 or page.rect.height <= 0:
+            return None
+        zoom = min(size[0] / page.rect.width, size[1] / page.rect.height)
+        pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+        return pixmap.tobytes('png')
+
+
+def load_thumbnail(cache_path: str, filepath: str, extension: str,
+                   size: Tuple[int, int]) -> Tuple[Optional[bytes], int]:
+    """
+    Miniature lue dans le cache disque, ou rendue puis enregistrée
+    
+    Appelée dans les processus de ThumbnailCache.
+    
+    Returns:
+        Tuple[Optional[bytes], int]: Le PNG (None si rien à afficher) et
+        le nombre d'octets ajoutés au cache (0 si la miniature y était)
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        # Date de modification = dernier accès (atime n'est pas fiable: noatime)
+        os.utime(cache_path)
+        return data, 0
+    except FileNotFoundError:
+        pass
+    
+    data = render_thumbnail(filepath, extension, size)
+    if data is None:
+        return None, 0
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, cache_path)
+    return data, len(data)
+
+
+class ThumbnailCache:
+    """
+    Miniatures des fichiers, rendues en arrière-plan et gardées sur le disque
+    
+    Une miniature est identifiée par l'ID du fichier et sa date de
+    modification: un fichier remplacé en obtient une nouvelle, l'ancienne
+    n'est plus lue et finit évincée. Le cache est borné en octets; au-delà
+    de max_bytes, les miniatures les moins récemment lues sont supprimées
+    jusqu'à LOW_WATER de la limite.
+    
+    Le rendu a lieu dans un pool de processus, comme l'extraction du texte
+    (ContentIndexer): décoder une image ou un PDF coûte du CPU, et un
+    document qui fait tomber la bibliothèque de rendu ne fait tomber qu'un
+    processus du pool. request() renvoie un Future; une demande annulée
+    avant son début (carte sortie de la vue) n'est jamais rendue.
+    """
+    
+    DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+    LOW_WATER = 0.9
+    DEFAULT_WORKERS = 2
+    
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 size: Tuple[int, int] = THUMBNAIL_SIZE, workers: int = DEFAULT_WORKERS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max(1, max_bytes)
+        self.size = size
+        self.workers = max(1, workers)
+        self.rendered = 0
+        self.hits = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._used = 0
+        self._evicting = False
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Taille du cache existant: relevée (et réduite si besoin) en arrière-plan
+        self._start_eviction()
+    
+    def path(self, file: Dict) -> str:
+        """Chemin de la miniature d'un fichier (clé: ID et date de modification)"""
+        mtime_ms = int((file.get('mtime') or 0) * 1000)
+        return os.path.join(self.cache_dir, f"{file['id'] % 256:02x}",
+                            f"{file['id']}-{mtime_ms}.png")
+    
+    @staticmethod
+    def supports(file: Dict) -> bool:
+        """Une miniature peut être rendue pour ce fichier"""
+        return is_supported(file['extension'])
+    
+    def request(self, file: Dict) -> Future:
+        """
+        Demander la miniature d'un fichier (appelable de n'importe quel thread)
+        
+        Returns:
+            Future: Résolu avec (PNG ou None si rien à afficher, octets
+            ajoutés au cache); en erreur si le fichier est illisible ou a
+            fait tomber un processus. L'annuler avant le début du rendu
+            l'évite
+        """
+        args = (self.path(file), file['filepath'], file['extension'], self.size)
+        with self._lock:
+            try:
+                future = self._executor().submit(load_thumbnail, *args)
+            except BrokenProcessPool:
+                # Un document a fait tomber un processus: nouveau pool
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                future = self._executor().submit(load_thumbnail, *args)
+        future.add_done_callback(self._account)
+        return future
+    
+    def stats(self) -> Dict[str, int]:
+        """Compteurs: miniatures rendues, lues dans le cache, évincées, octets occupés"""
+        return {'rendered': self.rendered, 'hits': self.hits,
+                'evictions': self.evictions, 'bytes': self._used}
+    
+    def shutdown(self):
+        """Abandonner les demandes en attente et arrêter les processus"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+    
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: pas de fork d'un processus qui fait tourner Tk et des threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+    
+    # ==================== TAILLE DU CACHE ====================
+    
+    def _account(self, future: Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, added = future.result()
+        with self._lock:
+            if added:
+                self.rendered += 1
+                self._used += added
+            else:
+                self.hits += 1
+            over = self._used > self.max_bytes
+        if over:
+            self._start_eviction()
+    
+    def _start_eviction(self):
+        with self._lock:
+            if self._evicting:
+                return
+            self._evicting = True
+        threading.Thread(target=self._evict, name='thumbnail-eviction', daemon=True).start()
+    
+    def _evict(self):
+        """Relever la taille du cache et supprimer les miniatures les moins récemment lues"""
+        try:
+            entries = []
+            for directory in os.scandir(self.cache_dir):
+                if not directory.is_dir():
+                    continue
+                for entry in os.scandir(directory.path):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            if total > self.max_bytes:
+                target = self.max_bytes * self.LOW_WATER
+                entries.sort()
+                for _, size, path in entries:
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+                    removed += 1
+            
+            # Approximatif: les miniatures écrites pendant le parcours sont peut-être comptées
+            with self._lock:
+                self._used = total
+                self.evictions += removed
+        except OSError:
+            # Répertoire du cache illisible: nouvelle tentative au prochain dépassement
+            pass
+        finally:
+            with self._lock:
+                self._evicting = False